@@ -10,9 +10,57 @@ class Settings(BaseSettings):
     USER_AGENT: str = "NewsMonitorBot/1.0"
     REQUEST_TIMEOUT: int = 15
     # Scraper-specific
-    RATE_LIMIT_SECONDS: float = 0.5  # seconds to wait between requests (simple global throttle)
-    REQUEST_RETRIES: int = 3
-    BACKOFF_FACTOR: float = 0.5
+    RATE_LIMIT_SECONDS: float = 0.5  # default seconds between requests to the same host (token refill interval)
+    RATE_LIMIT_BURST: int = 1  # default requests a host may receive back-to-back before throttling
+    REQUEST_RETRIES: int = 3  # delayed retries per article before it goes to dead_letters
+    RETRY_BACKOFF_SECONDS: float = 30  # first retry delay, doubled on each attempt (unless Retry-After)
+    RETRY_BACKOFF_MAX_SECONDS: float = 1800
+    RETRY_POLL_SECONDS: int = 15  # how often the scheduler looks for due retries
+    FETCH_CONCURRENCY: int = 8  # max concurrent article downloads per scrape wave
+    FETCH_PER_HOST_CONCURRENCY: int = 4  # initial concurrent downloads against a single host
+    FETCH_ADAPTIVE_CONCURRENCY: bool = True  # grow/shrink the per-host limit from latency and 429/503 (AIMD)
+    FETCH_PER_HOST_MAX_CONCURRENCY: int = 8  # upper bound for the adaptive per-host limit
+    FETCH_LATENCY_FACTOR: float = 2.0  # p95 above baseline * factor counts as congestion
+    HTTP_POOL_CONNECTIONS: int = 20  # number of per-host connection pools kept alive
+    HTTP_POOL_MAXSIZE: int = 10  # keep-alive connections per host (raised to FETCH_CONCURRENCY if lower)
+    HTTP_POOL_MAXSIZE_BY_HOST: dict[str, int] = {}  # e.g. {"rpp.pe": 16}
+    FETCH_MAX_BYTES: int = 5 * 1024 * 1024  # abort downloads larger than this (0 = no limit)
+    HTTP_CACHE_ENABLED: bool = True  # send If-None-Match / If-Modified-Since and skip unchanged pages
+    # Raw HTML archive (write-through) and offline replay
+    HTML_ARCHIVE_ENABLED: bool = True
+    HTML_ARCHIVE_DIR: str = "data/archive"
+    HTML_ARCHIVE_MAX_MB: float = 512
+    HTML_ARCHIVE_TTL_HOURS: float = 168
+    SCRAPER_REPLAY: bool = False  # serve pages from the archive instead of the network
+    LINK_EXTRACTOR: str = "auto"  # listing <a href> extraction: auto | selectolax | lxml | bs4
+    # Incremental listing crawl (per-source seen-URL set)
+    SEEN_FILTER_ENABLED: bool = True  # only fetch listing links that are not stored yet
+    SEEN_REFRESH_HOURS: float = 24  # revisit stored articles after this long to track changes (0 = never)
+    SEEN_BLOOM_ERROR_RATE: float = 0.01
+    SEEN_BLOOM_CAPACITY: int = 50_000  # minimum URLs per host before a filter is rebuilt larger
+    # RSS/Atom and news-sitemap discovery (used instead of the HTML listing when found)
+    FEED_DISCOVERY_ENABLED: bool = True
+    FEED_REVALIDATE_HOURS: float = 24  # rediscover the feed of a source after this long
+    # Learned link prioritization (article yield per host and URL pattern)
+    LINK_YIELD_ENABLED: bool = True
+    LINK_YIELD_MIN_SAMPLES: int = 10  # fetched links of a pattern before its yield is trusted
+    LINK_YIELD_SKIP_BELOW: float = 0.1  # skip patterns whose article rate is lower than this
+    LINK_YIELD_EXPLORE_EVERY: int = 10  # still fetch 1 in N links of a skipped pattern (0 = never)
+    # Crawl frontier (listing pagination and per-wave download budget)
+    FRONTIER_BUDGET: int = 50  # article downloads per source and wave, best-ranked links first
+    FRONTIER_MAX_DEPTH: int = 1  # pagination / section hops followed from the listing page
+    FRONTIER_MAX_PAGES: int = 3  # listing pages fetched per wave, the listing itself included
+    FRONTIER_MAX_CANDIDATES: int = 500  # ranked links handed to the seen-URL filter
+    # Article extraction worker processes (trafilatura / HTML parsing off the API process)
+    EXTRACTION_WORKERS: int = 2  # 0 = extract in the scraping thread
+    EXTRACTION_TIMEOUT_SECONDS: float = 60  # a page taking longer counts as not extracted
+    EXTRACTION_CACHE_SIZE: int = 1000  # results kept by normalized-HTML hash (0 = no cache)
+    ARTICLE_PROBE_BODY_CHARS: int = 32768  # body prefix parsed to reject non-articles (0 = always parse it all)
+    # Per-host circuit breaker
+    BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive 5xx/timeouts before a host is opened
+    BREAKER_ERROR_RATE: float = 0.5  # or this share of failures over the last BREAKER_WINDOW requests
+    BREAKER_WINDOW: int = 20
+    BREAKER_OPEN_SECONDS: float = 300  # how long an open host is skipped before a trial request
 
     SCRAPE_INTERVAL_MIN: int = 15
 
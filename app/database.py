@@ -48,6 +48,7 @@ def init_db():
     _ensure_usuario_fuente_relation()
     _ensure_usuario_columns()
     _ensure_social_media_columns()  # <- AGREGAR ESTA LÍNEA
+    _ensure_fuente_columns()
     create_default_user()  # Crear usuario por defecto después de crear tablas
     create_default_benefits()  # Crear beneficios por defecto
 
@@ -385,6 +386,29 @@ def _ensure_usuario_columns():
         except Exception:
             pass
         conn.commit()
+def _ensure_fuente_columns():
+    """Agrega las columnas de configuración de scraping a la tabla fuentes si no existen."""
+    with engine.connect() as conn:
+        result = conn.execute(text("PRAGMA table_info(fuentes)")).fetchall()
+        existing_columns = [row[1] for row in result]
+
+        columns_to_add = [
+            ("rate_limit_seconds", "FLOAT"),
+            ("rate_limit_burst", "INTEGER"),
+            ("feed_url", "VARCHAR(1000)"),
+            ("feed_type", "VARCHAR(20)"),
+            ("feed_checked_at", "DATETIME"),
+            ("listing_fingerprint", "VARCHAR(64)"),
+            ("last_scrape_status", "VARCHAR(20)"),
+        ]
+
+        for column_name, column_type in columns_to_add:
+            if column_name not in existing_columns:
+                print(f"[INFO] Columna '{column_name}' no existe en fuentes. Se creará automáticamente.")
+                conn.execute(text(f"ALTER TABLE fuentes ADD COLUMN {column_name} {column_type}"))
+                print(f"[OK] Columna '{column_name}' agregada a fuentes")
+
+        conn.commit()
 # -----------------------------
 # Función para migrar datos existentes
 # -----------------------------
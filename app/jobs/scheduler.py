@@ -5,8 +5,10 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Fuente, Usuario
-from app.scraper.generic import GenericScraper
+from app.scraper.registry import scraper_for
 from app.scraper.base import BaseScraper
+from app.scraper.breaker import circuit_breakers
+from app.scraper.retry_queue import process_due_retries
 from app.services.source_service import mark_scraped
 import asyncio
 import logging
@@ -38,10 +40,14 @@ async def _scrape_fuentes_usuario(db: Session, usuario_id: int):
         log.info(f"🔍 Scrapeando para {usuario.email} ({plan_info}): {len(fuentes_permitidas)} fuentes")
 
         for fuente in fuentes_permitidas:
+            if circuit_breakers.is_open(fuente.url_listado):
+                log.warning(f"⛔ {fuente.nombre} degradada (circuito abierto), se omite")
+                continue
             try:
                 log.info(f"📰 Scrapeando: {fuente.nombre} - {fuente.url_listado}")
-                scraper = GenericScraper(fuente.url_listado)
-                articulos = scraper.scrape_and_store()
+                scraper = scraper_for(fuente.url_listado, fuente.rate_limit_seconds, fuente.rate_limit_burst)
+                # fuera del event loop: la API sigue respondiendo durante el scraping
+                articulos = await asyncio.to_thread(scraper.scrape_and_store)
                 
                 # Marcar como scrapeada
                 mark_scraped(db, fuente.id)
@@ -154,9 +160,12 @@ def _scrape_all_sources_legacy():
         print(f"📰 Fuentes habilitadas: {len(fuentes)}")
         
         for f in fuentes:
+            if circuit_breakers.is_open(f.url_listado):
+                print(f"⛔ Fuente degradada (circuito abierto), se omite: {f.url_listado}")
+                continue
             try:
                 print(f"🔍 Scrapeando: {f.url_listado}")
-                scraper = GenericScraper(f.url_listado)
+                scraper = scraper_for(f.url_listado, f.rate_limit_seconds, f.rate_limit_burst)
                 articulos = scraper.scrape_and_store()
                 print(f"✅ {f.url_listado}: {len(articulos)} artículos procesados")
                 mark_scraped(db, f.id)
@@ -309,10 +318,22 @@ def start_scheduler():
             log.error(f"💥 Error in trial reminder job: {e}")
     
         # NOTE: run_trial_reminder_now existe también como función pública definida más arriba
+    # ✅ JOB ADICIONAL: Reintentar descargas fallidas cuyo backoff / Retry-After ya venció
+    @_scheduler.scheduled_job("interval", seconds=getattr(settings, "RETRY_POLL_SECONDS", 15),
+                              id="reintentos_descarga")
+    def periodic_retries():
+        try:
+            reintentadas = process_due_retries()
+            if reintentadas:
+                log.info(f"🔁 {reintentadas} descargas reintentadas")
+        except Exception as e:
+            log.error(f"💥 Error procesando reintentos: {e}")
+
     print("=" * 60)
     print("✅ SCHEDULER INICIADO")
     print("📍 Scraping automático cada 2 horas (todos los usuarios)")
     print("📍 Scraping rápido cada 30 minutos (solo premium)")
+    print("📍 Reintentos de descargas fallidas con backoff / Retry-After")
     print("🔒 Respetando límites de planes:")
     print("   • Gratis: 3 fuentes máximas")
     print("   • Premium: Fuentes ilimitadas")
@@ -350,12 +371,16 @@ async def scrapear_fuente_manual(usuario_id: int, fuente_id: int) -> bool:
         if not fuente:
             log.error(f"Fuente {fuente_id} no encontrada")
             return False
+
+        if circuit_breakers.is_open(fuente.url_listado):
+            log.warning(f"⛔ {fuente.nombre} degradada (circuito abierto), se omite")
+            return False
         
         # Scrapear la fuente
         try:
             log.info(f"🔍 Scrapeando manualmente: {fuente.nombre}")
-            scraper = GenericScraper(fuente.url_listado)
-            articulos = scraper.scrape_and_store()
+            scraper = scraper_for(fuente.url_listado, fuente.rate_limit_seconds, fuente.rate_limit_burst)
+            articulos = await asyncio.to_thread(scraper.scrape_and_store)
             mark_scraped(db, fuente.id)
             log.info(f"✅ {fuente.nombre}: {len(articulos)} artículos procesados")
             return True
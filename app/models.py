@@ -1,6 +1,6 @@
 # app/models.py
 from datetime import datetime
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index, func, Boolean, Column
+from sqlalchemy import String, Text, Integer, Float, DateTime, ForeignKey, Index, func, Boolean, Column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -60,6 +60,16 @@ class Fuente(Base):
     nombre: Mapped[str | None] = mapped_column(String(255), nullable=True)
     habilitada: Mapped[bool] = mapped_column(Boolean, default=True)
     last_scraped_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Rate limit propio del host (None = usar RATE_LIMIT_SECONDS / RATE_LIMIT_BURST)
+    rate_limit_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rate_limit_burst: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Feed RSS/Atom o news-sitemap descubierto (se usa en vez del listado HTML)
+    feed_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    feed_type: Mapped[str | None] = mapped_column(String(20), nullable=True)  # 'rss' | 'atom' | 'sitemap' | 'none'
+    feed_checked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Huella del conjunto de enlaces del último listado procesado y resultado de la última ola
+    listing_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_scrape_status: Mapped[str | None] = mapped_column(String(20), nullable=True)  # 'changed' | 'no_change'
 
     # Relación con usuario
     usuario_id: Mapped[int | None] = mapped_column(ForeignKey('usuarios.id'), nullable=True)
@@ -171,4 +181,67 @@ class Movimiento(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     def __repr__(self):
-        return f"<Movimiento {self.id} - {self.accion}>"
\ No newline at end of file
+        return f"<Movimiento {self.id} - {self.accion}>"
+
+# --- MODELO DE CACHÉ HTTP (validadores para GET condicional) ---
+class HttpCache(Base):
+    __tablename__ = "http_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(String(1000), unique=True, index=True)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<HttpCache {self.url}>"
+
+
+# --- MODELO DE CIRCUIT BREAKER POR HOST ---
+class HostCircuit(Base):
+    __tablename__ = "host_circuits"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    host: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    state: Mapped[str] = mapped_column(String(20), default="closed")  # 'closed' | 'open' | 'half_open'
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0)
+    opened_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<HostCircuit {self.host} - {self.state}>"
+
+
+# --- MODELO DE DEAD-LETTER (URLs QUE AGOTARON SUS REINTENTOS) ---
+class DeadLetter(Base):
+    __tablename__ = "dead_letters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(String(1000), unique=True, index=True)
+    listado_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<DeadLetter {self.url} ({self.attempts} intentos)>"
+
+
+# --- MODELO DE RENDIMIENTO DE ENLACES POR PATRÓN DE URL ---
+class LinkYield(Base):
+    __tablename__ = "link_yields"
+    __table_args__ = (Index("ix_link_yields_host_pattern", "host", "pattern", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    host: Mapped[str] = mapped_column(String(255), index=True)
+    pattern: Mapped[str] = mapped_column(String(255))  # e.g. '/noticias/{slug}'
+    fetched: Mapped[int] = mapped_column(Integer, default=0)  # links downloaded
+    articles: Mapped[int] = mapped_column(Integer, default=0)  # of those, extracted as articles
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<LinkYield {self.host}{self.pattern} {self.articles}/{self.fetched}>"
@@ -0,0 +1,68 @@
+# app/routes/scraping.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.scraper.breaker import circuit_breakers
+from app.database import get_db
+from app.models import DeadLetter
+from app.scraper.concurrency import host_limits
+from app.scraper.extraction_cache import extraction_cache
+from app.scraper.link_yield import link_yields
+from app.scraper.retry_queue import retry_queue
+from app.scraper.seen import seen_urls
+from app.scraper.stats import fetch_stats
+from app.scraper import extractors, registry, templates
+
+router = APIRouter(prefix="/scraping", tags=["Scraping"])
+
+
+@router.get("/stats")
+def scraping_stats():
+    """Contadores de la capa de descarga (páginas, bytes descargados/evitados, abortos) y caché de extracción."""
+    return {"fetch": fetch_stats.snapshot(), "seen": seen_urls.stats(), "extraction_cache": extraction_cache.stats()}
+
+
+@router.get("/templates")
+def scraping_templates():
+    """Aciertos y fallos de las plantillas por sitio (una tasa que cae indica un rediseño del sitio)."""
+    return {"templates": templates.snapshot()}
+
+
+@router.get("/extractors")
+def scraping_extractors():
+    """Llamadas, tasa de éxito y latencia por extractor, y qué scraper/extractor usa cada host."""
+    return {"extractors": extractors.snapshot(), "registry": registry.snapshot()}
+
+
+@router.get("/circuits")
+def scraping_circuits():
+    """Hosts con el circuito abierto o semiabierto (fuentes degradadas)."""
+    return {"circuits": circuit_breakers.snapshot()}
+
+
+@router.get("/hosts")
+def scraping_hosts():
+    """Límite de concurrencia adaptativo y latencia (p50/p95) actuales por host."""
+    return {"hosts": host_limits.snapshot()}
+
+
+@router.get("/link-yields")
+def scraping_link_yields(host: Optional[str] = None):
+    """Rendimiento aprendido por host y patrón de URL (enlaces descargados vs. artículos extraídos)."""
+    return {"patterns": link_yields.snapshot(host)}
+
+
+@router.get("/retries")
+def scraping_retries(limit: int = 50, db: Session = Depends(get_db)):
+    """Cola de reintentos pendiente y últimas URLs enviadas a dead-letter."""
+    dead = db.query(DeadLetter).order_by(DeadLetter.updated_at.desc()).limit(limit).all()
+    return {
+        "queue": retry_queue.snapshot(),
+        "dead_letters": [
+            {"url": d.url, "listado_url": d.listado_url, "attempts": d.attempts,
+             "last_error": d.last_error, "updated_at": d.updated_at}
+            for d in dead
+        ],
+    }
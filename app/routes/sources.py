@@ -11,7 +11,8 @@ import asyncio
 from app.database import get_db, create_default_user
 from app import models
 from app.models import Usuario, Fuente
-from app.scraper.generic import GenericScraper
+from app.scraper.registry import scraper_for
+from app.scraper.breaker import circuit_breakers
 from app.services.source_service import add_fuente as svc_add_fuente
 
 router = APIRouter(prefix="/sources", tags=["Fuentes"])
@@ -39,13 +40,17 @@ async def ejecutar_scraping_fuente(fuente_id: int, db: Session) -> list:
             logger.error(f"❌ Fuente {fuente_id} no encontrada")
             return False
         
+        if circuit_breakers.is_open(fuente.url_listado):
+            logger.warning(f"⛔ {fuente.nombre} degradada (circuito abierto), se omite el scraping")
+            return False
+
         logger.info(f"📰 Scrapeando: {fuente.nombre} - {fuente.url_listado}")
         
-        # Usar el scraper genérico ya implementado que maneja extracción y guardado
+        # Scraper registrado para el host de la fuente (genérico por defecto), que maneja extracción y guardado
         try:
             # Ejecutar el scraping en un hilo separado para no bloquear el event loop
             def _run_scraper():
-                s = GenericScraper(fuente.url_listado)
+                s = scraper_for(fuente.url_listado, fuente.rate_limit_seconds, fuente.rate_limit_burst)
                 return s.scrape_and_store()
 
             saved_articles = await asyncio.to_thread(_run_scraper)
@@ -63,7 +68,7 @@ async def ejecutar_scraping_fuente(fuente_id: int, db: Session) -> list:
                     db.rollback()
             return saved_articles or []
         except Exception as e:
-            logger.error(f"❌ Error ejecutando GenericScraper para fuente {fuente.id}: {e}")
+            logger.error(f"❌ Error ejecutando el scraper para fuente {fuente.id}: {e}")
             return False
             
     except Exception as e:
@@ -224,6 +229,9 @@ async def listar_fuentes(
         fuentes = query.order_by(models.Fuente.id.desc()).offset(offset).limit(limit).all()
         has_next = offset + limit < total
 
+        # Fuentes con el circuito abierto (host fallando) se muestran como degradadas
+        degradadas = {f.id for f in fuentes if circuit_breakers.is_open(f.url_listado)}
+
         # Calcular límites
         es_premium = current_user.plan == "premium" if current_user else False
         max_fuentes = None if es_premium else 3
@@ -244,7 +252,8 @@ async def listar_fuentes(
                 "current_user": current_user,
                 "es_premium": es_premium,
                 "max_fuentes": max_fuentes,
-                "fuentes_actuales": len(fuentes)
+                "fuentes_actuales": len(fuentes),
+                "degradadas": degradadas
             },
         )
     except Exception as e:
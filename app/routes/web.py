@@ -6,9 +6,6 @@ import json
 import re
 import asyncio
 
-import requests
-import trafilatura
-from bs4 import BeautifulSoup
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
@@ -20,6 +17,8 @@ from app.models import Usuario, Fuente, Noticia
 from app.auth import web_authenticate_user
 from app.database import get_db
 from app import models
+from app.scraper.links import link_extractor
+from app.scraper.url_rules import listing_article_links, looks_like_article_url
 from app.services.source_service import puede_agregar_fuente, contar_fuentes_usuario
 from app.jobs.scheduler import scrapear_fuente_manual, scrapear_usuario_manual, run_trial_reminder_now
 import json
@@ -73,7 +72,6 @@ router = APIRouter(prefix="/web", tags=["web"])
 templates = Jinja2Templates(directory="app/web/templates")
 
 logger = logging.getLogger("uvicorn")
-USER_AGENT = "NewsMonitor/1.0 (+https://example.local)"
 
 
 # =========================
@@ -116,10 +114,6 @@ CATEGORY_ALIASES = {
     "opinión": "Opinión",
 }
 
-SECTION_SLUGS_GENERIC = {
-    "", "home", "inicio", "ultimas-noticias", "últimas-noticias", "portada", "principal",
-    "buscar", "videos", "audio", "podcast", "programas"
-}
 
 def _norm(s: str | None) -> str | None:
     if not s: return None
@@ -183,346 +177,26 @@ def _parse_dt(dt_str: str | None) -> datetime | None:
         logger.debug(f"[PARSE_DT] Falló fromisoformat para '{dt_str}' -> '{s}'")
         return None
 
-def _infer_category_from_url(u: str) -> str | None:
-    path = urlparse(u).path.strip("/")
-    if not path:
-        return None
-    parts = [p for p in path.split("/") if p]
-    if not parts:
-        return None
-    cand = parts[0]
-    if cand in SECTION_SLUGS_GENERIC and len(parts) > 1:
-        cand = parts[1]
-    cat = _normalize_category(cand)
-    return cat
-
-def _extract_ld_json_items(soup: BeautifulSoup) -> list[dict]:
-    items = []
-    for s in soup.find_all("script", type=lambda t: t and "ld+json" in t):
-        try:
-            data = json.loads(s.string or "")
-        except Exception:
-            continue
-        if isinstance(data, dict):
-            items.append(data)
-        elif isinstance(data, list):
-            items.extend([d for d in data if isinstance(d, dict)])
-    return items
-
-def _infer_category_from_meta(soup: BeautifulSoup) -> str | None:
-    m = soup.find("meta", property="article:section")
-    if m and m.get("content"):
-        cat = _normalize_category(m["content"])
-        if cat:
-            return cat
-    for name in ("section", "category"):
-        m = soup.find("meta", attrs={"name": name})
-        if m and m.get("content"):
-            cat = _normalize_category(m["content"])
-            if cat:
-                return cat
-    for it in _extract_ld_json_items(soup):
-        val = it.get("articleSection") or it.get("section")
-        if isinstance(val, list) and val:
-            cat = _normalize_category(val[0])
-            if cat:
-                return cat
-        elif isinstance(val, str):
-            cat = _normalize_category(val)
-            if cat:
-                return cat
-    key = soup.find("meta", attrs={"name": "keywords"})
-    if key and key.get("content"):
-        for token in re.split(r"[,;|/]+", key["content"]):
-            cat = _normalize_category(token)
-            if cat in set(CATEGORY_ALIASES.values()):
-                return cat
-    return None
-
 def _looks_like_article_url(u: str) -> bool:
     """
     Versión mejorada para detectar URLs de artículos
+    (reglas compiladas en app.scraper.url_rules)
     """
-    path = urlparse(u).path.strip("/")
-    if not path:
-        return False
-        
-    last_part = path.split("/")[-1]
-    
-    # EXCLUSIONES
-    if "." in last_part:  # Archivos (pdf, jpg, etc.)
-        return False
-        
-    exclude_parts = SECTION_SLUGS_GENERIC.union({
-        "politicas-de-privacidad", "terminos-y-condiciones", "contacto",
-        "nosotros", "about", "contact", "privacy", "terms", "login", 
-        "register", "auth", "user", "profile", "search", "tag", "category"
-    })
-    
-    if last_part in exclude_parts:
-        return False
-        
-    # REGLAS DE INCLUSIÓN
-    # 1. Tiene al menos 2 guiones (indicativo de título)
-    if last_part.count("-") >= 2:
-        return True
-        
-    # 2. Es lo suficientemente largo para ser un slug
-    if len(last_part) >= 15:
-        return True
-        
-    # 3. Está en una ruta profunda (ej: /noticias/politica/titulo-articulo)
-    if path.count("/") >= 2:
-        return True
-        
-    return False
+    return looks_like_article_url(u)
 
 def _extract_links(list_url: str, html: str, same_domain_only: bool = True, max_links: int = 60) -> list[str]:
     """
     VERSIÓN MEJORADA - Detección inteligente de artículos para Latina y otros sitios
     """
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    base_host = urlparse(list_url).netloc
-    
     logger.info(f"[SCRAPER] 🔗 Analizando listado: {list_url}")
-    
-    # PATRONES ESPECÍFICOS PARA SITIOS COMUNES
-    site_patterns = {
-        "latina.pe": [
-            "/noticias/", "/tendencias/", "/espectaculos/", "/deportes/", 
-            "/tecnologia/", "/farandula/", "/actualidad/", "/politica/",
-            "/entretenimiento/", "/series/", "/musica/"
-        ],
-        "rpp.pe": [
-            "/noticias/", "/politica/", "/deportes/", "/tecnologia/",
-            "/actualidad/", "/peru/", "/mundo/", "/economia/"
-        ],
-        "peru21.pe": [
-            "/noticias/", "/actualidad/", "/deportes/", "/politica/",
-            "/lima/", "/mundo/", "/espectaculos/", "/economia/"
-        ],
-        "trome.pe": [
-            "/noticias/", "/actualidad/", "/deportes/", "/espectaculos/",
-            "/tendencias/", "/virales/", "/futbol/"
-        ]
-    }
-    
-    # PALABRAS CLAVE QUE INDICAN ARTÍCULOS
-    article_keywords = [
-        "noticia", "noticias", "articulo", "artículo", "news", "story",
-        "reportaje", "informe", "actualidad", "tendencia", "deporte",
-        "politica", "espectaculo", "farandula", "tecnologia", "mundo",
-        "entretenimiento", "musica", "cine", "series", "deportes", "futbol"
-    ]
-    
-    # EXCLUSIONES - lo que NO son artículos
-    exclude_patterns = [
-        "politicas-de-privacidad", "terminos-y-condiciones", "contacto",
-        "nosotros", "about", "contact", "privacy", "terms", "pdf", 
-        "document", ".pdf", ".doc", ".docx", "login", "register",
-        "facebook", "twitter", "instagram", "youtube", "whatsapp",
-        "auth", "user", "profile", "search", "tag", "category", "archivo",
-        "publicidad", "anuncio", "advertisement", "ads", "promocion",
-        "_files", "/pdf/", "/document/", "/static/", "/assets/"
-    ]
-    
-    for a in soup.find_all("a", href=True):
-        href = a.get("href")
-        if not href:
-            continue
-            
-        full_url = urljoin(list_url, href)
-        parsed = urlparse(full_url)
-        
-        # Validaciones básicas
-        if parsed.scheme not in ("http", "https"):
-            continue
-        if same_domain_only and parsed.netloc and base_host and (parsed.netloc != base_host):
-            continue
-            
-        path = parsed.path.strip("/").lower()
-        full_url_lower = full_url.lower()
-        
-        # EXCLUSIONES ESTRICTAS
-        if any(exclude in path for exclude in exclude_patterns):
-            continue
-        if any(exclude in full_url_lower for exclude in [".pdf", ".doc", ".docx", "/pdf/", "/document/"]):
-            continue
-            
-        # 1. DETECCIÓN POR PATRONES ESPECÍFICOS DEL SITIO
-        site_key = parsed.netloc.replace("www.", "")
-        if site_key in site_patterns:
-            if any(pattern in path for pattern in site_patterns[site_key]):
-                links.append(full_url)
-                continue
-                
-        # 2. DETECCIÓN POR PALABRAS CLAVE EN LA URL
-        if any(keyword in path for keyword in article_keywords):
-            links.append(full_url)
-            continue
-            
-        # 3. DETECCIÓN POR ESTRUCTURA DE LA URL
-        last_part = path.split("/")[-1] if "/" in path else path
-        
-        # Debe tener al menos 2 partes separadas por guiones
-        if last_part.count("-") >= 2:
-            # Y ser lo suficientemente largo
-            if len(last_part) >= 15:
-                links.append(full_url)
-                continue
-                
-        # 4. DETECCIÓN POR PROFUNDIDAD DE RUTA
-        if path.count("/") >= 2 and len(last_part) >= 10:
-            links.append(full_url)
-            continue
-
-    # Eliminar duplicados
-    seen = set()
-    unique_links = []
-    for link in links:
-        if link not in seen:
-            seen.add(link)
-            unique_links.append(link)
+
+    # Exclusiones, patrones por sitio, palabras clave y estructura de la URL:
+    # reglas compiladas una sola vez en app.scraper.url_rules
+    unique_links = listing_article_links(list_url, link_extractor.hrefs(html), same_domain_only)
 
     logger.info(f"✅ Se encontraron {len(unique_links)} posibles artículos.")
     return unique_links[:max_links]
 
-def _is_article_html(html: str) -> tuple[bool, dict]:
-    soup = BeautifulSoup(html, "html.parser")
-    meta = {}
-
-    og_type = soup.find("meta", property="og:type")
-    if og_type and (og_type.get("content", "").lower() in ("article", "news", "newsarticle")):
-        meta["og_type"] = og_type.get("content")
-
-    og_title = soup.find("meta", property="og:title")
-    if og_title and og_title.get("content"):
-        meta["title"] = og_title["content"].strip()
-    og_img = soup.find("meta", property="og:image")
-    if og_img and og_img.get("content"):
-        meta["image"] = og_img["content"].strip()
-
-    pub = soup.find("meta", property="article:published_time") or soup.find("meta", attrs={"name": "pubdate"})
-    if pub and pub.get("content"):
-        meta["date"] = pub["content"].strip()
-
-    meta["categoria"] = _infer_category_from_meta(soup)
-
-    ld_items = _extract_ld_json_items(soup)
-    for it in ld_items:
-        t = it.get("@type")
-        tlist = []
-        if isinstance(t, list):
-            tlist = [x.lower() for x in t if isinstance(x, str)]
-        elif isinstance(t, str):
-            tlist = [t.lower()]
-        if any(x in ("article", "newsarticle") for x in tlist):
-            meta.setdefault("title", it.get("headline") or it.get("name"))
-            meta.setdefault("date", it.get("datePublished") or it.get("dateCreated"))
-            meta.setdefault("categoria", _normalize_category(it.get("articleSection")))
-            img = it.get("image")
-            if isinstance(img, dict):
-                meta.setdefault("image", img.get("url"))
-            elif isinstance(img, list) and img:
-                meta.setdefault("image", img[0].get("url") if isinstance(img[0], dict) else img[0])
-
-    has_article_tag = soup.find("article") is not None
-    has_h1 = soup.find("h1") is not None
-    is_article = ("og_type" in meta or ld_items or (has_article_tag and has_h1))
-    return is_article, meta
-
-def _scrape_article(url: str, html: str | None = None) -> dict | None:
-    try:
-        if html is None:
-            resp = requests.get(url, timeout=25, headers={"User-Agent": USER_AGENT})
-            if not resp.ok:
-                logger.warning(f"[SCRAPER] ❌ Error {resp.status_code} en: {url}")
-                return None
-            html = resp.text
-
-        is_article, meta = _is_article_html(html)
-        if not is_article:
-            logger.warning(f"[SCRAPER] ⚠️ No parece artículo: {url}")
-            return None
-
-        categoria = meta.get("categoria") or _infer_category_from_url(url)
-        categoria = _normalize_category(categoria) if categoria else None
-
-        # ===== INTENTO 1: JSON extraction =====
-        try:
-            data = trafilatura.extract(html, output="json", include_images=True)
-            
-            # Validación estricta: data debe ser string no vacío
-            if data and isinstance(data, str) and data.strip():
-                try:
-                    j = json.loads(data)
-                    titulo = j.get("title") or meta.get("title") or "Sin título"
-                    
-                    # Procesar imagen - puede ser string o lista
-                    imagen = j.get("image")
-                    if isinstance(imagen, list) and imagen:
-                        imagen = imagen[0]
-                    if not imagen and j.get("images"):
-                        images_list = j.get("images")
-                        if isinstance(images_list, list) and images_list:
-                            imagen = images_list[0]
-                    if not imagen:
-                        imagen = meta.get("image")
-                    if isinstance(imagen, list) and imagen:
-                        imagen = imagen[0]
-                    if isinstance(imagen, str):
-                        imagen = imagen.strip()
-                    
-                    logger.info(f"📰 Extrayendo artículo: {url}")
-                    logger.info(f"✅ Noticia guardada: {titulo[:50]}...")
-                    return {
-                        "titulo": titulo,
-                        "contenido": j.get("text"),
-                        "fecha_publicacion": j.get("date") or j.get("published") or meta.get("date"),
-                        "imagen_url": imagen,
-                        "categoria": categoria,
-                    }
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[SCRAPER] ⚠️ JSON inválido, fallback a texto: {e}")
-            else:
-                logger.debug(f"[SCRAPER] trafilatura JSON vacío, fallback a texto")
-        except Exception as e:
-            logger.debug(f"[SCRAPER] Error en extracción JSON: {e}, fallback")
-
-        # ===== FALLBACK: Plain text extraction =====
-        text = trafilatura.extract(html)
-        if not text:
-            logger.warning(f"[SCRAPER] ⚠️ Sin texto tras fallback: {url}")
-            return None
-
-        soup = BeautifulSoup(html, "html.parser")
-        title_tag = soup.find("title")
-        title_txt = (meta.get("title") or (title_tag.get_text(strip=True) if title_tag else None))
-
-        titulo = title_txt or url
-        
-        # Procesar imagen de meta - puede ser string o lista
-        meta_image = meta.get("image")
-        if isinstance(meta_image, list) and meta_image:
-            meta_image = meta_image[0]
-        if isinstance(meta_image, str):
-            meta_image = meta_image.strip()
-        
-        logger.info(f"📰 Extrayendo artículo: {url}")
-        logger.info(f"✅ Noticia guardada: {titulo[:50]}...")
-
-        return {
-            "titulo": titulo,
-            "contenido": text,
-            "fecha_publicacion": meta.get("date"),
-            "imagen_url": meta_image,
-            "categoria": categoria,
-        }
-    except Exception as e:
-        logger.error(f"[SCRAPER] 💥 Error extrayendo {url}: {e}")
-        return None
-
 
 # =========================
 # Helpers de modelo / tipos
@@ -0,0 +1,188 @@
+# app/scraper/archive.py
+"""Content-addressed on-disk archive of fetched HTML bodies.
+
+Layout under `HTML_ARCHIVE_DIR`:
+
+    objects/ab/<sha256>.gz|.zst   compressed bodies, one per distinct content
+    urls/<sha1(url)>.json         {url, hash, encoding, fetched_at}
+
+`BaseScraper` writes every downloaded page through `html_archive.put`. In
+replay mode (`SCRAPER_REPLAY=true` or `BaseScraper(replay=True)`) pages are
+served from here instead of the network, which makes re-extraction,
+debugging and benchmarking repeatable without re-downloading.
+
+Entries older than `HTML_ARCHIVE_TTL_HOURS` are pruned, and once the objects
+exceed `HTML_ARCHIVE_MAX_MB` the least recently used ones are evicted
+(blob mtime is refreshed on every read).
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is always available
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode when a URL is not in the archive."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Not archived: {url}")
+        self.url = url
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class HtmlArchive:
+    def __init__(self, root: Optional[str] = None, max_mb: Optional[float] = None,
+                 ttl_hours: Optional[float] = None):
+        self.root = Path(root or getattr(settings, "HTML_ARCHIVE_DIR", "data/archive"))
+        self.max_bytes = int((max_mb if max_mb is not None else getattr(settings, "HTML_ARCHIVE_MAX_MB", 512)) * 1024 * 1024)
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else getattr(settings, "HTML_ARCHIVE_TTL_HOURS", 168)) * 3600
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    # --- paths ---
+    def _url_path(self, url: str) -> Path:
+        return self.root / "urls" / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _object_path(self, digest: str) -> Optional[Path]:
+        folder = self.root / "objects" / digest[:2]
+        for ext in (".zst", ".gz"):
+            p = folder / (digest + ext)
+            if p.exists():
+                return p
+        return None
+
+    # --- public API ---
+    def put(self, url: str, body: bytes, encoding: Optional[str] = None) -> str:
+        """Store `body` for `url` and return its content hash."""
+        digest = hashlib.sha256(body).hexdigest()
+        added = 0
+        existing = self._object_path(digest)
+        if existing is not None:
+            try:
+                os.utime(existing)  # same content seen again: refresh for TTL/LRU
+            except OSError:
+                pass
+        else:
+            if zstandard is not None:
+                data, ext = zstandard.ZstdCompressor(level=3).compress(body), ".zst"
+            else:
+                data, ext = gzip.compress(body, compresslevel=5), ".gz"
+            _atomic_write(self.root / "objects" / digest[:2] / (digest + ext), data)
+            added = len(data)
+        ref = {"url": url, "hash": digest, "encoding": encoding, "fetched_at": time.time()}
+        _atomic_write(self._url_path(url), json.dumps(ref).encode("utf-8"))
+
+        if added:
+            with self._lock:
+                if self._size is not None:
+                    self._size += added
+                # first write of the process: scan the disk once to learn the real size
+                over = self._size is None or self._size > self.max_bytes
+            if over:
+                self.prune()
+        return digest
+
+    def get(self, url: str) -> Optional[tuple[bytes, Optional[str]]]:
+        """Return (body, encoding) for `url`, or None if not archived."""
+        try:
+            ref = json.loads(self._url_path(url).read_bytes())
+        except (OSError, ValueError):
+            return None
+        path = self._object_path(ref["hash"])
+        if path is None:
+            return None
+        raw = path.read_bytes()
+        body = zstandard.ZstdDecompressor().decompress(raw) if path.suffix == ".zst" else gzip.decompress(raw)
+        try:
+            os.utime(path)  # LRU bookkeeping
+        except OSError:
+            pass
+        return body, ref.get("encoding")
+
+    def get_text(self, url: str) -> str:
+        """Decoded body for `url`; raises ArchiveMiss if not archived."""
+        hit = self.get(url)
+        if hit is None:
+            raise ArchiveMiss(url)
+        body, encoding = hit
+        return body.decode(encoding or "utf-8", errors="replace")
+
+    def prune(self) -> dict:
+        """Drop expired URL entries, then evict LRU objects above the size cap."""
+        now = time.time()
+        removed_refs = removed_objects = 0
+        urls_dir = self.root / "urls"
+        if urls_dir.exists():
+            for p in urls_dir.glob("*.json"):
+                try:
+                    if now - json.loads(p.read_bytes()).get("fetched_at", 0) > self.ttl_seconds:
+                        p.unlink()
+                        removed_refs += 1
+                except (OSError, ValueError):
+                    continue
+
+        objects = []
+        objects_dir = self.root / "objects"
+        if objects_dir.exists():
+            for p in objects_dir.glob("*/*"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl_seconds:
+                    p.unlink(missing_ok=True)
+                    removed_objects += 1
+                    continue
+                objects.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in objects)
+        if total > self.max_bytes:
+            # evict down to 90% of the cap so we don't prune on every put
+            target = int(self.max_bytes * 0.9)
+            for _, size, p in sorted(objects, key=lambda o: o[0]):
+                if total <= target:
+                    break
+                p.unlink(missing_ok=True)
+                total -= size
+                removed_objects += 1
+
+        with self._lock:
+            self._size = total
+        if removed_refs or removed_objects:
+            log.info("HTML archive pruned: %d urls, %d objects (%.1f MB left)",
+                     removed_refs, removed_objects, total / 1024 / 1024)
+        return {"urls": removed_refs, "objects": removed_objects, "bytes": total}
+
+
+html_archive = HtmlArchive()
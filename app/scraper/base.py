@@ -1,18 +1,56 @@
 # app/scraper/base.py
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Any
-import time
+from typing import Optional, Any, Callable, Iterable
+from urllib.parse import urlparse
+import asyncio
 import logging
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.database import get_db
+from app.scraper import fingerprint, http_cache
+from app.scraper.archive import html_archive
+from app.scraper.breaker import circuit_breakers, CircuitOpen
+from app.scraper.canonical import canonical_article_url, canonical_url
+from app.scraper.charset import decode_body
+from app.scraper.concurrency import host_limits, parse_retry_after, OVERLOAD_STATUSES
+from app.scraper.extraction_cache import cached_extract
+from app.scraper.feeds import FeedEntry, feed_listing, invalidate_feed
+from app.scraper.frontier import crawl_listing, take_budget, take_deferred
+from app.scraper.http_cache import NotModified
+from app.scraper.link_yield import link_yields
+from app.scraper.links import link_extractor
+from app.scraper.ratelimit import rate_limiter
+from app.scraper.retry_queue import retry_queue
+from app.scraper.seen import seen_urls
+from app.scraper.sessions import get_session
+from app.scraper.singleflight import downloads, extractions
+from app.scraper.stats import fetch_stats
+from app.scraper.workers import extraction_pool
+from app.services.news_service import upsert_noticia
 
 log = logging.getLogger(__name__)
+# progress of the listing -> articles pipeline (see BaseScraper.scrape_and_store)
+scrape_log = logging.getLogger("nexnews.scraper")
+
+# Value used by fetch_many for URLs that were answered with 304 (or an identical body)
+NOT_MODIFIED = object()
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_SIZE = 64 * 1024
+
+
+class SkippedContent(Exception):
+    """Raised when a download is aborted early (non-HTML type or body too large)."""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"Skipped {url}: {reason}")
+        self.url = url
+        self.reason = reason
 
 
 @dataclass
@@ -28,60 +66,418 @@ class Article:
 class BaseScraper:
     """Base class for scrapers.
 
-    Provides a requests.Session with retries, simple rate limiting and
-    a small helper `fetch` used by concrete scrapers.
+    Provides the shared pooled requests.Session (see
+    `app.scraper.sessions`), shared per-host rate limiting and adaptive
+    per-host concurrency (`app.scraper.concurrency`),
+    a small helper `fetch` used by concrete scrapers, `fetch_many` /
+    `afetch_many` to download several pages concurrently and `extract_many`
+    to parse them on the extraction worker processes.
+
+    For a source (`listado_url`) it also runs the whole listing -> articles
+    pipeline (`parse_listing`, `scrape_and_store`, `process_urls`). Concrete
+    scrapers only provide their `extract_fields` extractor, which links
+    belong to the source (`_accept_link`, `_looks_like_article`,
+    `article_selectors`) and, if they want, their own `_log`.
     """
 
-    fuente: str = "base"
+    # fixed `fuente` of the stored articles; None uses the article's host
+    fuente: Optional[str] = None
+    # extractor run on the extraction workers (a module-level function
+    # registered with @extractor, wrapped in staticmethod)
+    extract_fields: Optional[Callable[[str, str], Optional[dict]]] = None
+    # CSS selectors of the article anchors on the HTML listing (empty: all anchors)
+    article_selectors: tuple[str, ...] = ()
 
-    def __init__(self, session: Optional[requests.Session] = None):
-        self.session = session or requests.Session()
+    def __init__(self, listado_url: Optional[str] = None, rate_limit_seconds: Optional[float] = None,
+                 rate_limit_burst: Optional[int] = None, *, session: Optional[requests.Session] = None,
+                 replay: Optional[bool] = None):
+        self.listado_url = listado_url
+        self.unchanged_urls: list[str] = []
+        # metadata (title, date, image) brought by the source's feed, by article URL
+        self.feed_entries: dict[str, FeedEntry] = {}
+        # the source's own limit (shared by the whole process for that host)
+        if listado_url and (rate_limit_seconds is not None or rate_limit_burst is not None):
+            rate_limiter.configure(listado_url, rate_limit_seconds, rate_limit_burst)
 
-        retries = Retry(
-            total=getattr(settings, "REQUEST_RETRIES", 3),
-            backoff_factor=getattr(settings, "BACKOFF_FACTOR", 0.5),
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "PUT", "DELETE", "HEAD"],
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+        # shared across scrapers so keep-alive connections are reused between sources and runs
+        self.session = session or get_session()
+
+        self.concurrency = getattr(settings, "FETCH_CONCURRENCY", 8)
 
         self.user_agent = getattr(settings, "USER_AGENT", "news-scraper/1.0")
         self.timeout = getattr(settings, "REQUEST_TIMEOUT", 15)
-        self.rate_limit = getattr(settings, "RATE_LIMIT_SECONDS", 0)
-
-        # timestamp of last request (for simple rate limiting)
-        self._last_request_at = 0.0
-
-    def _sleep_rate_limit(self) -> None:
-        if not self.rate_limit:
-            return
-        elapsed = time.time() - self._last_request_at
-        if elapsed < self.rate_limit:
-            to_sleep = self.rate_limit - elapsed
-            log.debug("Rate limit: sleeping %.2fs", to_sleep)
-            time.sleep(to_sleep)
+        self.use_http_cache = getattr(settings, "HTTP_CACHE_ENABLED", True)
+        self.max_bytes = getattr(settings, "FETCH_MAX_BYTES", 5 * 1024 * 1024)
+        self.archive = html_archive if getattr(settings, "HTML_ARCHIVE_ENABLED", True) else None
+        # replay: read pages from the HTML archive only, never from the network
+        self.replay = getattr(settings, "SCRAPER_REPLAY", False) if replay is None else replay
 
     def fetch(self, url: str, params: Optional[dict[str, Any]] = None, headers: Optional[dict[str, str]] = None,
-              timeout: Optional[float] = None, allow_redirects: bool = True, proxies: Optional[dict] = None) -> str:
+              timeout: Optional[float] = None, allow_redirects: bool = True, proxies: Optional[dict] = None,
+              conditional: bool = True, content_types: Optional[tuple[str, ...]] = HTML_CONTENT_TYPES) -> str:
         """Fetch a URL and return text. Raises on HTTP errors.
 
-        Uses session with retries. Honors rate limit configured in settings.
+        Uses the shared session, which only retries failed connects. A
+        transient 5xx or read error is raised to the caller and not retried
+        at all: only article downloads through `fetch_many` go to
+        `app.scraper.retry_queue`, so listing pages, feeds and robots.txt
+        fetched here are simply read again on the next wave. Waits for the
+        shared per-host rate limiter (see `app.scraper.ratelimit`) before
+        sending the request. With
+        `conditional` the stored validators are sent and `NotModified` is
+        raised when the page did not change since the last fetch.
+        Downloaded bodies are written to the HTML archive; in replay mode
+        they are read back from it and `ArchiveMiss` is raised for unknown URLs.
+        The body is streamed: `SkippedContent` is raised as soon as the
+        Content-Type is not in `content_types` (None accepts anything) or the
+        body grows past FETCH_MAX_BYTES.
+        While the host's circuit breaker is open `CircuitOpen` is raised
+        without touching the network (see `app.scraper.breaker`).
+        Concurrent plain fetches of the same URL (from any scraper or job)
+        share a single download (see `app.scraper.singleflight`).
+        """
+        if self.replay:
+            return self._fetch(url)
+
+        def _download() -> str:
+            with host_limits.slot(url):
+                rate_limiter.acquire(url)
+                return self._fetch(url, params=params, headers=headers, timeout=timeout,
+                                   allow_redirects=allow_redirects, proxies=proxies, conditional=conditional,
+                                   content_types=content_types)
+
+        if params or headers or proxies or timeout or not allow_redirects:
+            return _download()
+        return downloads.do((url, conditional, content_types), _download)
+
+    def extract(self, url: str, html: str) -> Any:
+        """`parse_article(url, html)` shared by concurrent callers with the same page."""
+        return extractions.do((type(self).__name__, url, hash(html)), lambda: self.parse_article(url, html=html))
+
+    def extract_many(self, pages: dict[str, Any]) -> dict[str, Future]:
+        """Start `extract` for every downloaded page of `pages` (as returned by `fetch_many`).
+
+        Returns {url: future}; the extractions run in parallel on the
+        extraction worker processes (see `app.scraper.workers`), so callers
+        can store the first articles while later ones are still parsed.
+        Without workers nothing is started and {} is returned: callers then
+        call `extract` one page at a time.
         """
+        pending = {url: html for url, html in pages.items() if isinstance(html, str)}
+        if extraction_pool.workers <= 0 or not pending:
+            return {}
+        # threads only wait for the worker processes; the parsing happens there
+        executor = ThreadPoolExecutor(max_workers=min(extraction_pool.workers, len(pending)))
+        try:
+            return {url: executor.submit(self.extract, url, html) for url, html in pending.items()}
+        finally:
+            executor.shutdown(wait=False)
+
+    def _read_body(self, resp: requests.Response, url: str, content_types: Optional[tuple[str, ...]]) -> None:
+        """Stream the body into `resp`, aborting early on unwanted type or size."""
+        ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        try:
+            length = int(resp.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = 0
+
+        if content_types and ctype and ctype not in content_types:
+            fetch_stats.incr("aborted_content_type")
+            fetch_stats.incr("bytes_avoided", length)
+            raise SkippedContent(url, f"content-type {ctype}")
+        if self.max_bytes and length > self.max_bytes:
+            fetch_stats.incr("aborted_too_large")
+            fetch_stats.incr("bytes_avoided", length)
+            raise SkippedContent(url, f"content-length {length}")
+
+        chunks = []
+        read = 0
+        for chunk in resp.iter_content(_CHUNK_SIZE):
+            read += len(chunk)
+            if self.max_bytes and read > self.max_bytes:
+                fetch_stats.incr("aborted_too_large")
+                fetch_stats.incr("bytes_avoided", max(length - read, 0))
+                raise SkippedContent(url, f"body larger than {self.max_bytes} bytes")
+            chunks.append(chunk)
+        # from here on resp.content / resp.text behave as for a non-streamed request
+        resp._content = b"".join(chunks)
+        resp._content_consumed = True
+        fetch_stats.incr("bytes_downloaded", read)
+
+    def _fetch(self, url: str, params: Optional[dict[str, Any]] = None, headers: Optional[dict[str, str]] = None,
+               timeout: Optional[float] = None, allow_redirects: bool = True, proxies: Optional[dict] = None,
+               conditional: bool = True, content_types: Optional[tuple[str, ...]] = HTML_CONTENT_TYPES) -> str:
+        """Perform the actual request; callers must hold a host slot and have acquired the rate limiter."""
+        if self.replay:
+            return html_archive.get_text(url)
+        if not circuit_breakers.allow(url):
+            fetch_stats.incr("circuit_open")
+            raise CircuitOpen(url)
+
         headers = dict(headers or {})
         headers.setdefault("User-Agent", self.user_agent)
+        # validators are stored per plain URL, so skip them when query params are added
+        conditional = conditional and self.use_http_cache and not params
+        if conditional:
+            for name, value in http_cache.conditional_headers(url).items():
+                headers.setdefault(name, value)
 
-        self._sleep_rate_limit()
+        resp = None
+        settled = False  # the breaker was told how the host answered
         try:
             resp = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout,
-                                    allow_redirects=allow_redirects, proxies=proxies)
-            self._last_request_at = time.time()
+                                    allow_redirects=allow_redirects, proxies=proxies, stream=True)
+            host_limits.record(url, resp.elapsed.total_seconds(), ok=resp.status_code < 500)
+            if resp.status_code in OVERLOAD_STATUSES:
+                host_limits.record_overload(url, parse_retry_after(resp.headers.get("Retry-After")))
+            # 5xx means the host is struggling; anything else means it answered
+            if resp.status_code >= 500:
+                circuit_breakers.record_failure(url, f"HTTP {resp.status_code}")
+            else:
+                circuit_breakers.record_success(url)
+            settled = True
+            if conditional and resp.status_code == 304:
+                http_cache.touch(url)
+                raise NotModified(url)
             resp.raise_for_status()
-            return resp.text
+            self._read_body(resp, url, content_types)
+            fetch_stats.incr("pages_downloaded")
+            if conditional and http_cache.remember(url, resp.headers.get("ETag"),
+                                                   resp.headers.get("Last-Modified"), resp.content):
+                raise NotModified(url)
+            # decode once from bytes; avoids requests' charset auto-detection
+            text, encoding = decode_body(url, resp.content, resp.headers.get("Content-Type"))
+            if self.archive is not None and not params:
+                try:
+                    self.archive.put(url, resp.content, encoding)
+                except OSError as exc:
+                    log.warning("Could not archive %s: %s", url, exc)
+            return text
+        except NotModified:
+            fetch_stats.incr("not_modified")
+            log.debug("Not modified: %s", url)
+            raise
+        except SkippedContent as exc:
+            log.info("%s", exc)
+            raise
+        except (requests.Timeout, requests.ConnectionError, requests.exceptions.RetryError) as exc:
+            # RetryError: only from a session whose adapter retries on status (not the shared one)
+            circuit_breakers.record_failure(url, f"{type(exc).__name__}: {exc}")
+            settled = True
+            log.exception("Error fetching %s: %s", url, exc)
+            raise
         except Exception as exc:
             log.exception("Error fetching %s: %s", url, exc)
             raise
+        finally:
+            if not settled:
+                # e.g. TooManyRedirects or InvalidURL: says nothing about the host,
+                # but a half-open trial ending this way must not block it for good
+                circuit_breakers.release(url)
+            if resp is not None:
+                resp.close()
+
+    async def afetch_many(self, urls: Iterable[str], concurrency: Optional[int] = None,
+                          per_host: Optional[int] = None) -> dict[str, Any]:
+        """Fetch several URLs concurrently and return {url: html, None or NOT_MODIFIED}.
+
+        Each download runs in a worker thread; the per-host rate limiter and
+        the adaptive per-host concurrency slots are awaited on the event loop.
+        The session's adapter only repeats a failed connect once, right away
+        (see `app.scraper.sessions`): 429/5xx answers and read timeouts come
+        back at once, and those URLs are handed to `retry_queue`, which
+        retries them with backoff (or Retry-After) in a later wave.
+        Concurrency is bounded globally and per host (`per_host` adds a fixed
+        cap on top of the adaptive limit); failed URLs map to None instead
+        of raising. URLs already being downloaded by another job wait for
+        that download instead of starting a new one.
+        """
+        urls = list(dict.fromkeys(urls))
+        global_sem = asyncio.Semaphore(concurrency or self.concurrency)
+        host_sems: dict[str, asyncio.Semaphore] = {}
+
+        async def _download(url: str) -> str:
+            async with global_sem:
+                if self.replay:
+                    return await asyncio.to_thread(self._fetch, url)
+                host_sem = host_sems.setdefault(urlparse(url).netloc, asyncio.Semaphore(per_host)) if per_host else None
+                if host_sem is not None:
+                    await host_sem.acquire()
+                await host_limits.acquire_async(url)
+                try:
+                    await rate_limiter.acquire_async(url)
+                    return await asyncio.to_thread(self._fetch, url)
+                finally:
+                    host_limits.release(url)
+                    if host_sem is not None:
+                        host_sem.release()
+
+        async def _shared(url: str) -> str:
+            if self.replay:
+                return await _download(url)
+            # same key as a plain fetch(url), so sync and async callers coalesce too
+            key = (url, True, HTML_CONTENT_TYPES)
+            future, leader = downloads.begin(key)
+            if not leader:
+                return await asyncio.wrap_future(future)
+            try:
+                result = await _download(url)
+            except BaseException as exc:
+                downloads.finish(key, future, error=exc)
+                raise
+            downloads.finish(key, future, result)
+            return result
+
+        async def _one(url: str) -> Any:
+            try:
+                result = await _shared(url)
+            except NotModified:
+                retry_queue.done(url)
+                return NOT_MODIFIED
+            except Exception as exc:
+                # fetch already logged the error; transient ones are retried later
+                retry_queue.schedule(url, exc, scraper=self)
+                return None
+            retry_queue.done(url)
+            return result
+
+        results = await asyncio.gather(*(_one(u) for u in urls))
+        return dict(zip(urls, results))
+
+    def fetch_many(self, urls: Iterable[str], concurrency: Optional[int] = None,
+                   per_host: Optional[int] = None) -> dict[str, Any]:
+        """Synchronous wrapper around `afetch_many`.
+
+        Safe to call from plain threads and from code already running inside
+        an event loop (e.g. the scheduler), in which case the downloads run on
+        a private loop in a helper thread.
+        """
+        coro = self.afetch_many(urls, concurrency=concurrency, per_host=per_host)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    # --- listing -> articles pipeline ---
+    def _log(self, level: int, msg: str) -> None:
+        """Progress messages of the pipeline; scrapers may send them elsewhere."""
+        scrape_log.log(level, msg)
+
+    def scrape_and_store(self) -> list[dict]:
+        """
+        Scrapea todas las noticias del listado, las guarda en la base de datos
+        y devuelve los resúmenes {id, titulo, url} de las noticias guardadas.
+        """
+        urls = self.parse_listing()
+        if not urls:
+            if self.listado_url in self.unchanged_urls:
+                fingerprint.mark_no_change(self.listado_url)
+            else:
+                self._log(logging.WARNING, "[⚠️ AVISO] No se encontraron artículos para procesar.")
+            return []
+
+        # Mismo conjunto de enlaces que la ola anterior: no hace falta mirar los artículos
+        if fingerprint.unchanged(self.listado_url, urls):
+            self._log(logging.INFO, f"⏭️ Listado sin enlaces nuevos desde el último scraping: {self.listado_url}")
+            return []
+
+        # Solo URLs nuevas o pendientes de revisita (el resto ya está guardado)
+        nuevas = seen_urls.select(urls)
+        if len(nuevas) < len(urls):
+            self._log(logging.INFO, f"⏭️ {len(urls) - len(nuevas)} artículos ya guardados se omiten, "
+                                    f"{len(nuevas)} por procesar")
+        if not nuevas:
+            return []
+
+        # Patrones de URL que casi nunca resultan en artículos se omiten; el resto, los más productivos primero
+        candidatas = link_yields.select(nuevas)
+        if len(candidatas) < len(nuevas):
+            self._log(logging.INFO, f"📉 {len(nuevas) - len(candidatas)} enlaces de patrones con bajo rendimiento se omiten")
+        if not candidatas:
+            return []
+
+        # Presupuesto de descargas por ola: el resto compite de nuevo en la siguiente
+        lote, diferidas = take_budget(self.listado_url, candidatas)
+        if diferidas:
+            self._log(logging.INFO, f"🧮 {diferidas} enlaces quedan para la próxima ola (presupuesto {len(lote)})")
+        return self.process_urls(lote)
+
+    def process_urls(self, urls: list[str]) -> list[dict]:
+        """Descarga, extrae y guarda los artículos `urls` (también usado por la cola de reintentos)."""
+        # Descargar todos los artículos en paralelo (límite global y por host)
+        pages = self.fetch_many(urls)
+        # Extraer en paralelo en los procesos de extracción mientras se guardan los anteriores
+        extraidos = self.extract_many(pages)
+
+        db = next(get_db())
+        saved_records = []
+        fallidos = []
+
+        for url in urls:
+            html = pages.get(url)
+            if html is NOT_MODIFIED:
+                # 304 / mismo contenido: no hace falta extraer ni actualizar
+                seen_urls.add(url)
+                self._log(logging.DEBUG, f"⏭️ Sin cambios: {url}")
+                self.unchanged_urls.append(url)
+                continue
+            if html is None:
+                if retry_queue.attempts(url):
+                    self._log(logging.INFO, f"🔁 Descarga fallida, reintento programado: {url}")
+                else:
+                    self._log(logging.WARNING, f"[⚠️ ERROR] No se pudo descargar el artículo {url}")
+                fallidos.append(url)
+                continue
+            article = extraidos[url].result() if url in extraidos else self.extract(url, html)
+            link_yields.record(url, article is not None)
+            if not article:
+                fallidos.append(url)
+                continue
+            # URL canónica (rel=canonical del mismo sitio) para no duplicar la noticia
+            article.url = canonical_article_url(url, html)
+
+            categoria = self.detectar_categoria(article.titulo, article.contenido, article.fuente)
+            self._log(logging.DEBUG, f"🏷️  Categoría detectada: {categoria}")
+
+            payload = {
+                "url": article.url,
+                "fuente": article.fuente,
+                "titulo": article.titulo,
+                "contenido": article.contenido,
+                "fecha_publicacion": article.fecha_publicacion,
+                "imagen_path": article.imagen_url,
+                "categoria": categoria,
+            }
+            try:
+                noticia_obj = upsert_noticia(db, payload)
+                seen_urls.add(article.url)
+                if article.url != url:
+                    seen_urls.add(url)
+                try:
+                    saved_records.append({"id": noticia_obj.id, "titulo": noticia_obj.titulo, "url": noticia_obj.url})
+                except Exception:
+                    # En caso de objetos desconectados, usar el artículo extraído
+                    saved_records.append({"id": None, "titulo": article.titulo, "url": article.url})
+                self._log(logging.INFO, f"✅ Noticia guardada: {article.titulo[:80]}... | {article.url}")
+            except Exception as e:
+                self._log(logging.ERROR, f"[❌ ERROR] No se pudo guardar la noticia {url}: {e}")
+                self._log(logging.DEBUG, f"Payload: {payload}")
+                fallidos.append(url)
+
+        db.close()
+        link_yields.flush()
+        # Lo que no se pudo procesar debe descargarse completo en la próxima ola
+        if fallidos:
+            for url in fallidos + [self.listado_url]:
+                http_cache.invalidate(url)
+            # el feed es lo que se leyó en vez del listado: un 304 ocultaría los fallidos
+            invalidate_feed(self.listado_url)
+            fingerprint.forget(self.listado_url)
+        self._log(logging.INFO, f"🎯 Scrap finalizado. {len(saved_records)} noticias guardadas o actualizadas, "
+                                f"{len(self.unchanged_urls)} sin cambios.")
+        return saved_records
 
     # ✅ NUEVO MÉTODO PARA DETECTAR CATEGORÍAS
     def detectar_categoria(self, titulo: str, contenido: str, fuente: str) -> str:
@@ -221,10 +617,93 @@ class BaseScraper:
         raise NotImplementedError("Cada scraper debe implementar este método")
 
     # Concrete scrapers should implement the following
-    def parse_listing(self, html: str) -> list[str]:
-        """Return list of article URLs from a listing page."""
+    def _accept_link(self, url: str) -> bool:
+        """Whether the absolute `url`, from the feed or the HTML listing, belongs to the source."""
         raise NotImplementedError
 
-    def parse_article(self, html: str, url: str) -> Article:
-        """Parse a single article page and return an Article instance."""
-        raise NotImplementedError
\ No newline at end of file
+    def _looks_like_article(self, url: str) -> bool:
+        """Extra check for links found on the HTML listing (feeds only list articles)."""
+        return True
+
+    def parse_listing(self) -> list[str]:
+        """Obtiene los enlaces de artículos del feed de la fuente o, si no tiene, de su listado HTML."""
+        # Si la fuente tiene feed RSS/Atom o news-sitemap, usarlo en vez del HTML
+        try:
+            feed = feed_listing(self, self.listado_url)
+        except NotModified:
+            self._log(logging.INFO, f"⏭️ Feed sin cambios desde el último scraping: {self.listado_url}")
+            self.unchanged_urls.append(self.listado_url)
+            return []
+        if feed is not None:
+            feed_type, entries = feed
+            links = []
+            for entry in entries:
+                url = canonical_url(entry.url)
+                if self._accept_link(url) and url not in self.feed_entries:
+                    self.feed_entries[url] = entry
+                    links.append(url)
+            self._log(logging.INFO, f"📡 Feed ({feed_type}): {len(links)} artículos en {self.listado_url}")
+            # Enlaces que no entraron en el presupuesto de la ola anterior, después de los nuevos del feed
+            nuevos = set(links)
+            links += [url for url in take_deferred(self.listado_url) if url not in nuevos]
+            return links[:getattr(settings, "FRONTIER_MAX_CANDIDATES", 500)]
+
+        self._log(logging.INFO, f"🔗 Analizando listado: {self.listado_url}")
+        try:
+            html = self.fetch(self.listado_url)
+        except NotModified:
+            self._log(logging.INFO, f"⏭️ Listado sin cambios desde el último scraping: {self.listado_url}")
+            self.unchanged_urls.append(self.listado_url)
+            return []
+        except Exception as e:
+            self._log(logging.ERROR, f"[❌ ERROR] No se pudo obtener el listado de {self.listado_url}: {e}")
+            return []
+
+        # Listado + paginación, enlaces ordenados por frescura (el presupuesto se aplica al descargar)
+        selectors = self.article_selectors
+        links = crawl_listing(
+            self, self.listado_url, html,
+            lambda url: self._accept_link(url) and self._looks_like_article(url),
+            article_hrefs=(lambda page: link_extractor.select_hrefs(page, selectors)) if selectors else None,
+        )
+
+        self._log(logging.INFO, f"✅ Se encontraron {len(links)} posibles artículos.")
+        return links
+
+    def parse_article(self, url: str, html: Optional[str] = None) -> Optional[Article]:
+        """Parse a single article page and return an Article instance.
+
+        If `html` is given (e.g. prefetched with `fetch_many`) no download is made.
+        The page goes through `extract_fields` on the extraction workers (or
+        the extraction cache); metadata brought by the source's feed wins over
+        the page's.
+        """
+        if self.extract_fields is None:
+            raise NotImplementedError
+        self._log(logging.DEBUG, f"📰 Extrayendo artículo: {url}")
+        if html is None:
+            try:
+                html = self.fetch(url)
+            except Exception as e:
+                self._log(logging.WARNING, f"[⚠️ ERROR] No se pudo descargar el artículo {url}: {e}")
+                return None
+
+        fields = cached_extract(self.extract_fields, url, html)
+        if not fields:
+            self._log(logging.WARNING, f"[⚠️ AVISO] No se pudo extraer contenido de {url}")
+            return None
+        contenido = fields["contenido"]
+        titulo, fecha, imagen = fields["titulo"], fields["fecha_publicacion"], fields["imagen_url"]
+        entry = self.feed_entries.get(url)
+        if entry and entry.titulo:
+            # el feed ya trae los metadatos
+            titulo, fecha, imagen = entry.titulo, entry.fecha or fecha, entry.imagen_url or imagen
+
+        return Article(
+            url=url,
+            fuente=self.fuente or urlparse(url).netloc,
+            titulo=titulo or contenido.split("\n")[0][:180],
+            contenido=contenido,
+            fecha_publicacion=fecha,
+            imagen_url=imagen,
+        )
\ No newline at end of file
@@ -0,0 +1,211 @@
+# app/scraper/breaker.py
+"""Per-host circuit breaker for the fetch layer.
+
+A host is *closed* while healthy. It *opens* after
+`BREAKER_FAILURE_THRESHOLD` consecutive failures, or when more than
+`BREAKER_ERROR_RATE` of its last `BREAKER_WINDOW` requests failed. Failures
+are 5xx responses, timeouts and connection errors; 4xx responses count as
+successes because the host itself answered. While open, `allow` rejects
+requests immediately. After `BREAKER_OPEN_SECONDS` one trial request is let
+through (*half-open*): success closes the breaker, failure re-opens it; a
+trial that ends without an answer either way (`release`) lets the next one
+through.
+
+State changes are persisted in `host_circuits`, so an open breaker survives
+restarts and can be shown on the sources page.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import HostCircuit
+from app.scraper.ratelimit import host_key
+
+log = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised by fetch when the target host's breaker is open."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Circuit open for {host_key(url)}")
+        self.url = url
+
+
+class _HostState:
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.results: deque = deque(maxlen=window)  # True = failure
+        self.trial_in_flight = False
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self.failure_threshold = getattr(settings, "BREAKER_FAILURE_THRESHOLD", 5)
+        self.error_rate = getattr(settings, "BREAKER_ERROR_RATE", 0.5)
+        self.window = getattr(settings, "BREAKER_WINDOW", 20)
+        self.open_seconds = getattr(settings, "BREAKER_OPEN_SECONDS", 300)
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    # --- persistence ---
+    def _load(self, host: str) -> _HostState:
+        st = _HostState(self.window)
+        db = SessionLocal()
+        try:
+            row = db.query(HostCircuit).filter_by(host=host).first()
+            if row:
+                st.state = row.state or CLOSED
+                st.consecutive_failures = row.consecutive_failures or 0
+                st.opened_at = row.opened_at
+                st.last_error = row.last_error
+                # a half-open trial interrupted by a restart is retried
+                if st.state == HALF_OPEN:
+                    st.state = OPEN
+        except Exception as e:
+            log.debug("Could not load circuit state for %s: %s", host, e)
+        finally:
+            db.close()
+        return st
+
+    def _save(self, host: str, st: _HostState) -> None:
+        db = SessionLocal()
+        try:
+            row = db.query(HostCircuit).filter_by(host=host).first()
+            if not row:
+                row = HostCircuit(host=host)
+                db.add(row)
+            row.state = st.state
+            row.consecutive_failures = st.consecutive_failures
+            row.opened_at = st.opened_at
+            row.last_error = (st.last_error or "")[:500] or None
+            row.updated_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            log.debug("Could not persist circuit state for %s: %s", host, e)
+        finally:
+            db.close()
+
+    def _state(self, host: str) -> _HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            loaded = self._load(host)
+            with self._lock:
+                st = self._hosts.setdefault(host, loaded)
+        return st
+
+    # --- public API ---
+    def allow(self, url: str) -> bool:
+        """Whether a request to the host of `url` may be sent now."""
+        host = host_key(url)
+        st = self._state(host)
+        with self._lock:
+            if st.state == CLOSED:
+                return True
+            if st.state == OPEN:
+                if st.opened_at and datetime.utcnow() - st.opened_at >= timedelta(seconds=self.open_seconds):
+                    st.state = HALF_OPEN
+                    st.trial_in_flight = True
+                    log.info("Circuit half-open for %s: sending trial request", host)
+                    return True
+                return False
+            # half-open: only the single trial request
+            if not st.trial_in_flight:
+                st.trial_in_flight = True
+                return True
+            return False
+
+    def is_open(self, url: str) -> bool:
+        """True while requests to the host are being rejected (cooldown not elapsed)."""
+        st = self._state(host_key(url))
+        if st.state != OPEN:
+            return False
+        return not (st.opened_at and datetime.utcnow() - st.opened_at >= timedelta(seconds=self.open_seconds))
+
+    def record_success(self, url: str) -> None:
+        host = host_key(url)
+        st = self._state(host)
+        with self._lock:
+            st.results.append(False)
+            st.consecutive_failures = 0
+            changed = st.state != CLOSED
+            if changed:
+                log.info("Circuit closed for %s", host)
+                st.state = CLOSED
+                st.opened_at = None
+                st.last_error = None
+            st.trial_in_flight = False
+        if changed:
+            self._save(host, st)
+
+    def record_failure(self, url: str, error: str) -> None:
+        host = host_key(url)
+        st = self._state(host)
+        with self._lock:
+            st.results.append(True)
+            st.consecutive_failures += 1
+            st.last_error = error
+            st.trial_in_flight = False
+            failures = sum(st.results)
+            rate_tripped = len(st.results) >= self.window // 2 and failures / len(st.results) > self.error_rate
+            trip = st.state == HALF_OPEN or st.consecutive_failures >= self.failure_threshold or rate_tripped
+            changed = trip and st.state != OPEN
+            if trip:
+                st.state = OPEN
+                st.opened_at = datetime.utcnow()
+        if changed:
+            log.warning("Circuit opened for %s after %d consecutive failures: %s",
+                        host, st.consecutive_failures, error)
+            self._save(host, st)
+
+    def release(self, url: str) -> None:
+        """End a request that recorded neither success nor failure (lets a new half-open trial through)."""
+        st = self._state(host_key(url))
+        with self._lock:
+            if st.state == HALF_OPEN:
+                st.trial_in_flight = False
+
+    def status(self, url: str) -> dict:
+        host = host_key(url)
+        st = self._state(host)
+        return {
+            "host": host,
+            "state": st.state,
+            "consecutive_failures": st.consecutive_failures,
+            "opened_at": st.opened_at.isoformat() if st.opened_at else None,
+            "last_error": st.last_error,
+        }
+
+    def snapshot(self) -> list[dict]:
+        """Status of every host that is not closed (from memory and the DB)."""
+        hosts = set(self._hosts)
+        db = SessionLocal()
+        try:
+            hosts.update(h for (h,) in db.query(HostCircuit.host).filter(HostCircuit.state != CLOSED))
+        except Exception as e:
+            log.debug("Could not list circuit states: %s", e)
+        finally:
+            db.close()
+        states = (self.status(h) for h in sorted(hosts))
+        return [s for s in states if s["state"] != CLOSED]
+
+    def reset(self, url: str) -> None:
+        host = host_key(url)
+        with self._lock:
+            st = self._hosts[host] = _HostState(self.window)
+        self._save(host, st)
+
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,100 @@
+# app/scraper/canonical.py
+"""URL canonicalization used before fetching and before `upsert_noticia`.
+
+The same article used to reach `noticias` under several URLs: with and
+without `www.`, with a trailing slash, with `?utm_source=...` or `#comments`,
+or with the host in upper case. `canonical_url` maps all of them to one form:
+
+* scheme and host lower-cased, leading `www.` and default ports removed,
+* fragment removed, trailing slash removed (except for the root path),
+* tracking parameters (`utm_*`, `fbclid`, `gclid`, ...) dropped; the other
+  query parameters are kept in their original order.
+
+`canonical_article_url` also honours the page's `<link rel="canonical">`
+when it points to the same site.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ocid", "cmpid", "ref_src", "ref_url", "outputtype", "amp",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(r"""\brel\s*=\s*["']?\s*canonical\b""", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_HEAD_END_RE = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url: str) -> str:
+    """Canonical form of an absolute http(s) URL (other URLs are returned unchanged)."""
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.netloc:
+        return url
+
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or str(port) == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        kept = [(k, v) for k, v in params if not _is_tracking(k)]
+        if len(kept) != len(params):
+            query = urlencode(kept)
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def same_site(url_a: str, url_b: str) -> bool:
+    """True if both URLs share the canonical host."""
+    return urlsplit(canonical_url(url_a)).netloc == urlsplit(canonical_url(url_b)).netloc
+
+
+def rel_canonical(html: str, base_url: str) -> Optional[str]:
+    """`<link rel="canonical">` of the page's head (absolute), or None."""
+    if not html:
+        return None
+    end = _HEAD_END_RE.search(html)
+    head = html[:end.start()] if end else html[:200_000]
+    for tag in _LINK_TAG_RE.finditer(head):
+        tag = tag.group(0)
+        if _REL_CANONICAL_RE.search(tag):
+            m = _HREF_RE.search(tag)
+            href = m and next(g for g in m.groups() if g is not None).strip()
+            if href:
+                return urljoin(base_url, href)
+    return None
+
+
+def canonical_article_url(url: str, html: Optional[str] = None) -> str:
+    """Canonical URL of a downloaded article, preferring a same-site rel=canonical."""
+    declared = rel_canonical(html, url) if html else None
+    if declared and same_site(declared, url):
+        return canonical_url(declared)
+    return canonical_url(url)
@@ -0,0 +1,198 @@
+# app/scraper/concurrency.py
+"""Adaptive (AIMD) per-host concurrency limits.
+
+Each host starts at FETCH_PER_HOST_CONCURRENCY parallel requests. The limit
+grows additively (+1 for every `limit` successful requests) while the
+p95 of the host's response times stays within FETCH_LATENCY_FACTOR times
+its baseline. It is cut multiplicatively when the host answers 429/503
+(halved) or when p95 rises past that threshold (x0.75). It never goes
+below 1 or above FETCH_PER_HOST_MAX_CONCURRENCY. A `Retry-After` on a
+429/503 also blocks new requests to that host until the given time.
+
+`BaseScraper._fetch` reports every response time and every 429/503 (with
+its Retry-After) to the controller.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from app.config import settings
+from app.scraper.ratelimit import host_key
+
+log = logging.getLogger(__name__)
+
+OVERLOAD_STATUSES = (429, 503)
+_MIN_SAMPLES = 10
+_DECREASE_COOLDOWN = 1.0  # seconds between two decreases of the same host
+_BASELINE_RELAX = 1.001  # lets the baseline follow a permanent latency change
+_MIN_LATENCY_RISE = 0.05  # ignore p95 jitter below 50 ms on very fast hosts
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _p(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _HostLimit:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.latencies: deque = deque(maxlen=50)
+        self.baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.blocked_until = 0.0
+        self.overloads = 0
+
+
+class HostConcurrencyController:
+    """Process-wide per-host concurrency slots with AIMD limits."""
+
+    def __init__(self, initial: Optional[int] = None, maximum: Optional[int] = None,
+                 latency_factor: Optional[float] = None, adaptive: Optional[bool] = None):
+        self.initial = initial or getattr(settings, "FETCH_PER_HOST_CONCURRENCY", 4)
+        self.maximum = max(self.initial, maximum or getattr(settings, "FETCH_PER_HOST_MAX_CONCURRENCY", 8))
+        self.latency_factor = latency_factor or getattr(settings, "FETCH_LATENCY_FACTOR", 2.0)
+        self.adaptive = getattr(settings, "FETCH_ADAPTIVE_CONCURRENCY", True) if adaptive is None else adaptive
+        self._hosts: dict[str, _HostLimit] = {}
+        self._cond = threading.Condition()
+
+    def _host(self, url: str) -> _HostLimit:
+        key = host_key(url)
+        st = self._hosts.get(key)
+        if st is None:
+            st = self._hosts.setdefault(key, _HostLimit(float(self.initial)))
+        return st
+
+    # --- slots ---
+    def _wait_time(self, url: str) -> float:
+        """0 if a slot was taken, otherwise a hint of how long to wait."""
+        with self._cond:
+            st = self._host(url)
+            blocked = st.blocked_until - time.monotonic()
+            if blocked > 0:
+                return blocked
+            if st.in_flight < max(1, int(st.limit)):
+                st.in_flight += 1
+                return 0.0
+            return 0.05
+
+    def acquire(self, url: str) -> None:
+        """Block the calling thread until a slot for the host is free."""
+        while True:
+            wait = self._wait_time(url)
+            if not wait:
+                return
+            with self._cond:
+                self._cond.wait(wait)
+
+    async def acquire_async(self, url: str) -> None:
+        """Like `acquire` but waits on the event loop."""
+        while True:
+            wait = self._wait_time(url)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, url: str) -> None:
+        with self._cond:
+            st = self._host(url)
+            st.in_flight = max(0, st.in_flight - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, url: str):
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    # --- feedback ---
+    def _decrease(self, key: str, st: _HostLimit, factor: float, reason: str) -> None:
+        now = time.monotonic()
+        if now - st.last_decrease < _DECREASE_COOLDOWN:
+            return
+        old = st.limit
+        st.limit = max(1.0, st.limit * factor)
+        st.last_decrease = now
+        st.latencies.clear()
+        log.info("Concurrency for %s reduced %.1f -> %.1f (%s)", key, old, st.limit, reason)
+
+    def record(self, url: str, latency: float, ok: bool = True) -> None:
+        """Feed the response time of a finished request to the host."""
+        if not self.adaptive:
+            return
+        key = host_key(url)
+        with self._cond:
+            st = self._host(url)
+            st.latencies.append(latency)
+            if len(st.latencies) < _MIN_SAMPLES:
+                return
+            p95 = _p(st.latencies, 0.95)
+            if st.baseline is None or p95 < st.baseline:
+                st.baseline = p95
+            else:
+                st.baseline *= _BASELINE_RELAX
+            if p95 > st.baseline * self.latency_factor and p95 - st.baseline > _MIN_LATENCY_RISE:
+                self._decrease(key, st, 0.75, f"p95 {p95:.2f}s > baseline {st.baseline:.2f}s")
+            elif ok and st.limit < self.maximum:
+                st.limit = min(float(self.maximum), st.limit + 1.0 / st.limit)
+
+    def record_overload(self, url: str, retry_after: Optional[float] = None) -> None:
+        """Called on 429/503: halve the limit and honour Retry-After."""
+        key = host_key(url)
+        with self._cond:
+            st = self._host(url)
+            st.overloads += 1
+            if retry_after:
+                st.blocked_until = max(st.blocked_until, time.monotonic() + retry_after)
+            if self.adaptive:
+                self._decrease(key, st, 0.5, "overloaded" + (f", retry after {retry_after:.0f}s" if retry_after else ""))
+
+    # --- introspection ---
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        with self._cond:
+            items = list(self._hosts.items())
+            return [
+                {
+                    "host": key,
+                    "limit": max(1, int(st.limit)),
+                    "limit_exact": round(st.limit, 2),
+                    "in_flight": st.in_flight,
+                    "p50_ms": round(_p(st.latencies, 0.5) * 1000) if st.latencies else None,
+                    "p95_ms": round(_p(st.latencies, 0.95) * 1000) if st.latencies else None,
+                    "baseline_ms": round(st.baseline * 1000) if st.baseline else None,
+                    "overloads": st.overloads,
+                    "blocked_for_s": round(max(0.0, st.blocked_until - now), 1),
+                }
+                for key, st in sorted(items)
+            ]
+
+
+host_limits = HostConcurrencyController()
+
@@ -0,0 +1,205 @@
+# app/scraper/extraction.py
+"""Single-parse article page for the extraction stage.
+
+`scrape_article` (services) used to parse every article twice with
+BeautifulSoup, walk its LD+JSON twice and call `trafilatura.extract` twice
+(a JSON attempt that trafilatura 1.12 answers with plain text, then the
+plain-text fallback); the scrapers' `parse_article` parsed it with
+BeautifulSoup for the metadata and again inside trafilatura.
+`parse_page` builds the lxml tree once (trafilatura's own loader) and
+collects in one walk everything the callers look at: meta tags, LD+JSON
+items, `<article>`/`<h1>` presence, the `<title>` and first `<h1>` texts and
+the first `<time datetime>`. `ParsedPage.text()` then hands that same tree to
+trafilatura, so the body is extracted without parsing the HTML again.
+
+Lookups keep BeautifulSoup's `find` semantics (first matching tag in
+document order), so the extracted fields are the same as before.
+
+`parse_article_page` puts a cheaper probe in front of that parse for the
+callers that reject non-articles (`scrape_article`):
+only the `<head>` and the first ARTICLE_PROBE_BODY_CHARS characters of the
+body are parsed. A page the probe shows to be an article (og:type, LD+JSON,
+`<article>` and `<h1>`) is then parsed in full. A page that is not is
+rejected without the full parse only if the rest of the document does not
+contain any of those markers either, so the decision is the same as with
+the full tree. Listing and section pages, typically large and full of
+links, are rejected after parsing only their head and first few KB.
+"""
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime
+from typing import Optional
+
+import trafilatura
+from lxml.html import HtmlElement
+from trafilatura.utils import load_html
+
+from app.config import settings
+
+ARTICLE_OG_TYPES = ("article", "news", "newsarticle")
+
+
+class ParsedPage:
+    """Fields of an article page read in a single pass over its tree."""
+
+    def __init__(self, tree: Optional[HtmlElement]):
+        self.tree = tree
+        self.metas: list[tuple[Optional[str], Optional[str], Optional[str]]] = []  # (property, name, content)
+        self.ld_items: list[dict] = []
+        self.has_article = False
+        self.has_h1 = False
+        self.title: Optional[str] = None  # text of the first <title>
+        self.h1: Optional[str] = None  # text of the first <h1>
+        self.time_datetime: Optional[str] = None  # `datetime` of the first <time>
+        self._by_property: dict[str, str] = {}
+        self._by_name: dict[str, str] = {}
+        self._text: Optional[str] = None
+        if tree is not None:
+            self._walk(tree)
+
+    def _walk(self, tree: HtmlElement) -> None:
+        seen_time = False
+        for el in tree.iter("meta", "script", "article", "h1", "title", "time"):
+            tag = el.tag
+            if tag == "meta":
+                prop, name, content = el.get("property"), el.get("name"), el.get("content")
+                self.metas.append((prop, name, content))
+                # first tag wins, as with soup.find(); "" marks a tag without content
+                if prop is not None:
+                    self._by_property.setdefault(prop, content or "")
+                if name is not None:
+                    self._by_name.setdefault(name, content or "")
+            elif tag == "script":
+                if "ld+json" in (el.get("type") or ""):
+                    self._add_ld_json(el.text)
+            elif tag == "article":
+                self.has_article = True
+            elif tag == "h1":
+                if not self.has_h1:
+                    self.has_h1 = True
+                    self.h1 = el.text_content()
+            elif tag == "time":
+                if not seen_time:
+                    seen_time = True
+                    self.time_datetime = el.get("datetime")
+            elif self.title is None:
+                self.title = "".join(s.strip() for s in el.itertext())
+
+    def _add_ld_json(self, raw: Optional[str]) -> None:
+        try:
+            data = json.loads(raw or "")
+        except Exception:
+            return
+        if isinstance(data, dict):
+            self.ld_items.append(data)
+        elif isinstance(data, list):
+            self.ld_items.extend(d for d in data if isinstance(d, dict))
+
+    def meta_property(self, prop: str) -> Optional[str]:
+        """`content` of the first `<meta property=prop>` ("" without content, None if absent)."""
+        return self._by_property.get(prop)
+
+    def meta_name(self, name: str) -> Optional[str]:
+        """`content` of the first `<meta name=name>` ("" without content, None if absent)."""
+        return self._by_name.get(name)
+
+    def basic_meta(self) -> dict:
+        """og:type (if it is an article type), title, image and publication date from the meta tags."""
+        meta = {}
+        og_type = self.meta_property("og:type")
+        if og_type and og_type.lower() in ARTICLE_OG_TYPES:
+            meta["og_type"] = og_type
+        og_title = self.meta_property("og:title")
+        if og_title:
+            meta["title"] = og_title.strip()
+        og_img = self.meta_property("og:image")
+        if og_img:
+            meta["image"] = og_img.strip()
+        pub = self.meta_property("article:published_time")
+        if pub is None:
+            pub = self.meta_name("pubdate")
+        if pub:
+            meta["date"] = pub.strip()
+        return meta
+
+    def looks_like_article(self, meta: dict) -> bool:
+        return bool("og_type" in meta or self.ld_items or (self.has_article and self.has_h1))
+
+    def text(self, **options) -> Optional[str]:
+        """Body text extracted by trafilatura from the already parsed tree.
+
+        `options` are passed to `trafilatura.extract`. trafilatura prunes the
+        tree while extracting, so every other field must be read before the
+        first call; the result is kept.
+        """
+        if self.tree is not None:
+            tree, self.tree = self.tree, None
+            self._text = trafilatura.extract(tree, **options)
+        return self._text
+
+
+def iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """`datetime` of an ISO 8601 value such as `<time datetime>` (None if empty or invalid)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def parse_page(html: str) -> ParsedPage:
+    """Parse `html` once; an unparsable document gives an empty page."""
+    try:
+        tree = load_html(html)
+    except Exception:
+        tree = None
+    return ParsedPage(tree)
+
+
+_BODY_RE = re.compile(r"<body\b", re.IGNORECASE)
+# markers that could make the unparsed rest of a page look like an article
+# (matched in lower case, so the rest is only ever a superset of what the
+# full tree would find)
+_OG_LD_MARKERS = ("og:type", "ld+json")
+_MARKER_OVERLAP = 16  # a marker may straddle the probe's cut
+
+
+def _rescan_start(head: str) -> int:
+    """Where to search the rest of the page for markers the probe may have seen truncated.
+
+    A `<script>` (LD+JSON) or `<meta>` (og:type) still open at the cut
+    reached the probe cut short, so the search starts at that tag;
+    otherwise just before the cut. `head` is the probed part, lower-cased.
+    """
+    start = max(len(head) - _MARKER_OVERLAP, 0)
+    script = head.rfind("<script")
+    if script >= 0 and head.find("</script", script) < 0:
+        start = min(start, script)
+    meta = head.rfind("<meta")
+    if meta >= 0 and head.find(">", meta) < 0:
+        start = min(start, meta)
+    return start
+
+
+def parse_article_page(html: str, body_chars: Optional[int] = None) -> Optional[ParsedPage]:
+    """`parse_page(html)` if it is an article page, None if a probe of its first part shows it is not."""
+    if body_chars is None:
+        body_chars = getattr(settings, "ARTICLE_PROBE_BODY_CHARS", 32768)
+    body = _BODY_RE.search(html)
+    cut = (body.start() if body else 0) + body_chars
+    if body_chars <= 0 or cut >= len(html):
+        page = parse_page(html)  # the probe would read everything anyway
+        return page if page.looks_like_article(page.basic_meta()) else None
+
+    head = html[:cut]
+    probe = parse_page(head)
+    if probe.looks_like_article(probe.basic_meta()):
+        return parse_page(html)
+    rest = html[_rescan_start(head.lower()):].lower()
+    if (any(marker in rest for marker in _OG_LD_MARKERS)
+            or ((probe.has_article or "<article" in rest) and (probe.has_h1 or "<h1" in rest))):
+        return parse_page(html)
+    return None
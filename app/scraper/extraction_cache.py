@@ -0,0 +1,165 @@
+# app/scraper/extraction_cache.py
+"""LRU cache of extraction results keyed by a normalized-HTML hash.
+
+Revisited articles whose body is byte-identical never reach extraction (the
+fetch layer answers `NotModified`), but most sites change something on every
+request: ad slots, tracking scripts, CSP nonces, cache-busting data
+attributes. `normalized_html_hash` drops that markup (comments, `<script>`
+except LD+JSON, `<style>`, `<noscript>`, `<iframe>`, `nonce`/`integrity`/
+`data-*` attributes, whitespace) before hashing, so such a revisit maps to
+the same key and the stored result is returned without running trafilatura
+and the category inference again.
+
+Keys are (extractor, URL, hash): the same page is cached separately for
+`GenericScraper`, `RPPScraper` and `scrape_article`. Only successful
+extractions are stored (a None may be a timeout). Size is
+EXTRACTION_CACHE_SIZE entries (0 disables it); hit and miss counts are
+served at /api/scraping/stats.
+
+The normalisation is regex work over the whole page, so `cached_extract`
+does it on the extraction workers, not in the API or scheduler thread: the
+worker gets the hashes already cached for the URL, hashes the page and only
+runs the extractor when its hash is not among them.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.scraper.workers import extraction_pool
+
+_VOLATILE_RE = re.compile(
+    r"<(?:!--.*?-->|(script|style|noscript|iframe)\b([^>]*)>.*?</\1\s*>)",
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR_VALUE = r"""\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)"""
+# one alternative per literal prefix: much faster to scan for than a shared \s prefix
+_VOLATILE_ATTR_RE = re.compile(rf"data-[\w.:-]+{_ATTR_VALUE}|nonce{_ATTR_VALUE}|integrity{_ATTR_VALUE}")
+
+
+def _drop_volatile(m: re.Match) -> str:
+    # LD+JSON carries the article metadata: keep it
+    if m.group(1) and m.group(1).lower() == "script" and "ld+json" in m.group(2).lower():
+        return m.group(0)
+    return ""
+
+
+def normalized_html_hash(html: str) -> str:
+    """Hash of `html` without the markup that changes between identical articles."""
+    text = _VOLATILE_RE.sub(_drop_volatile, html)
+    text = " ".join(_VOLATILE_ATTR_RE.sub("", text).split())
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else getattr(settings, "EXTRACTION_CACHE_SIZE", 1000)
+        self._entries: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+        self._digests: dict[tuple[str, str], set[str]] = {}  # (name, url) -> hashes in _entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def digests(self, name: str, url: str) -> frozenset[str]:
+        """Hashes of the versions of this page that are cached."""
+        with self._lock:
+            return frozenset(self._digests.get((name, url), ()))
+
+    def get(self, name: str, url: str, digest: str) -> Any:
+        """Cached result for this version of the page (counted as a hit), or None."""
+        key = (name, url, digest)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy(self._entries[key])
+
+    def put(self, name: str, url: str, digest: str, result: Any) -> None:
+        """Record a miss and store its result (unless it is None)."""
+        with self._lock:
+            self.misses += 1
+            if result is None:
+                return
+            key = (name, url, digest)
+            self._entries[key] = _copy(result)
+            self._entries.move_to_end(key)
+            self._digests.setdefault((name, url), set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                old_name, old_url, old_digest = self._entries.popitem(last=False)[0]
+                page = self._digests.get((old_name, old_url))
+                if page is not None:
+                    page.discard(old_digest)
+                    if not page:
+                        del self._digests[(old_name, old_url)]
+
+    def get_or_extract(self, name: str, url: str, html: str, extract: Callable[[], Any]) -> Any:
+        """Cached result of `extract()` for this page, running it on a miss (hashes in this thread)."""
+        if self.max_entries <= 0:
+            return extract()
+        digest = normalized_html_hash(html)
+        result = self.get(name, url, digest)
+        if result is None:
+            result = extract()
+            self.put(name, url, digest, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.hits = self.misses = 0
+
+
+def _copy(result: Any) -> Any:
+    # callers may modify the returned dict
+    return dict(result) if isinstance(result, dict) else result
+
+
+extraction_cache = ExtractionCache()
+
+
+def _hash_and_extract(fn: Callable[[str, str], Any], cached: frozenset[str], url: str,
+                      html: str) -> tuple[str, bool, Any]:
+    """Worker side: hash the page; run `fn` only if that version is not cached."""
+    digest = normalized_html_hash(html)
+    if digest in cached:
+        return digest, True, None
+    return digest, False, fn(url, html)
+
+
+def cached_extract(fn: Callable[[str, str], Any], url: str, html: str) -> Any:
+    """`extraction_pool.run(fn, url, html)` through the extraction cache."""
+    if extraction_cache.max_entries <= 0:
+        return extraction_pool.run(fn, url, html)
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    cached = extraction_cache.digests(name, url)
+    outcome = extraction_pool.run(functools.partial(_hash_and_extract, fn, cached), url, html)
+    if outcome is None:
+        # timed out or the worker died: nothing to store
+        return None
+    digest, hit, result = outcome
+    if hit:
+        result = extraction_cache.get(name, url, digest)
+        if result is not None:
+            return result
+        # evicted while the worker was hashing
+        result = extraction_pool.run(fn, url, html)
+    extraction_cache.put(name, url, digest, result)
+    return result
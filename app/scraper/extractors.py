@@ -0,0 +1,94 @@
+# app/scraper/extractors.py
+"""Article extractor interface and per-extractor counters.
+
+An extractor is a module-level function `(url, html) -> dict | None` that
+turns a downloaded article into its fields (at least "titulo" and
+"contenido"); None means nothing could be extracted. Being module level, it
+can run on the extraction workers (`workers.extraction_pool`) and be cached
+(`extraction_cache.cached_extract`). The extractors are registered with
+`@extractor(name)`:
+
+    @extractor("rpp")
+    def extract_rpp_fields(url, html): ...
+
+Every call is timed and counted under its name: calls, pages with a result,
+pages without one, exceptions and a latency histogram. The counts are
+collected inside the workers too (see `workers.ship_counters`); cache hits
+do not run the extractor and are not counted. /api/scraping/extractors
+serves them next to the host registry (`app.scraper.registry`), so a slow
+or low-yield extractor shows up there.
+"""
+from __future__ import annotations
+
+import functools
+import time
+from typing import Any, Callable, Optional
+
+from app.scraper.stats import FetchStats
+from app.scraper.workers import ship_counters
+
+# upper bounds (ms) of the latency histogram; slower calls go to the last bucket
+LATENCY_BUCKETS_MS = (10, 50, 200, 1000)
+
+extractor_stats = FetchStats()
+ship_counters("extractors", extractor_stats)
+
+_names: list[str] = []  # registered extractors, in registration order
+
+
+def _bucket(ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return f"le_{bound}ms"
+    return f"gt_{LATENCY_BUCKETS_MS[-1]}ms"
+
+
+def extractor(name: str) -> Callable[[Callable[[str, str], Optional[dict]]], Callable[[str, str], Optional[dict]]]:
+    """Register an extractor function under `name` and count its calls."""
+    def decorate(fn: Callable[[str, str], Optional[dict]]) -> Callable[[str, str], Optional[dict]]:
+        @functools.wraps(fn)
+        def timed(url: str, html: str) -> Optional[dict]:
+            start = time.perf_counter()
+            try:
+                result = fn(url, html)
+            except Exception:
+                extractor_stats.incr(f"{name}:errors")
+                raise
+            finally:
+                ms = (time.perf_counter() - start) * 1000
+                extractor_stats.incr(f"{name}:calls")
+                extractor_stats.incr(f"{name}:us", int(ms * 1000))
+                extractor_stats.incr(f"{name}:{_bucket(ms)}")
+            extractor_stats.incr(f"{name}:{'ok' if result else 'empty'}")
+            return result
+
+        timed.extractor_name = name
+        if name not in _names:
+            _names.append(name)
+        return timed
+    return decorate
+
+
+def name_of(fn: Any) -> Optional[str]:
+    """Name `fn` was registered under (None for a plain function)."""
+    return getattr(fn, "extractor_name", None)
+
+
+def snapshot() -> list[dict]:
+    counts = extractor_stats.snapshot()
+    buckets = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f"gt_{LATENCY_BUCKETS_MS[-1]}ms"]
+    rows = []
+    for name in _names:
+        calls = counts.get(f"{name}:calls", 0)
+        ok = counts.get(f"{name}:ok", 0)
+        rows.append({
+            "extractor": name,
+            "calls": calls,
+            "ok": ok,
+            "empty": counts.get(f"{name}:empty", 0),
+            "errors": counts.get(f"{name}:errors", 0),
+            "success_rate": round(ok / calls, 3) if calls else None,
+            "mean_ms": round(counts.get(f"{name}:us", 0) / calls / 1000, 1) if calls else None,
+            "latency_ms": {bucket: counts.get(f"{name}:{bucket}", 0) for bucket in buckets},
+        })
+    return rows
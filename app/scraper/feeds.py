@@ -0,0 +1,282 @@
+# app/scraper/feeds.py
+"""RSS/Atom and news-sitemap discovery used as a cheap listing source.
+
+A feed is a fraction of the size of an HTML listing and already carries
+article URLs, titles, dates and often images. For each `Fuente` we look for:
+
+1. `<link rel="alternate" type="application/rss+xml|atom+xml">` on the
+   listing page,
+2. `Sitemap:` entries in robots.txt, preferring Google News sitemaps
+   (sitemap indexes are followed one level).
+
+The result (or `feed_type = 'none'`) is cached on the Fuente and
+rediscovered every FEED_REVALIDATE_HOURS, or right away when the stored feed
+stops working. Every feed is narrowed to the listing's path so a section
+source keeps only its own articles: sitemaps cover the whole site, and most
+CMSs link the site-wide RSS feed from every section page. A feed with no
+entries under the path is rejected and the HTML listing is used instead.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Fuente
+from app.scraper import http_cache
+from app.scraper.http_cache import NotModified
+
+log = logging.getLogger(__name__)
+
+FEED_CONTENT_TYPES = (
+    "application/rss+xml", "application/atom+xml", "application/rdf+xml", "application/x-rss+xml",
+    "application/xml", "text/xml", "text/plain",
+)
+_FEED_LINK_TYPES = {"application/rss+xml": "rss", "application/atom+xml": "atom"}
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+_MAX_SITEMAP_CANDIDATES = 3
+
+
+@dataclass
+class FeedEntry:
+    url: str
+    titulo: Optional[str] = None
+    fecha: Optional[datetime] = None
+    imagen_url: Optional[str] = None
+
+
+# --- parsing ---
+def _local(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _children(el, name: str):
+    return [c for c in el if _local(c.tag) == name]
+
+
+def _text(el, *names: str) -> Optional[str]:
+    for name in names:
+        for c in el:
+            if _local(c.tag) == name and c.text and c.text.strip():
+                return c.text.strip()
+    return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _image(el) -> Optional[str]:
+    for c in el.iter():
+        name = _local(c.tag)
+        if name == "enclosure" and (c.get("type") or "").startswith("image/"):
+            return c.get("url")
+        if name in ("content", "thumbnail") and c.get("url") and (
+                name == "thumbnail" or c.get("medium") == "image" or (c.get("type") or "").startswith("image/")):
+            return c.get("url")
+        if name == "link" and c.get("rel") == "enclosure" and (c.get("type") or "").startswith("image/"):
+            return c.get("href")
+        if name == "image" and _text(c, "loc"):  # sitemap image extension
+            return _text(c, "loc")
+    return None
+
+
+def parse_feed(text: str, base_url: str = "") -> tuple[str, list[FeedEntry], list[str]]:
+    """Parse RSS, Atom or a sitemap. Returns (kind, entries, child sitemap URLs)."""
+    root = ET.fromstring(_XML_DECL_RE.sub("", text, count=1))
+    kind = _local(root.tag)
+    entries: list[FeedEntry] = []
+    children: list[str] = []
+
+    if kind in ("rss", "RDF"):
+        for item in (e for e in root.iter() if _local(e.tag) == "item"):
+            link = _text(item, "link") or next(
+                (g.text.strip() for g in _children(item, "guid") if g.text and g.get("isPermaLink") != "false"), None)
+            if link:
+                entries.append(FeedEntry(urljoin(base_url, link), _text(item, "title"),
+                                         _parse_date(_text(item, "pubDate", "date")), _image(item)))
+        return "rss", entries, children
+
+    if kind == "feed":
+        for entry in _children(root, "entry"):
+            links = _children(entry, "link")
+            href = next((l.get("href") for l in links if l.get("rel", "alternate") == "alternate"), None)
+            if href:
+                entries.append(FeedEntry(urljoin(base_url, href), _text(entry, "title"),
+                                         _parse_date(_text(entry, "published", "updated")), _image(entry)))
+        return "atom", entries, children
+
+    if kind == "urlset":
+        for url in _children(root, "url"):
+            loc = _text(url, "loc")
+            if not loc:
+                continue
+            news = next(iter(_children(url, "news")), None)
+            titulo = _text(news, "title") if news is not None else None
+            fecha = _parse_date((_text(news, "publication_date") if news is not None else None) or _text(url, "lastmod"))
+            entries.append(FeedEntry(loc, titulo, fecha, _image(url)))
+        # newest first: site-wide sitemaps are not ordered
+        entries.sort(key=lambda e: e.fecha.timestamp() if e.fecha else 0, reverse=True)
+        return "sitemap", entries, children
+
+    if kind == "sitemapindex":
+        children = [loc for loc in (_text(s, "loc") for s in _children(root, "sitemap")) if loc]
+        return "sitemapindex", entries, children
+
+    raise ValueError(f"unknown feed root <{kind}>")
+
+
+def _in_section(listado_url: str, entries: list[FeedEntry]) -> list[FeedEntry]:
+    """Keep entries under the listing's path (feeds often cover the whole site)."""
+    path = urlparse(listado_url).path.rstrip("/")
+    if not path:
+        return entries
+    return [e for e in entries if urlparse(e.url).path.startswith(path + "/")]
+
+
+# --- discovery ---
+def _try_feed(scraper, url: str, listado_url: str) -> Optional[tuple[str, list[FeedEntry]]]:
+    try:
+        kind, entries, children = parse_feed(
+            scraper.fetch(url, conditional=False, content_types=FEED_CONTENT_TYPES), url)
+        if kind == "sitemapindex":
+            # news sitemaps first, then the first ones listed (usually the most recent)
+            children.sort(key=lambda u: "news" not in u.lower())
+            for child in children[:_MAX_SITEMAP_CANDIDATES]:
+                found = _try_feed(scraper, child, listado_url)
+                if found:
+                    return found
+            return None
+        entries = _in_section(listado_url, entries)
+        return (url, entries) if entries else None
+    except NotModified:
+        return None
+    except Exception as e:
+        log.debug("Feed candidate %s rejected: %s", url, e)
+        return None
+
+
+def discover(scraper, listado_url: str) -> Optional[tuple[str, str, list[FeedEntry]]]:
+    """Find a feed for `listado_url`. Returns (feed_url, feed_type, entries) or None."""
+    candidates: list[tuple[str, str]] = []
+    try:
+        html = scraper.fetch(listado_url, conditional=False)
+        for link in BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("link")).find_all("link"):
+            rel = link.get("rel") or []
+            kind = _FEED_LINK_TYPES.get((link.get("type") or "").lower())
+            if kind and "alternate" in [r.lower() for r in rel] and link.get("href"):
+                candidates.append((urljoin(listado_url, link["href"]), kind))
+    except Exception as e:
+        log.debug("Could not read listing %s for feed links: %s", listado_url, e)
+
+    for url, kind in candidates:
+        found = _try_feed(scraper, url, listado_url)
+        if found:
+            return found[0], kind, found[1]
+
+    parts = urlparse(listado_url)
+    try:
+        robots = scraper.fetch(f"{parts.scheme}://{parts.netloc}/robots.txt", conditional=False, content_types=None)
+    except Exception as e:
+        log.debug("No robots.txt for %s: %s", parts.netloc, e)
+        return None
+    sitemaps = [line.split(":", 1)[1].strip() for line in robots.splitlines()
+                if line.lower().startswith("sitemap:")]
+    sitemaps.sort(key=lambda u: "news" not in u.lower())
+    for url in sitemaps[:_MAX_SITEMAP_CANDIDATES]:
+        found = _try_feed(scraper, url, listado_url)
+        if found:
+            return found[0], "sitemap", found[1]
+    return None
+
+
+# --- cache on Fuente ---
+def _save(listado_url: str, feed_url: Optional[str], feed_type: Optional[str], checked: bool = True) -> None:
+    db = SessionLocal()
+    try:
+        fuente = db.query(Fuente).filter(Fuente.url_listado == listado_url).first()
+        if fuente:
+            fuente.feed_url = feed_url
+            fuente.feed_type = feed_type
+            fuente.feed_checked_at = datetime.utcnow() if checked else None
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        log.debug("Could not store feed for %s: %s", listado_url, e)
+    finally:
+        db.close()
+
+
+def invalidate_feed(listado_url: str) -> None:
+    """Make the next wave download the source's stored feed in full (see `http_cache.invalidate`)."""
+    db = SessionLocal()
+    try:
+        fuente = db.query(Fuente).filter(Fuente.url_listado == listado_url).first()
+        feed_url = fuente.feed_url if fuente is not None else None
+    finally:
+        db.close()
+    if feed_url:
+        http_cache.invalidate(feed_url)
+
+
+def feed_listing(scraper, listado_url: str) -> Optional[tuple[str, list[FeedEntry]]]:
+    """Entries of the source's feed, or None to fall back to the HTML listing.
+
+    Raises `NotModified` when the feed did not change since the last wave.
+    """
+    if not getattr(settings, "FEED_DISCOVERY_ENABLED", True):
+        return None
+    db = SessionLocal()
+    try:
+        fuente = db.query(Fuente).filter(Fuente.url_listado == listado_url).first()
+        if fuente is None:
+            # ad-hoc listings have nowhere to cache the discovery result
+            return None
+        feed_url, feed_type, checked_at = fuente.feed_url, fuente.feed_type, fuente.feed_checked_at
+    finally:
+        db.close()
+
+    revalidate = timedelta(hours=getattr(settings, "FEED_REVALIDATE_HOURS", 24))
+    if checked_at is None or datetime.utcnow() - checked_at >= revalidate:
+        found = discover(scraper, listado_url)
+        if found:
+            feed_url, feed_type, entries = found
+            log.info("Feed for %s: %s (%s)", listado_url, feed_url, feed_type)
+            _save(listado_url, feed_url, feed_type)
+            return feed_type, entries
+        _save(listado_url, None, "none")
+        return None
+
+    if not feed_url or feed_type == "none":
+        return None
+    try:
+        kind, entries, _ = parse_feed(scraper.fetch(feed_url, content_types=FEED_CONTENT_TYPES), feed_url)
+    except NotModified:
+        raise
+    except Exception as e:
+        log.warning("Feed %s failed (%s); rediscovering next wave", feed_url, e)
+        _save(listado_url, feed_url, feed_type, checked=False)
+        return None
+    entries = _in_section(listado_url, entries)
+    if not entries:
+        _save(listado_url, feed_url, feed_type, checked=False)
+        return None
+    return feed_type, entries
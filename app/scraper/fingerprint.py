@@ -0,0 +1,81 @@
+# app/scraper/fingerprint.py
+"""Listing fingerprints: skip the article stage of unchanged sources.
+
+Every wave fingerprints the set of candidate article links returned by
+`parse_listing` (order-insensitive SHA-1) and compares it with the one stored
+on the `Fuente`. When they match, the source's articles are not looked at
+again: the wave ends after the listing request and `last_scrape_status` is
+set to 'no_change'.
+
+The stored fingerprint is cleared whenever a wave leaves work behind (failed
+downloads, links deferred by the fetch budget), so the next wave processes
+the same listing again instead of skipping it.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Iterable, Optional
+
+from app.database import SessionLocal
+from app.models import Fuente
+
+log = logging.getLogger(__name__)
+
+CHANGED, NO_CHANGE = "changed", "no_change"
+
+
+def listing_fingerprint(urls: Iterable[str]) -> str:
+    """Fingerprint of a set of links (order and duplicates do not matter)."""
+    return hashlib.sha1("\n".join(sorted(set(urls))).encode("utf-8")).hexdigest()
+
+
+def _update(listado_url: str, **values) -> Optional[Fuente]:
+    db = SessionLocal()
+    try:
+        fuente = db.query(Fuente).filter(Fuente.url_listado == listado_url).first()
+        if fuente:
+            for key, value in values.items():
+                setattr(fuente, key, value)
+            db.commit()
+        return fuente
+    except Exception as e:
+        db.rollback()
+        log.debug("Could not update listing fingerprint for %s: %s", listado_url, e)
+        return None
+    finally:
+        db.close()
+
+
+def unchanged(listado_url: str, urls: list[str]) -> bool:
+    """True if `urls` is the same link set as last wave; stores the new fingerprint otherwise.
+
+    Listings without a `Fuente` row are never considered unchanged.
+    """
+    fingerprint = listing_fingerprint(urls)
+    db = SessionLocal()
+    try:
+        fuente = db.query(Fuente).filter(Fuente.url_listado == listado_url).first()
+        if fuente is None:
+            return False
+        same = fuente.listing_fingerprint == fingerprint
+        fuente.listing_fingerprint = fingerprint
+        fuente.last_scrape_status = NO_CHANGE if same else CHANGED
+        db.commit()
+        return same
+    except Exception as e:
+        db.rollback()
+        log.debug("Listing fingerprint check failed for %s: %s", listado_url, e)
+        return False
+    finally:
+        db.close()
+
+
+def mark_no_change(listado_url: str) -> None:
+    """Record a wave that ended early (e.g. the listing answered 304)."""
+    _update(listado_url, last_scrape_status=NO_CHANGE)
+
+
+def forget(listado_url: str) -> None:
+    """Make the next wave process the listing even if its links did not change."""
+    _update(listado_url, listing_fingerprint=None)
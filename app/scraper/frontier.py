@@ -0,0 +1,247 @@
+# app/scraper/frontier.py
+"""Per-source crawl frontier for listing discovery.
+
+Listings used to be cut at a fixed first-N (`links[:50]`, `links[:30]`) and
+pagination was never followed. A `Frontier` instead:
+
+* collects article links from the listing page and, up to FRONTIER_MAX_DEPTH
+  hops and FRONTIER_MAX_PAGES pages per wave, from its pagination
+  (`rel="next"`, `?page=N`, `/page/N`, `/pagina/N`) and child section pages,
+* stops descending as soon as a page brings no link that is not stored yet
+  (older pages only hold older articles),
+* ranks every article link by freshness signals: date in the URL, position
+  on the page, depth, being under the listing's section, and the learned
+  yield of its URL pattern (`app.scraper.link_yield`).
+
+Scrapers fetch the best-ranked links until FRONTIER_BUDGET downloads per wave,
+after dropping the ones already stored, so a high-volume source gets full
+coverage of its new articles within a fixed fetch budget. Links beyond the
+budget are kept in memory and ranked again with the next wave's links (for
+feed-backed sources, queued after the feed's new entries).
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+from urllib.parse import urljoin
+
+from app.config import settings
+from app.scraper import fingerprint, http_cache
+from app.scraper.canonical import canonical_url
+from app.scraper.feeds import invalidate_feed
+from app.scraper.http_cache import NotModified
+from app.scraper.link_yield import link_yields
+from app.scraper.links import link_extractor
+from app.scraper.seen import seen_urls
+from app.scraper.url_rules import NON_ARTICLE_SLUGS, split_url
+
+log = logging.getLogger(__name__)
+
+_deferred: dict[str, list[str]] = {}  # listing URL -> ranked links beyond the last wave's budget
+_deferred_lock = threading.Lock()
+
+# score weights
+W_DATE, W_POSITION, W_SECTION, W_YIELD, DEPTH_PENALTY = 2.0, 1.0, 0.3, 1.0, 0.3
+_FRESH_DAYS = 30  # dated URLs older than this get no freshness bonus
+
+_URL_DATE_RE = re.compile(r"/(20\d{2})[/-](\d{1,2})(?:[/-](\d{1,2}))?(?=/|$|-)|/(20\d{2})(\d{2})(\d{2})(?=/|$|-)")
+_PAGE_RE = re.compile(r"(?:[?&](?:page|pagina|pag)=(\d+)|/(?:page|pagina|pag)/(\d+)/?$)", re.IGNORECASE)
+_REL_NEXT_RE = re.compile(r"<(?:link|a)\b[^>]*\brel\s*=\s*[\"']?next\b[^>]*>", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+
+def url_date(url: str) -> Optional[datetime]:
+    """Publication date encoded in the URL path (/2025/10/06/, /2025-10/, /20251006/)."""
+    m = _URL_DATE_RE.search(split_url(url).path)
+    if not m:
+        return None
+    year, month, day = (m.group(1), m.group(2), m.group(3)) if m.group(1) else m.group(4, 5, 6)
+    try:
+        return datetime(int(year), int(month), int(day or 1))
+    except ValueError:
+        return None
+
+
+def page_number(url: str) -> Optional[int]:
+    m = _PAGE_RE.search(url)
+    return int(m.group(1) or m.group(2)) if m else None
+
+
+def rel_next(html: str, base_url: str) -> Optional[str]:
+    """Target of `<link rel="next">` / `<a rel="next">`, if any."""
+    for tag in _REL_NEXT_RE.finditer(html):
+        m = _HREF_RE.search(tag.group(0))
+        href = m and next(g for g in m.groups() if g is not None).strip()
+        if href:
+            return urljoin(base_url, href)
+    return None
+
+
+class Frontier:
+    def __init__(self, listado_url: str, max_depth: Optional[int] = None, max_pages: Optional[int] = None,
+                 now: Optional[datetime] = None):
+        self.listado_url = listado_url
+        self.max_depth = max_depth if max_depth is not None else getattr(settings, "FRONTIER_MAX_DEPTH", 1)
+        self.max_pages = max_pages if max_pages is not None else getattr(settings, "FRONTIER_MAX_PAGES", 3)
+        self.now = now or datetime.utcnow()
+        parts = split_url(canonical_url(listado_url))
+        self.host = parts.netloc
+        self.section = parts.path.rstrip("/")
+        self._pages: list[tuple[int, int, int, str]] = []  # (depth, kind, order, url)
+        self._queued_pages: set[str] = {canonical_url(listado_url)}
+        self._seq = itertools.count()
+        self.pages_fetched = 1  # the listing page itself
+        self._scores: dict[str, float] = {}
+
+    # --- listing pages ---
+    def add_page(self, url: str, depth: int, kind: int = 0) -> None:
+        """Queue a listing page (kind 0 = pagination, 1 = section page)."""
+        url = canonical_url(url)
+        if depth > self.max_depth or url in self._queued_pages or split_url(url).netloc != self.host:
+            return
+        self._queued_pages.add(url)
+        heapq.heappush(self._pages, (depth, kind, page_number(url) or next(self._seq), url))
+
+    def next_page(self) -> Optional[tuple[str, int]]:
+        if not self._pages or self.pages_fetched >= self.max_pages:
+            return None
+        depth, _, _, url = heapq.heappop(self._pages)
+        self.pages_fetched += 1
+        return url, depth
+
+    def _is_section_page(self, url: str) -> bool:
+        path = split_url(url).path.rstrip("/")
+        if not path.startswith(self.section + "/"):
+            return False
+        rest = path[len(self.section) + 1:]
+        return "/" not in rest and "." not in rest and rest.count("-") < 2 and rest not in NON_ARTICLE_SLUGS
+
+    def add_links(self, page_url: str, html: str, hrefs: Iterable[str], depth: int,
+                  is_article: Callable[[str], bool], article_hrefs: Optional[Iterable[str]] = None) -> list[str]:
+        """Rank the article links of a fetched page and queue its next pages.
+
+        `hrefs` are all anchors of the page; `article_hrefs` (default: the
+        same) the ones considered as articles. Returns the article links
+        found on that page (canonical, in page order).
+        """
+        found: list[str] = []
+        hrefs = list(hrefs)
+        for position, href in enumerate(hrefs if article_hrefs is None else article_hrefs):
+            if not href:
+                continue
+            full_url = urljoin(page_url, href)
+            # "/noticias/page/2" passes the article heuristics but is a listing page
+            if page_number(full_url) is None and is_article(full_url):
+                url = canonical_url(full_url)
+                if url not in self._scores:
+                    found.append(url)
+                self.add_link(url, position, depth)
+
+        # only go deeper while this page still brings links that are not stored yet
+        if depth < self.max_depth and found and seen_urls.select(found, record_stats=False):
+            nxt = rel_next(html, page_url)
+            if nxt:
+                self.add_page(nxt, depth + 1)
+            for href in hrefs:
+                url = urljoin(page_url, href) if href else ""
+                if split_url(url).scheme not in ("http", "https"):
+                    continue
+                if page_number(url) is not None:
+                    if split_url(url).path.startswith(self.section):
+                        self.add_page(url, depth + 1)
+                elif self._is_section_page(url) and not is_article(url):
+                    self.add_page(url, depth + 1, kind=1)
+        return found
+
+    # --- ranking ---
+    def add_link(self, url: str, position: int, depth: int) -> None:
+        self._scores[url] = max(self._scores.get(url, float("-inf")), self.score(url, position, depth))
+
+    def score(self, url: str, position: int, depth: int) -> float:
+        published = url_date(url)
+        if published is None:
+            freshness = 0.5
+        else:
+            age_days = max(0.0, (self.now - published).total_seconds() / 86400)
+            freshness = max(0.0, 1.0 - age_days / _FRESH_DAYS)
+        in_section = bool(self.section) and split_url(url).path.startswith(self.section + "/")
+        return (W_DATE * freshness
+                + W_POSITION / (1 + position / 20)
+                + W_SECTION * in_section
+                + W_YIELD * link_yields.score(url)
+                - DEPTH_PENALTY * depth)
+
+    def ranked(self) -> list[str]:
+        """Article links, best first."""
+        return sorted(self._scores, key=self._scores.__getitem__, reverse=True)
+
+
+def crawl_listing(scraper, listado_url: str, first_html: str, is_article: Callable[[str], bool],
+                  article_hrefs: Optional[Callable[[str], list[str]]] = None,
+                  max_candidates: Optional[int] = None) -> list[str]:
+    """Walk a listing and its pagination from `first_html`; returns ranked article links.
+
+    `is_article(url)` classifies an absolute URL; `article_hrefs(html)`
+    optionally restricts the anchors considered as articles (e.g. CSS
+    selectors). Later pages that fail are skipped.
+    """
+    def _add(url: str, html: str, depth: int) -> list[str]:
+        return frontier.add_links(url, html, link_extractor.hrefs(html), depth, is_article,
+                                  article_hrefs(html) if article_hrefs else None)
+
+    frontier = Frontier(listado_url)
+    _add(listado_url, first_html, 0)
+    # links left over by the previous wave's budget compete again with the new ones
+    for position, url in enumerate(take_deferred(listado_url)):
+        frontier.add_link(url, position, 1)
+    while True:
+        page = frontier.next_page()
+        if page is None:
+            break
+        url, depth = page
+        try:
+            html = scraper.fetch(url)
+        except NotModified:
+            continue
+        except Exception as e:
+            log.debug("Listing page %s skipped: %s", url, e)
+            continue
+        found = _add(url, html, depth)
+        log.debug("Listing page %s (depth %d): %d new links", url, depth, len(found))
+    if frontier.pages_fetched > 1:
+        log.info("Frontier for %s: %d pages, %d links", listado_url, frontier.pages_fetched, len(frontier._scores))
+    limit = max_candidates if max_candidates is not None else getattr(settings, "FRONTIER_MAX_CANDIDATES", 500)
+    return frontier.ranked()[:limit]
+
+
+def wave_budget() -> int:
+    """Article downloads per source and wave."""
+    return getattr(settings, "FRONTIER_BUDGET", 50)
+
+
+def take_deferred(listado_url: str) -> list[str]:
+    """Links of `listado_url` left over by the previous wave's budget (best first)."""
+    with _deferred_lock:
+        return _deferred.pop(listado_url, [])
+
+
+def take_budget(listado_url: str, urls: list[str]) -> tuple[list[str], int]:
+    """Split ranked `urls` into this wave's downloads and the links deferred to the next one."""
+    budget = wave_budget()
+    batch, rest = urls[:budget], urls[budget:]
+    with _deferred_lock:
+        if rest:
+            _deferred[listado_url] = rest[:getattr(settings, "FRONTIER_MAX_CANDIDATES", 500)]
+        else:
+            _deferred.pop(listado_url, None)
+    if rest:
+        # the listing (or its feed) must be read and processed again next wave even if it did not change
+        http_cache.invalidate(listado_url)
+        invalidate_feed(listado_url)
+        fingerprint.forget(listado_url)
+    return batch, len(rest)
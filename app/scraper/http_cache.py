@@ -0,0 +1,110 @@
+# app/scraper/http_cache.py
+"""Persistent HTTP validators for conditional GETs.
+
+For every fetched URL we keep its ETag, Last-Modified and a hash of the body
+in the `http_cache` table. `BaseScraper.fetch` sends them back as
+`If-None-Match` / `If-Modified-Since`; a 304 (or a 200 with an identical body)
+is reported as `NotModified` so the pipeline can skip parsing and upserts.
+
+Cache errors are logged and swallowed: they must never break a fetch.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models import HttpCache
+
+log = logging.getLogger(__name__)
+
+
+class NotModified(Exception):
+    """Raised by fetch when the server (or the body hash) says nothing changed."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Not modified: {url}")
+        self.url = url
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def conditional_headers(url: str) -> dict[str, str]:
+    """Return If-None-Match / If-Modified-Since headers for a known URL."""
+    db = SessionLocal()
+    try:
+        entry = db.query(HttpCache).filter_by(url=url).first()
+        if not entry:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+    except Exception as e:
+        log.debug("HTTP cache lookup failed for %s: %s", url, e)
+        return {}
+    finally:
+        db.close()
+
+
+def remember(url: str, etag: str | None, last_modified: str | None, body: bytes | None) -> bool:
+    """Store validators for `url`. Returns True if the body hash is unchanged."""
+    digest = content_hash(body) if body is not None else None
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        entry = db.query(HttpCache).filter_by(url=url).first()
+        unchanged = bool(entry and digest and entry.content_hash == digest)
+        if not entry:
+            entry = HttpCache(url=url)
+            db.add(entry)
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        if digest:
+            entry.content_hash = digest
+        entry.checked_at = now
+        if not unchanged:
+            entry.updated_at = now
+        db.commit()
+        return unchanged
+    except Exception as e:
+        db.rollback()
+        log.debug("HTTP cache store failed for %s: %s", url, e)
+        return False
+    finally:
+        db.close()
+
+
+def touch(url: str) -> None:
+    """Record that `url` was revalidated (304) without changes."""
+    db = SessionLocal()
+    try:
+        db.query(HttpCache).filter_by(url=url).update({"checked_at": datetime.utcnow()})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        log.debug("HTTP cache touch failed for %s: %s", url, e)
+    finally:
+        db.close()
+
+
+def invalidate(url: str) -> None:
+    """Forget validators so the next fetch downloads `url` in full.
+
+    Used when a downloaded page could not be processed, so a later 304 does
+    not hide content that was never stored.
+    """
+    db = SessionLocal()
+    try:
+        db.query(HttpCache).filter_by(url=url).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        log.debug("HTTP cache invalidate failed for %s: %s", url, e)
+    finally:
+        db.close()
@@ -0,0 +1,184 @@
+# app/scraper/link_yield.py
+"""Learned link prioritization from extraction outcomes.
+
+Many listing links pass the URL heuristics but are not articles (galleries,
+section fronts, live blogs...): they are downloaded and extracted just to be
+discarded. Every processed link is reduced to a URL-path pattern
+(`/noticias/{slug}`, `/{n}/{n}/{slug}`, `/videos/{slug}`) and its outcome
+(article or not) is counted per host and pattern in `link_yields`.
+
+`link_yields.score(url)` (the pattern's Laplace-smoothed article rate, 0.5
+for unknown patterns) feeds the crawl frontier's ranking, and
+`link_yields.select(urls)` drops links whose pattern has at least
+LINK_YIELD_MIN_SAMPLES outcomes and a rate below LINK_YIELD_SKIP_BELOW. One
+in LINK_YIELD_EXPLORE_EVERY skipped links is still fetched so a pattern can
+recover if the site changes. The table is small and
+readable at /api/scraping/link-yields.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import LinkYield
+from app.scraper.ratelimit import host_key
+from app.scraper.stats import fetch_stats
+from app.scraper.url_rules import split_url
+
+log = logging.getLogger(__name__)
+
+_MAX_SEGMENTS = 4
+_DIGITS_RE = re.compile(r"\d")
+
+
+def _segment_shape(seg: str) -> str:
+    name, dot, ext = seg.partition(".")
+    if name.isdigit():
+        shape = "{n}"
+    elif name.count("-") >= 2 or len(name) >= 25 or len(_DIGITS_RE.findall(name)) >= 4:
+        shape = "{slug}"
+    else:
+        shape = name
+    return shape + dot + ext if ext.isalpha() else shape
+
+
+def path_pattern(url: str) -> str:
+    """Generalized path of `url`: section names kept, ids and slugs abstracted."""
+    segments = [s for s in split_url(url).path.lower().split("/") if s]
+    pattern = "/" + "/".join(_segment_shape(s) for s in segments[:_MAX_SEGMENTS])
+    if len(segments) > _MAX_SEGMENTS:
+        pattern += "/…"
+    return pattern[:255]
+
+
+class LinkYields:
+    def __init__(self):
+        self.enabled = getattr(settings, "LINK_YIELD_ENABLED", True)
+        self.min_samples = getattr(settings, "LINK_YIELD_MIN_SAMPLES", 10)
+        self.skip_below = getattr(settings, "LINK_YIELD_SKIP_BELOW", 0.1)
+        self.explore_every = getattr(settings, "LINK_YIELD_EXPLORE_EVERY", 10)
+        self._stats: dict[tuple[str, str], list[int]] = {}  # (host, pattern) -> [fetched, articles]
+        self._dirty: Counter = Counter()  # outcomes not written to the table yet
+        self._dirty_articles: Counter = Counter()
+        self._skips: Counter = Counter()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    # --- persistence ---
+    def _load(self) -> None:
+        stats: dict[tuple[str, str], list[int]] = {}
+        db = SessionLocal()
+        try:
+            for row in db.query(LinkYield).all():
+                stats[(row.host, row.pattern)] = [row.fetched or 0, row.articles or 0]
+        except Exception as e:
+            log.warning("Could not load link yields: %s", e)
+        finally:
+            db.close()
+        with self._lock:
+            for key, (fetched, articles) in stats.items():
+                current = self._stats.setdefault(key, [0, 0])
+                current[0] += fetched
+                current[1] += articles
+            self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+
+    def flush(self) -> None:
+        """Write the outcomes recorded since the last flush to `link_yields`."""
+        with self._lock:
+            fetched, articles = self._dirty, self._dirty_articles
+            self._dirty, self._dirty_articles = Counter(), Counter()
+        if not fetched:
+            return
+        db = SessionLocal()
+        try:
+            for (host, pattern), n in fetched.items():
+                row = db.query(LinkYield).filter_by(host=host, pattern=pattern).first()
+                if not row:
+                    row = LinkYield(host=host, pattern=pattern, fetched=0, articles=0)
+                    db.add(row)
+                row.fetched = (row.fetched or 0) + n
+                row.articles = (row.articles or 0) + articles[(host, pattern)]
+                row.updated_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            log.debug("Could not store link yields: %s", e)
+        finally:
+            db.close()
+
+    # --- public API ---
+    def record(self, url: str, is_article: bool) -> None:
+        """Count the outcome of a downloaded link."""
+        if not self.enabled:
+            return
+        self._ensure_loaded()
+        key = (host_key(url), path_pattern(url))
+        with self._lock:
+            stats = self._stats.setdefault(key, [0, 0])
+            stats[0] += 1
+            self._dirty[key] += 1
+            if is_article:
+                stats[1] += 1
+                self._dirty_articles[key] += 1
+
+    def rate(self, url: str) -> Optional[float]:
+        """Observed article rate of `url`'s pattern, or None below LINK_YIELD_MIN_SAMPLES."""
+        self._ensure_loaded()
+        stats = self._stats.get((host_key(url), path_pattern(url)))
+        if not stats or stats[0] < self.min_samples:
+            return None
+        return stats[1] / stats[0]
+
+    def score(self, url: str) -> float:
+        """Smoothed article rate used to order links (0.5 for unseen patterns)."""
+        self._ensure_loaded()
+        fetched, articles = self._stats.get((host_key(url), path_pattern(url)), (0, 0))
+        return (articles + 1) / (fetched + 2)
+
+    def select(self, urls: list[str]) -> list[str]:
+        """Drop links of low-yield patterns (order preserved)."""
+        if not self.enabled or not urls:
+            return urls
+        kept: list[str] = []
+        skipped = 0
+        for url in urls:
+            rate = self.rate(url)
+            if rate is not None and rate < self.skip_below:
+                key = (host_key(url), path_pattern(url))
+                with self._lock:
+                    self._skips[key] += 1
+                    explore = bool(self.explore_every) and self._skips[key] % self.explore_every == 0
+                if not explore:
+                    skipped += 1
+                    continue
+            kept.append(url)
+        if skipped:
+            fetch_stats.incr("links_skipped_low_yield", skipped)
+        return kept
+
+    def snapshot(self, host: Optional[str] = None) -> list[dict]:
+        self._ensure_loaded()
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._stats.items() if host is None or k[0] == host_key(host)]
+        items.sort(key=lambda kv: (kv[0][0], -kv[1][0]))
+        return [
+            {"host": h, "pattern": p, "fetched": f, "articles": a, "rate": round(a / f, 3) if f else None,
+             "skipped": bool(f >= self.min_samples and a / f < self.skip_below)}
+            for (h, p), (f, a) in items
+        ]
+
+
+link_yields = LinkYields()
@@ -0,0 +1,156 @@
+# app/scraper/links.py
+"""Fast `<a href>` extraction for listing pages.
+
+Building a full `BeautifulSoup(html, "html.parser")` tree only to read the
+anchors costs hundreds of milliseconds on a 500 KB homepage. The extractors
+here return the raw href values in document order without creating Python
+objects for the rest of the document:
+
+* ``selectolax`` (Lexbor, optional dependency) when installed,
+* ``lxml`` (already required by trafilatura): libxml2 tree + one XPath,
+* ``bs4``: BeautifulSoup restricted to anchors, always available.
+
+LINK_EXTRACTOR picks one ("auto" = first available in that order).
+`select_hrefs` supports the simple CSS selectors used by the scrapers
+(`tag`, `.class`, `[attr]`, `[attr*='x']`, `[attr^='x']`, `[attr='x']`
+and descendant combinations).
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Iterable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+try:
+    from lxml import etree as _etree
+    from lxml import html as _lxml_html
+except ImportError:  # pragma: no cover - lxml comes with trafilatura
+    _lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+class LinkExtractor:
+    """Interface: collect href values of anchors."""
+
+    name = "base"
+
+    def hrefs(self, html: str) -> list[str]:
+        raise NotImplementedError
+
+    def select_hrefs(self, html: str, selectors: Iterable[str]) -> list[str]:
+        """Hrefs of the anchors matched by each selector, selector by selector."""
+        raise NotImplementedError
+
+
+class SoupLinkExtractor(LinkExtractor):
+    name = "bs4"
+
+    def hrefs(self, html: str) -> list[str]:
+        soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a", href=True))
+        return [a["href"] for a in soup.find_all("a", href=True)]
+
+    def select_hrefs(self, html: str, selectors: Iterable[str]) -> list[str]:
+        soup = BeautifulSoup(html, "html.parser")
+        return [a["href"] for sel in selectors for a in soup.select(sel) if a.get("href")]
+
+
+_SIMPLE_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<classes>(?:\.[\w-]+)*)"
+    r"(?:\[(?P<attr>[\w-]+)(?:(?P<op>[*^]?=)['\"]?(?P<value>[^'\"\]]*)['\"]?)?\])?$"
+)
+
+
+def css_to_xpath(selector: str) -> str:
+    """Translate a simple CSS selector into XPath (ValueError if unsupported)."""
+    steps = []
+    for part in selector.split():
+        m = _SIMPLE_RE.match(part)
+        if not m or not part:
+            raise ValueError(f"unsupported selector: {selector}")
+        conds = [f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')"
+                 for c in m.group("classes").split(".") if c]
+        attr, op, value = m.group("attr"), m.group("op"), m.group("value")
+        if attr and not op:
+            conds.append(f"@{attr}")
+        elif attr:
+            fn = {"*=": "contains(@{a}, '{v}')", "^=": "starts-with(@{a}, '{v}')", "=": "@{a}='{v}'"}[op]
+            conds.append(fn.format(a=attr, v=value))
+        steps.append((m.group("tag") or "*") + "".join(f"[{c}]" for c in conds))
+    return "//" + "//".join(steps)
+
+
+class LxmlLinkExtractor(LinkExtractor):
+    name = "lxml"
+
+    _ANCHORS = None  # compiled lazily so importing this module never needs lxml
+
+    def _tree(self, html: str):
+        try:
+            return _lxml_html.fromstring(html)
+        except ValueError:
+            # str input with an XML encoding declaration
+            return _lxml_html.fromstring(html.encode("utf-8"), parser=_lxml_html.HTMLParser(encoding="utf-8"))
+
+    def hrefs(self, html: str) -> list[str]:
+        if not html or not html.strip():
+            return []
+        if LxmlLinkExtractor._ANCHORS is None:
+            LxmlLinkExtractor._ANCHORS = _etree.XPath("//a/@href", smart_strings=False)
+        return LxmlLinkExtractor._ANCHORS(self._tree(html))
+
+    def select_hrefs(self, html: str, selectors: Iterable[str]) -> list[str]:
+        if not html or not html.strip():
+            return []
+        tree = self._tree(html)
+        out: list[str] = []
+        for sel in selectors:
+            try:
+                xpath = css_to_xpath(sel)
+            except ValueError:
+                out += SoupLinkExtractor().select_hrefs(html, [sel])
+                continue
+            out += [a.get("href") for a in tree.xpath(xpath) if a.get("href")]
+        return out
+
+
+class SelectolaxLinkExtractor(LinkExtractor):
+    name = "selectolax"
+
+    def hrefs(self, html: str) -> list[str]:
+        return [n.attributes["href"] for n in LexborHTMLParser(html).css("a[href]") if n.attributes.get("href")]
+
+    def select_hrefs(self, html: str, selectors: Iterable[str]) -> list[str]:
+        tree = LexborHTMLParser(html)
+        return [n.attributes["href"] for sel in selectors for n in tree.css(sel) if n.attributes.get("href")]
+
+
+EXTRACTORS: dict[str, type[LinkExtractor]] = {"bs4": SoupLinkExtractor}
+if _lxml_html is not None:
+    EXTRACTORS["lxml"] = LxmlLinkExtractor
+if LexborHTMLParser is not None:
+    EXTRACTORS["selectolax"] = SelectolaxLinkExtractor
+
+_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+def get_link_extractor(name: Optional[str] = None) -> LinkExtractor:
+    """Extractor `name` (or LINK_EXTRACTOR); falls back to the best available one."""
+    name = (name or getattr(settings, "LINK_EXTRACTOR", "auto")).lower()
+    if name != "auto" and name not in EXTRACTORS:
+        log.warning("Link extractor %r is not available, using the best installed one", name)
+    if name not in EXTRACTORS:
+        name = next(n for n in _PREFERENCE if n in EXTRACTORS)
+    return EXTRACTORS[name]()
+
+
+link_extractor = get_link_extractor()
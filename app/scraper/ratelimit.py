@@ -0,0 +1,105 @@
+# app/scraper/ratelimit.py
+"""Process-wide, per-host token bucket rate limiting.
+
+Every scraper instance shares the same `rate_limiter`, so a host is throttled
+globally no matter how many `GenericScraper` objects hit it, while unrelated
+hosts proceed in parallel. Waiting is done by reservation: `acquire` reserves
+a token and sleeps outside the lock (`time.sleep` for threads,
+`asyncio.sleep` for coroutines), so the event loop is never blocked.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+def host_key(url_or_host: str) -> str:
+    """Normalized host used as key for per-host state."""
+    if "//" in url_or_host:
+        url_or_host = urlparse(url_or_host).netloc
+    return url_or_host.lower()
+
+
+class TokenBucket:
+    """Token bucket that refills `rate` tokens per second up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # Token borrowed from the future: wait until it has been refilled
+            return -self._tokens / self.rate
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by host."""
+
+    def __init__(self, default_interval: Optional[float] = None, default_burst: Optional[int] = None):
+        self.default_interval = (getattr(settings, "RATE_LIMIT_SECONDS", 0)
+                                 if default_interval is None else default_interval)
+        self.default_burst = (getattr(settings, "RATE_LIMIT_BURST", 1)
+                              if default_burst is None else default_burst)
+        self._buckets: dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url_or_host: str, interval: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """Set the limits for a host (e.g. from a `Fuente`). None keeps the defaults."""
+        key = host_key(url_or_host)
+        interval = self.default_interval if interval is None else interval
+        burst = self.default_burst if burst is None else burst
+        with self._lock:
+            current = self._buckets.get(key)
+            if not interval or interval <= 0:
+                self._buckets[key] = None
+            elif current is None or current.rate != 1.0 / interval or current.burst != burst:
+                self._buckets[key] = TokenBucket(1.0 / interval, burst)
+
+    def _bucket(self, url_or_host: str) -> Optional[TokenBucket]:
+        key = host_key(url_or_host)
+        with self._lock:
+            if key not in self._buckets:
+                interval = self.default_interval
+                self._buckets[key] = TokenBucket(1.0 / interval, self.default_burst) if interval and interval > 0 else None
+            return self._buckets[key]
+
+    def acquire(self, url_or_host: str) -> float:
+        """Blocking acquire for sync callers. Returns the time waited."""
+        bucket = self._bucket(url_or_host)
+        wait = bucket.reserve() if bucket else 0.0
+        if wait > 0:
+            log.debug("Rate limit %s: sleeping %.2fs", host_key(url_or_host), wait)
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url_or_host: str) -> float:
+        """Non-blocking acquire for coroutines. Returns the time waited."""
+        bucket = self._bucket(url_or_host)
+        wait = bucket.reserve() if bucket else 0.0
+        if wait > 0:
+            log.debug("Rate limit %s: awaiting %.2fs", host_key(url_or_host), wait)
+            await asyncio.sleep(wait)
+        return wait
+
+
+# Shared by every scraper in the process
+rate_limiter = HostRateLimiter()
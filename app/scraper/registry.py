@@ -0,0 +1,64 @@
+# app/scraper/registry.py
+"""Scraper and extractor selection by host.
+
+Every source is scraped by the scraper registered for its host (or the
+site it is a subdomain of), falling back to `GenericScraper`. Each scraper
+runs its own extractor (see `app.scraper.extractors`) on the extraction
+workers, so choosing the scraper also chooses how the articles are
+extracted. A site with a dedicated scraper is added here; the extractor
+counters at /api/scraping/extractors show whether it does better than the
+generic one.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from app.scraper.base import BaseScraper
+from app.scraper.extractors import name_of
+from app.scraper.generic import GenericScraper, extract_fields
+from app.scraper.rpp import RPPScraper, extract_rpp_fields
+from app.scraper.url_rules import host as url_host
+
+
+class Entry(NamedTuple):
+    scraper: type[BaseScraper]
+    extract: object  # the scraper's extractor, registered with @extractor
+
+    @property
+    def extractor(self) -> Optional[str]:
+        return name_of(self.extract)
+
+
+DEFAULT = Entry(GenericScraper, extract_fields)
+
+# host (without "www.") -> scraper for its sources; also matches subdomains
+SCRAPERS: dict[str, Entry] = {
+    "rpp.pe": Entry(RPPScraper, extract_rpp_fields),
+}
+
+
+@lru_cache(maxsize=4096)
+def entry_for(host: str) -> Entry:
+    """Registry entry of `host` or of the site it is a subdomain of."""
+    parts = host.lower().split(":")[0].split(".")
+    for i in range(len(parts) - 1):
+        entry = SCRAPERS.get(".".join(parts[i:]))
+        if entry is not None:
+            return entry
+    return DEFAULT
+
+
+def scraper_for(listado_url: str, rate_limit_seconds: float | None = None,
+                rate_limit_burst: int | None = None) -> BaseScraper:
+    """Scraper for the source whose listing is `listado_url`."""
+    scraper_cls = entry_for(url_host(listado_url)).scraper
+    return scraper_cls(listado_url, rate_limit_seconds, rate_limit_burst)
+
+
+def snapshot() -> dict:
+    return {
+        "default": {"scraper": DEFAULT.scraper.__name__, "extractor": DEFAULT.extractor},
+        "hosts": [{"host": host, "scraper": entry.scraper.__name__, "extractor": entry.extractor}
+                  for host, entry in SCRAPERS.items()],
+    }
@@ -0,0 +1,188 @@
+# app/scraper/retry_queue.py
+"""Delayed retry queue for article downloads.
+
+Transient failures (429, 5xx, timeouts, connection errors, open circuit)
+are not retried inside the worker thread. `BaseScraper.fetch_many` hands
+them to `retry_queue` and moves on. The queue keeps each URL with its
+attempt count and a due time: the server's Retry-After when given,
+otherwise exponential backoff (RETRY_BACKOFF_SECONDS * 2**attempt, capped
+at RETRY_BACKOFF_MAX_SECONDS, with jitter).
+
+The scheduler polls `pop_due()` every RETRY_POLL_SECONDS and feeds due
+URLs back to the scraper that failed them (`process_urls`). After
+REQUEST_RETRIES failed retries a URL goes to the `dead_letters` table
+instead. The queue itself lives in memory: pending retries are lost on
+restart, but the next listing wave rediscovers those URLs anyway.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import requests
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import DeadLetter
+from app.scraper.breaker import CircuitOpen, circuit_breakers
+from app.scraper.concurrency import parse_retry_after
+
+log = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class RetryItem:
+    url: str
+    attempts: int
+    scraper_cls: Optional[type] = None
+    listado_url: Optional[str] = None
+    last_error: str = ""
+    due: float = 0.0
+
+
+def retry_hint(exc: BaseException) -> tuple[bool, Optional[float]]:
+    """(retryable, server-requested delay) for a failed download."""
+    if isinstance(exc, CircuitOpen):
+        return True, circuit_breakers.open_seconds
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        if exc.response.status_code in RETRYABLE_STATUSES:
+            return True, parse_retry_after(exc.response.headers.get("Retry-After"))
+        return False, None
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True, None
+    return False, None
+
+
+class RetryQueue:
+    def __init__(self):
+        self.max_retries = getattr(settings, "REQUEST_RETRIES", 3)
+        self.base_delay = getattr(settings, "RETRY_BACKOFF_SECONDS", 30)
+        self.max_delay = getattr(settings, "RETRY_BACKOFF_MAX_SECONDS", 1800)
+        self._heap: list[tuple[float, int, RetryItem]] = []
+        self._items: dict[str, RetryItem] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def attempts(self, url: str) -> int:
+        """Retries already spent on `url` (0 if it is not queued)."""
+        item = self._items.get(url)
+        return item.attempts if item else 0
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        return delay * random.uniform(0.9, 1.1)
+
+    def schedule(self, url: str, error: BaseException, scraper=None) -> bool:
+        """Queue `url` after a failed download. Returns False if it is not retried.
+
+        Only scrapers of a source (`listado_url`) can take URLs back
+        (`process_urls`) and get retries.
+        """
+        retryable, retry_after = retry_hint(error)
+        if not retryable or not getattr(scraper, "listado_url", None):
+            self.done(url)
+            return False
+        with self._lock:
+            item = self._items.get(url)
+            attempts = item.attempts if item else 0
+            if attempts >= self.max_retries:
+                self._items.pop(url, None)
+                exhausted = True
+            else:
+                exhausted = False
+                delay = retry_after if retry_after is not None else self.backoff(attempts)
+                item = RetryItem(
+                    url=url,
+                    attempts=attempts + 1,
+                    scraper_cls=type(scraper),
+                    listado_url=getattr(scraper, "listado_url", None),
+                    last_error=f"{type(error).__name__}: {error}"[:500],
+                    due=time.monotonic() + delay,
+                )
+                self._items[url] = item
+                heapq.heappush(self._heap, (item.due, next(self._seq), item))
+        if exhausted:
+            self._dead_letter(url, attempts, error, getattr(scraper, "listado_url", None))
+            return False
+        log.info("Retry %d/%d for %s in %.0fs (%s)", item.attempts, self.max_retries, url, delay, item.last_error)
+        return True
+
+    def done(self, url: str) -> None:
+        """Forget `url` once it was downloaded or failed for good."""
+        if url not in self._items:
+            return
+        with self._lock:
+            self._items.pop(url, None)
+
+    def pop_due(self) -> list[RetryItem]:
+        """Remove and return the items whose delay has elapsed."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, item = heapq.heappop(self._heap)
+                # skip entries superseded by a later schedule() of the same URL
+                if self._items.get(item.url) is item:
+                    due.append(item)
+        return due
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            items = sorted(self._items.values(), key=lambda i: i.due)
+        return {
+            "pending": len(items),
+            "items": [
+                {"url": i.url, "attempts": i.attempts, "due_in_s": round(max(0.0, i.due - now), 1),
+                 "last_error": i.last_error}
+                for i in items[:100]
+            ],
+        }
+
+    def _dead_letter(self, url: str, attempts: int, error: BaseException, listado_url: Optional[str]) -> None:
+        log.warning("Giving up on %s after %d retries: %s", url, attempts, error)
+        db = SessionLocal()
+        try:
+            row = db.query(DeadLetter).filter_by(url=url).first()
+            if not row:
+                row = DeadLetter(url=url)
+                db.add(row)
+            row.listado_url = listado_url
+            row.attempts = attempts + 1
+            row.last_error = f"{type(error).__name__}: {error}"[:500]
+            row.updated_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            log.debug("Could not store dead letter for %s: %s", url, e)
+        finally:
+            db.close()
+
+
+retry_queue = RetryQueue()
+
+
+def process_due_retries() -> int:
+    """Hand due retries back to their scrapers. Returns the number of URLs retried."""
+    groups: dict[tuple, list[str]] = {}
+    for item in retry_queue.pop_due():
+        if not item.listado_url:
+            retry_queue.done(item.url)
+            continue
+        groups.setdefault((item.scraper_cls, item.listado_url), []).append(item.url)
+
+    for (scraper_cls, listado_url), urls in groups.items():
+        try:
+            scraper_cls(listado_url).process_urls(urls)
+        except Exception as e:
+            log.error("Retry wave for %s failed: %s", listado_url, e)
+    return sum(len(urls) for urls in groups.values())
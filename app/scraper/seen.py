@@ -0,0 +1,186 @@
+# app/scraper/seen.py
+"""Per-source "already ingested" URL set for incremental listing crawls.
+
+Every wave used to re-download and re-extract all links of a listing,
+although most of them were stored hours ago. `seen_urls.select(urls)`
+keeps only the links worth fetching: URLs never stored, plus stored URLs
+whose last check is older than SEEN_REFRESH_HOURS (revisited to track
+changes; 0 disables revisits).
+
+Each source host gets an in-memory Bloom filter over `noticias.url`, built
+at startup. A negative answer means "definitely new" and costs no query. Only
+the (few) positives are confirmed against the unique `noticias.url` index,
+which also returns their `updated_at` for the refresh decision.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Noticia
+from app.scraper.stats import fetch_stats
+
+log = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class SeenUrls:
+    def __init__(self):
+        self.enabled = getattr(settings, "SEEN_FILTER_ENABLED", True)
+        self.refresh = timedelta(hours=getattr(settings, "SEEN_REFRESH_HOURS", 24))
+        self.error_rate = getattr(settings, "SEEN_BLOOM_ERROR_RATE", 0.01)
+        self.min_capacity = getattr(settings, "SEEN_BLOOM_CAPACITY", 50_000)
+        self._blooms: dict[str, BloomFilter] = {}
+        self._checked: dict[str, datetime] = {}  # URLs checked by this process (incl. 304s)
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    # --- loading ---
+    def load(self) -> None:
+        """Build one Bloom filter per source host from `noticias`."""
+        start = time.perf_counter()
+        by_host: dict[str, list[str]] = {}
+        db = SessionLocal()
+        try:
+            for (url,) in db.query(Noticia.url).yield_per(5000):
+                by_host.setdefault(_host(url), []).append(url)
+        except Exception as e:
+            # fall back to fetching everything instead of retrying the load on every call
+            log.warning("Could not load seen URLs: %s", e)
+            self._loaded = True
+            return
+        finally:
+            db.close()
+        blooms = {host: self._build(urls) for host, urls in by_host.items()}
+        with self._lock:
+            self._blooms = blooms
+            self._loaded = True
+        log.info("Seen-URL filters loaded: %d URLs, %d hosts in %.2fs",
+                 sum(len(u) for u in by_host.values()), len(blooms), time.perf_counter() - start)
+
+    def _build(self, urls: list[str]) -> BloomFilter:
+        bloom = BloomFilter(max(self.min_capacity, 2 * len(urls)), self.error_rate)
+        for url in urls:
+            bloom.add(url)
+        return bloom
+
+    def _bloom(self, host: str) -> BloomFilter:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+        bloom = self._blooms.get(host)
+        if bloom is None:
+            with self._lock:
+                bloom = self._blooms.setdefault(host, BloomFilter(self.min_capacity, self.error_rate))
+        return bloom
+
+    def _grow(self, host: str) -> None:
+        """Rebuild an overfull filter (its false-positive rate would degrade)."""
+        db = SessionLocal()
+        try:
+            urls = [u for (u,) in db.query(Noticia.url).filter(Noticia.url.like(f"%://{host}/%"))]
+        finally:
+            db.close()
+        bloom = self._build(urls)
+        with self._lock:
+            self._blooms[host] = bloom
+
+    # --- public API ---
+    def add(self, url: str) -> None:
+        """Record that `url` was stored / checked just now."""
+        host = _host(url)
+        bloom = self._bloom(host)
+        with self._lock:
+            if url not in bloom:
+                bloom.add(url)
+            now = self._checked[url] = datetime.utcnow()
+            if len(self._checked) > 100_000:
+                self._checked = {u: t for u, t in self._checked.items() if now - t < self.refresh}
+            overfull = bloom.count > bloom.capacity
+        if overfull:
+            self._grow(host)
+
+    def select(self, urls: list[str], record_stats: bool = True) -> list[str]:
+        """Keep new URLs and stored ones that are due for a refresh (order preserved)."""
+        if not self.enabled or not urls:
+            return urls
+        maybe_seen = [u for u in urls if u in self._bloom(_host(u))]
+        last_check: dict[str, datetime] = {}
+        if maybe_seen:
+            db = SessionLocal()
+            try:
+                rows = db.query(Noticia.url, Noticia.updated_at).filter(Noticia.url.in_(maybe_seen)).all()
+            except Exception as e:
+                log.warning("Seen-URL lookup failed, fetching everything: %s", e)
+                return urls
+            finally:
+                db.close()
+            for url, updated_at in rows:
+                last_check[url] = max(updated_at or datetime.min, self._checked.get(url, datetime.min))
+
+        now = datetime.utcnow()
+        selected, revisits = [], 0
+        for url in urls:
+            checked = last_check.get(url)
+            if checked is None:
+                selected.append(url)
+            elif self.refresh and now - checked >= self.refresh:
+                selected.append(url)
+                revisits += 1
+        if not record_stats:
+            return selected
+        skipped = len(urls) - len(selected)
+        fetch_stats.incr("listing_new", len(selected) - revisits)
+        fetch_stats.incr("listing_revisits", revisits)
+        fetch_stats.incr("listing_skipped_seen", skipped)
+        return selected
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "hosts": len(self._blooms),
+                "urls": sum(b.count for b in self._blooms.values()),
+                "bytes": sum(len(b._bits) for b in self._blooms.values()),
+            }
+
+
+seen_urls = SeenUrls()
@@ -0,0 +1,122 @@
+# app/scraper/sessions.py
+"""Process-wide registry of pooled HTTP sessions.
+
+Every fetch path (scrapers, scraper_service, image downloads, social
+scraping) shares the same `requests.Session`, so TCP/TLS connections are kept
+alive and reused instead of being re-established for every article.
+
+Per-host pool sizes can be tuned with `HTTP_POOL_MAXSIZE_BY_HOST` or at runtime
+with `session_registry.configure_host(...)`; each host gets its own mounted
+adapter in that case. Compressed responses are negotiated by default.
+"""
+from __future__ import annotations
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
+
+try:  # urllib3 only decodes brotli when one of these is installed
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+
+def _retry() -> Retry:
+    # Only an immediate retry for failed connects: HTTP errors (429/5xx) and
+    # read timeouts are returned to the caller so nothing sleeps in the worker
+    # thread. Scrapers reschedule them via app.scraper.retry_queue.
+    return Retry(
+        total=1,
+        connect=1,
+        read=0,
+        status=0,
+        backoff_factor=0,
+        allowed_methods=["GET", "POST", "PUT", "DELETE", "HEAD"],
+        raise_on_status=False,
+    )
+
+
+def _adapter(pool_maxsize: int) -> HTTPAdapter:
+    return HTTPAdapter(
+        max_retries=_retry(),
+        pool_connections=getattr(settings, "HTTP_POOL_CONNECTIONS", 20),
+        pool_maxsize=pool_maxsize,
+    )
+
+
+class SessionRegistry:
+    """Thread-safe registry of named, shared `requests.Session` objects."""
+
+    def __init__(self):
+        self._sessions: dict[str, requests.Session] = {}
+        self._host_pools: dict[str, int] = dict(getattr(settings, "HTTP_POOL_MAXSIZE_BY_HOST", {}) or {})
+        self._lock = threading.Lock()
+
+    @property
+    def default_pool_maxsize(self) -> int:
+        # never smaller than the scraper's (global or adaptive per-host) fetch concurrency
+        return max(getattr(settings, "HTTP_POOL_MAXSIZE", 10), getattr(settings, "FETCH_CONCURRENCY", 8),
+                   getattr(settings, "FETCH_PER_HOST_MAX_CONCURRENCY", 8))
+
+    def _build(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({
+            "User-Agent": getattr(settings, "USER_AGENT", "news-scraper/1.0"),
+            "Accept-Encoding": _ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        adapter = _adapter(self.default_pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        for host, size in self._host_pools.items():
+            self._mount_host(session, host, size)
+        return session
+
+    @staticmethod
+    def _mount_host(session: requests.Session, host: str, pool_maxsize: int) -> None:
+        adapter = _adapter(pool_maxsize)
+        session.mount(f"https://{host}/", adapter)
+        session.mount(f"http://{host}/", adapter)
+
+    def get(self, name: str = "default") -> requests.Session:
+        """Return the shared session `name`, creating it on first use."""
+        session = self._sessions.get(name)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(name)
+                if session is None:
+                    session = self._sessions[name] = self._build()
+        return session
+
+    def configure_host(self, host: str, pool_maxsize: int) -> None:
+        """Give `host` its own connection pool of `pool_maxsize` connections."""
+        host = host.lower()
+        with self._lock:
+            if self._host_pools.get(host) == pool_maxsize:
+                return
+            self._host_pools[host] = pool_maxsize
+            for session in self._sessions.values():
+                self._mount_host(session, host, pool_maxsize)
+
+    def close_all(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+session_registry = SessionRegistry()
+
+
+def get_session(name: str = "default") -> requests.Session:
+    """Shortcut for `session_registry.get(name)`."""
+    return session_registry.get(name)
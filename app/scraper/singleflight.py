@@ -0,0 +1,68 @@
+# app/scraper/singleflight.py
+"""In-process single-flight coalescing.
+
+The scheduler's fast and full scraping jobs, the manual "scrape all"
+endpoints and different listing pages linking to the same article can all
+ask for the same URL at the same moment. A `SingleFlight` group lets the
+first caller (the leader) do the work while concurrent callers for the same
+key wait for its result (or exception) instead of repeating it. Nothing is
+cached: once the leader finishes the key is forgotten.
+
+Waiting works from threads (`Future.result()`) and from coroutines
+(`await asyncio.wrap_future(future)`).
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+from app.scraper.stats import fetch_stats
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: Hashable) -> tuple[Future, bool]:
+        """Return (future, is_leader). The leader must call `finish`."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                fetch_stats.incr(f"coalesced_{self.name}")
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None,
+               error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` once for all concurrent callers with the same key."""
+        future, leader = self.begin(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.finish(key, future, error=exc)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+downloads = SingleFlight("downloads")
+extractions = SingleFlight("extractions")
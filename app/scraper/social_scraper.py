@@ -7,6 +7,8 @@ from typing import List, Dict, Optional
 import time
 import random
 
+from app.scraper.sessions import get_session
+
 class SocialMediaScraper:
     def __init__(self):
         self.headers = {
@@ -80,7 +82,7 @@ class SocialMediaScraper:
                     
                     print(f"   [INFO] Probando instancia: {instance}")
                     
-                    response = requests.get(nitter_url, headers=self.headers, timeout=10)
+                    response = get_session().get(nitter_url, headers=self.headers, timeout=10)
                     
                     if response.status_code != 200:
                         print(f"   [ERROR] Instancia {instance} - Status: {response.status_code}")
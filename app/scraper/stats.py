@@ -0,0 +1,33 @@
+# app/scraper/stats.py
+"""Process-wide counters for the fetch layer (exposed at /api/scraping/stats)."""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+
+class FetchStats:
+    """Thread-safe named counters."""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counts[name]
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+fetch_stats = FetchStats()
@@ -0,0 +1,160 @@
+# app/scraper/templates.py
+"""Per-site extraction templates tried before trafilatura.
+
+For the sites we scrape the most (the ones with URL rules in
+`url_rules.SITE_PATTERNS`) we know where the title, body, date and image
+are. A `SiteTemplate` lists selectors for each field, tried in order:
+simple CSS (see `links.css_to_xpath`) or XPath (starting with "/" or "(";
+XPath may select attributes, e.g. `//meta[@property='og:image']/@content`).
+Every match of a `body` selector is one paragraph.
+
+Templates are compiled to `lxml.etree.XPath` objects once per host. The
+extractors call `apply_template(url, page)` on the already parsed page: a
+result that passes validation (a title, at least `min_paragraphs`
+paragraphs and `min_body_chars` characters) replaces trafilatura for that
+page. On a miss, or a result that fails validation, the extractor falls
+back to trafilatura as before. Hits and misses are counted per template
+(also inside the extraction workers, see `workers.ship_counters`) and
+served at /api/scraping/templates. A template whose hit rate drops has
+fallen behind a site redesign.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from lxml import etree
+
+from app.scraper.extraction import ParsedPage
+from app.scraper.links import css_to_xpath
+from app.scraper.stats import FetchStats
+from app.scraper.url_rules import host as url_host
+from app.scraper.workers import ship_counters
+
+log = logging.getLogger(__name__)
+
+META_DATE = ("//meta[@property='article:published_time']/@content", "//time/@datetime")
+META_IMAGE = ("//meta[@property='og:image']/@content",)
+
+
+@dataclass(frozen=True)
+class SiteTemplate:
+    host: str  # also matches its subdomains
+    title: tuple[str, ...]
+    body: tuple[str, ...]
+    date: tuple[str, ...] = META_DATE
+    image: tuple[str, ...] = META_IMAGE
+    min_paragraphs: int = 2
+    min_body_chars: int = 400
+
+
+# peru21.pe and trome.pe share the same publishing platform
+_STORY_CONTENTS = ("p.story-contents__font-paragraph", "div.story-contents__content p")
+
+TEMPLATES: dict[str, SiteTemplate] = {t.host: t for t in (
+    SiteTemplate("rpp.pe", title=("h1.article__title", "h1"),
+                 body=("div.article__body p", "div.body p", "div.cnt-txt p")),
+    SiteTemplate("latina.pe", title=("h1",),
+                 body=("div.article-body p", "div.nota__content p", "div.content-nota p")),
+    SiteTemplate("peru21.pe", title=("h1.sht__title", "h1"), body=_STORY_CONTENTS),
+    SiteTemplate("trome.pe", title=("h1.sht__title", "h1"), body=_STORY_CONTENTS),
+)}
+
+
+class TemplateResult(NamedTuple):
+    template: str
+    title: str
+    body: str
+    date: Optional[str]
+    image: Optional[str]
+
+
+class _Compiled(NamedTuple):
+    template: SiteTemplate
+    title: tuple[etree.XPath, ...]
+    body: tuple[etree.XPath, ...]
+    date: tuple[etree.XPath, ...]
+    image: tuple[etree.XPath, ...]
+
+
+def _xpath(selector: str) -> etree.XPath:
+    return etree.XPath(selector if selector.startswith(("/", "(")) else css_to_xpath(selector))
+
+
+@lru_cache(maxsize=None)
+def _compile(template: SiteTemplate) -> _Compiled:
+    return _Compiled(template, *(tuple(_xpath(s) for s in selectors) for selectors in
+                                 (template.title, template.body, template.date, template.image)))
+
+
+@lru_cache(maxsize=4096)
+def template_for(host: str) -> Optional[SiteTemplate]:
+    """Template of `host` or of the site it is a subdomain of."""
+    host = host.lower().split(":")[0]
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        template = TEMPLATES.get(".".join(parts[i:]))
+        if template is not None:
+            return template
+    return None
+
+
+def _text(match) -> str:
+    value = match if isinstance(match, str) else match.text_content()
+    return " ".join(value.split())
+
+
+def _first(xpaths, tree) -> Optional[str]:
+    for xpath in xpaths:
+        for match in xpath(tree):
+            value = _text(match)
+            if value:
+                return value
+    return None
+
+
+def _paragraphs(xpaths, tree) -> list[str]:
+    for xpath in xpaths:
+        paragraphs = [p for p in (_text(m) for m in xpath(tree)) if p]
+        if paragraphs:
+            return paragraphs
+    return []
+
+
+template_stats = FetchStats()
+ship_counters("templates", template_stats)
+
+
+def apply_template(url: str, page: ParsedPage) -> Optional[TemplateResult]:
+    """Fields of `page` read with its site's template (None: no template, miss or failed validation).
+
+    Must be called before `page.text()`, which hands the tree to trafilatura.
+    """
+    template = template_for(url_host(url))
+    if template is None or page.tree is None:
+        return None
+    try:
+        compiled = _compile(template)
+        title = _first(compiled.title, page.tree)
+        paragraphs = _paragraphs(compiled.body, page.tree)
+        body = "\n".join(paragraphs)
+        if title and len(paragraphs) >= template.min_paragraphs and len(body) >= template.min_body_chars:
+            template_stats.incr(f"{template.host}:hits")
+            return TemplateResult(template.host, title, body,
+                                  _first(compiled.date, page.tree), _first(compiled.image, page.tree))
+    except Exception as e:  # a broken selector must not break extraction
+        log.warning("Template %s failed on %s: %s", template.host, url, e)
+    template_stats.incr(f"{template.host}:misses")
+    return None
+
+
+def snapshot() -> list[dict]:
+    counts = template_stats.snapshot()
+    rows = []
+    for host in TEMPLATES:
+        hits, misses = counts.get(f"{host}:hits", 0), counts.get(f"{host}:misses", 0)
+        rows.append({"template": host, "hits": hits, "misses": misses,
+                     "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None})
+    return rows
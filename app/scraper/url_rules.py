@@ -0,0 +1,167 @@
+# app/scraper/url_rules.py
+"""Compiled article-URL classifier for listing links.
+
+`is_probable_article`, `_looks_like_article_url` and `_extract_links` used to
+run one `any(x in path for x in list)` scan per rule list and per anchor, and
+parsed the same URL several times. Here every rule class is a single regex
+alternation compiled at import (the `re` engine scans the string once for the
+whole list), per-site tables are plain data compiled on first use and cached
+per host, and URL parsing is memoised. The decisions are exactly those of the
+old heuristics; tests/test_scraper.py keeps the reference implementations and
+checks parity on a URL corpus.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+from urllib.parse import ParseResult, urljoin, urlparse
+
+from app.scraper.canonical import canonical_url
+
+# --- rule tables (data only) ---
+SECTION_SLUGS_GENERIC = frozenset({
+    "", "home", "inicio", "ultimas-noticias", "últimas-noticias", "portada", "principal",
+    "buscar", "videos", "audio", "podcast", "programas"
+})
+
+# path fragments accepted as article sections, per site (host without "www.")
+SITE_PATTERNS: dict[str, tuple[str, ...]] = {
+    "latina.pe": (
+        "/noticias/", "/tendencias/", "/espectaculos/", "/deportes/",
+        "/tecnologia/", "/farandula/", "/actualidad/", "/politica/",
+        "/entretenimiento/", "/series/", "/musica/",
+    ),
+    "rpp.pe": (
+        "/noticias/", "/politica/", "/deportes/", "/tecnologia/",
+        "/actualidad/", "/peru/", "/mundo/", "/economia/",
+    ),
+    "peru21.pe": (
+        "/noticias/", "/actualidad/", "/deportes/", "/politica/",
+        "/lima/", "/mundo/", "/espectaculos/", "/economia/",
+    ),
+    "trome.pe": (
+        "/noticias/", "/actualidad/", "/deportes/", "/espectaculos/",
+        "/tendencias/", "/virales/", "/futbol/",
+    ),
+}
+
+ARTICLE_KEYWORDS = (
+    "noticia", "noticias", "articulo", "artículo", "news", "story",
+    "reportaje", "informe", "actualidad", "tendencia", "deporte",
+    "politica", "espectaculo", "farandula", "tecnologia", "mundo",
+    "entretenimiento", "musica", "cine", "series", "deportes", "futbol",
+)
+
+LISTING_EXCLUDES = (
+    "politicas-de-privacidad", "terminos-y-condiciones", "contacto",
+    "nosotros", "about", "contact", "privacy", "terms", "pdf",
+    "document", ".pdf", ".doc", ".docx", "login", "register",
+    "facebook", "twitter", "instagram", "youtube", "whatsapp",
+    "auth", "user", "profile", "search", "tag", "category", "archivo",
+    "publicidad", "anuncio", "advertisement", "ads", "promocion",
+    "_files", "/pdf/", "/document/", "/static/", "/assets/",
+)
+DOCUMENT_EXCLUDES = (".pdf", ".doc", ".docx", "/pdf/", "/document/")
+
+GENERIC_EXCLUDES = (
+    "#", "mailto:", "javascript:", "/tag/", "/etiqueta/", "/categoria/",
+    "/category/", "/search", "/autor/", "/author/", "/seccion/", "/opinion/",
+)
+GENERIC_ARTICLE_RE = re.compile(r"/20\d{2}/|/noticia|/news|/articulo|/nota|/politica|/deportes|/economia")
+
+NON_ARTICLE_SLUGS = SECTION_SLUGS_GENERIC | {
+    "politicas-de-privacidad", "terminos-y-condiciones", "contacto",
+    "nosotros", "about", "contact", "privacy", "terms", "login",
+    "register", "auth", "user", "profile", "search", "tag", "category",
+}
+
+
+def substring_regex(patterns: Iterable[str]) -> re.Pattern:
+    """One regex that matches wherever any of `patterns` occurs as a substring."""
+    alternation = "|".join(re.escape(p) for p in sorted(set(patterns), key=lambda p: (-len(p), p)))
+    return re.compile(alternation or r"(?!)")
+
+
+_GENERIC_EXCLUDE_RE = substring_regex(GENERIC_EXCLUDES)
+_LISTING_EXCLUDE_RE = substring_regex(LISTING_EXCLUDES)
+_DOCUMENT_EXCLUDE_RE = substring_regex(DOCUMENT_EXCLUDES)
+_KEYWORD_RE = substring_regex(ARTICLE_KEYWORDS)
+
+
+@lru_cache(maxsize=None)
+def site_accept_regex(site_key: str) -> re.Pattern:
+    """Site patterns plus article keywords for `site_key`, compiled once per host."""
+    site = SITE_PATTERNS.get(site_key)
+    if not site:
+        return _KEYWORD_RE
+    return substring_regex(site + ARTICLE_KEYWORDS)
+
+
+@lru_cache(maxsize=65536)
+def split_url(url: str) -> ParseResult:
+    """Memoised `urlparse` (listings repeat the same anchors many times)."""
+    return urlparse(url)
+
+
+def host(url: str) -> str:
+    return split_url(url).netloc
+
+
+# --- classifiers ---
+def is_probable_article(href: str) -> bool:
+    """Generic scraper rule: no excluded fragment and a date / news-like path."""
+    if not href:
+        return False
+    href = href.lower()
+    if _GENERIC_EXCLUDE_RE.search(href):
+        return False
+    return GENERIC_ARTICLE_RE.search(href) is not None
+
+
+def looks_like_article_url(url: str) -> bool:
+    """Structural rule on the last path segment (used for ad-hoc URLs)."""
+    path = split_url(url).path.strip("/")
+    if not path:
+        return False
+    last_part = path.rsplit("/", 1)[-1]
+    if "." in last_part or last_part in NON_ARTICLE_SLUGS:
+        return False
+    return last_part.count("-") >= 2 or len(last_part) >= 15 or path.count("/") >= 2
+
+
+def is_listing_article(full_url: str, base_host: Optional[str] = None, same_domain_only: bool = True) -> bool:
+    """Rule used when scanning a listing page; `full_url` is already absolute."""
+    parts = split_url(full_url)
+    if parts.scheme not in ("http", "https"):
+        return False
+    if same_domain_only and parts.netloc and base_host and parts.netloc != base_host:
+        return False
+
+    path = parts.path.strip("/").lower()
+    if _LISTING_EXCLUDE_RE.search(path) or _DOCUMENT_EXCLUDE_RE.search(full_url.lower()):
+        return False
+    if site_accept_regex(parts.netloc.replace("www.", "")).search(path):
+        return True
+
+    last_part = path.rsplit("/", 1)[-1]
+    if last_part.count("-") >= 2 and len(last_part) >= 15:
+        return True
+    return path.count("/") >= 2 and len(last_part) >= 10
+
+
+def listing_article_links(list_url: str, hrefs: Iterable[str], same_domain_only: bool = True) -> list[str]:
+    """Canonical, de-duplicated article URLs among `hrefs` (document order)."""
+    base_host = host(list_url)
+    links: list[str] = []
+    seen: set[str] = set()
+    for href in hrefs:
+        if not href:
+            continue
+        full_url = urljoin(list_url, href)
+        if is_listing_article(full_url, base_host, same_domain_only):
+            url = canonical_url(full_url)
+            if url not in seen:
+                seen.add(url)
+                links.append(url)
+    return links
@@ -0,0 +1,172 @@
+# app/scraper/workers.py
+"""Process pool for CPU-bound article extraction.
+
+trafilatura and the HTML parsers hold the GIL, so extraction running in the
+API process (`asyncio.to_thread` in the routes, the scheduler's jobs) used
+one core and slowed every request while a wave was parsing. With
+EXTRACTION_WORKERS > 0, `extraction_pool.run(fn, url, html)` sends the page
+as UTF-8 bytes to a worker process, runs `fn(url, html)` there and returns
+its compact result (a small dict); the parsed tree never leaves the worker.
+Counters registered with `ship_counters` travel back with each result.
+Scrapers hand a whole batch to the pool (`BaseScraper.extract_many`), so
+throughput scales with the number of workers.
+
+`fn` must be a module-level function (it is pickled by reference). Workers
+are started with the "spawn" method: forking the multi-threaded API process
+could copy locks held by other threads. A page that times out
+(EXTRACTION_TIMEOUT_SECONDS) or crashes its worker counts as not extracted.
+A timed-out page may still be running, holding its worker forever, so the
+pool's processes are terminated and a new pool is started; the other pages
+that were in flight on it are submitted again, once. A crashed pool is
+replaced on the next call. If the workers cannot start at all, or
+EXTRACTION_WORKERS = 0, `fn` runs in the calling thread.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.scraper.stats import FetchStats, fetch_stats
+
+log = logging.getLogger(__name__)
+
+
+def _init_worker() -> None:
+    # spawned workers start without the API's logging configuration
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [extraction %(process)d] %(message)s")
+
+
+_shipped: dict[str, FetchStats] = {}
+
+
+def ship_counters(name: str, counters: FetchStats) -> None:
+    """Send what extractors count inside the workers back to `counters` in this process.
+
+    Modules register their counters at import time, so the registration
+    exists both in the workers and in the API process.
+    """
+    _shipped[name] = counters
+
+
+def _call(fn: Callable[[str, str], Any], url: str, body: bytes) -> tuple[Any, dict[str, dict[str, int]]]:
+    """Worker side: decode the page, run the extractor and collect the counters it touched."""
+    result = fn(url, body.decode("utf-8"))
+    deltas = {}
+    for name, counters in _shipped.items():
+        counts = counters.snapshot()
+        if counts:
+            counters.reset()
+            deltas[name] = counts
+    return result, deltas
+
+
+def _worker_processes(executor: ProcessPoolExecutor) -> list:
+    """The pool's worker processes, or [] where they cannot be reached.
+
+    `ProcessPoolExecutor` keeps them in the private `_processes`; on a Python
+    without it the pool is still replaced, only its busy worker is not killed.
+    """
+    processes = getattr(executor, "_processes", None)
+    if not isinstance(processes, dict):
+        return []
+    try:
+        return [p for p in list(processes.values()) if hasattr(p, "terminate")]
+    except RuntimeError:  # changed size while the pool's manager thread was updating it
+        return []
+
+
+def _merge(deltas: dict[str, dict[str, int]]) -> None:
+    for name, counts in deltas.items():
+        counters = _shipped.get(name)
+        if counters is not None:
+            for key, amount in counts.items():
+                counters.incr(key, amount)
+
+
+class ExtractionPool:
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.workers = workers if workers is not None else getattr(settings, "EXTRACTION_WORKERS", 2)
+        self.timeout = timeout if timeout is not None else getattr(settings, "EXTRACTION_TIMEOUT_SECONDS", 60)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._started = False  # a worker has returned at least one result
+        self._terminated = weakref.WeakSet()  # pools killed because of a timeout
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"),
+                                                     initializer=_init_worker)
+                log.info("Extraction pool started with %d worker processes", self.workers)
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, terminate: bool = False) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            if terminate:
+                self._terminated.add(executor)
+        # shutdown() does not stop a task that is already running
+        processes = _worker_processes(executor) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def run(self, fn: Callable[[str, str], Any], url: str, html: str) -> Any:
+        """`fn(url, html)` in a worker process (None if it timed out or the worker died)."""
+        if self.workers <= 0:
+            return fn(url, html)
+        body = html.encode("utf-8")
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_call, fn, url, body)
+            except (BrokenProcessPool, RuntimeError):
+                # pool broken by an earlier crash or shut down: start a new one
+                self._discard(executor)
+                executor = self._get_executor()
+                future = executor.submit(_call, fn, url, body)
+            try:
+                result, deltas = future.result(timeout=self.timeout)
+                self._started = True
+                _merge(deltas)
+                return result
+            except FutureTimeout:
+                # the worker is still busy with the page: kill the pool so it does not keep the slot
+                self._discard(executor, terminate=True)
+                fetch_stats.incr("extraction_timeouts")
+                log.warning("Extraction of %s took longer than %ss, skipped; restarting the pool", url, self.timeout)
+                return None
+            except (BrokenProcessPool, CancelledError):
+                if executor in self._terminated:
+                    # killed (or dropped from the queue) because another page timed out
+                    if attempt == 0:
+                        continue
+                    log.warning("Extraction of %s interrupted by two pool restarts, skipped", url)
+                    return None
+                self._discard(executor)
+                if not self._started:
+                    # workers never came up (e.g. a script without `if __name__ == "__main__"`)
+                    log.error("Extraction workers could not start; extracting in the calling thread")
+                    self.workers = 0
+                    return fn(url, html)
+                fetch_stats.incr("extraction_worker_crashes")
+                log.error("Extraction worker died while parsing %s; restarting the pool", url)
+                return None
+        return None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = ExtractionPool()
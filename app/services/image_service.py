@@ -1,12 +1,13 @@
-import os, pathlib, requests
+import os, pathlib
 from app.config import settings
+from app.scraper.sessions import get_session
 
 IMAGES_DIR = pathlib.Path("data/images")
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
 def download_image(url: str) -> str | None:
     try:
-        resp = requests.get(url, headers={"User-Agent": settings.USER_AGENT}, timeout=settings.REQUEST_TIMEOUT)
+        resp = get_session().get(url, headers={"User-Agent": settings.USER_AGENT}, timeout=settings.REQUEST_TIMEOUT)
         resp.raise_for_status()
         ext = ".jpg"
         filename = IMAGES_DIR / (os.urandom(8).hex() + ext)
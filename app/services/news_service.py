@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import Noticia, CambioNoticia
+from app.scraper.canonical import canonical_url
 from app.services.scraper_service import map_to_allowed_category
 
 
@@ -18,8 +19,11 @@ def upsert_noticia(db: Session, data: dict) -> Noticia:
         if not data.get(field):
             raise ValueError(f"El campo '{field}' es obligatorio para guardar una noticia.")
 
+    # La misma noticia puede llegar con www, barra final, utm_*, etc.
+    data = {**data, "url": canonical_url(data["url"])}
+
     try:
-        # Buscar noticia existente por URL
+        # Buscar noticia existente por URL canónica
         noticia = db.query(Noticia).filter_by(url=data["url"]).first()
 
         if not noticia:
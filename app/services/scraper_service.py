@@ -6,12 +6,15 @@ Consolida toda la lógica de scraping para evitar duplicación.
 from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse
 import logging
-import json
 import re
 
-import requests
-import trafilatura
-from bs4 import BeautifulSoup
+from app.scraper.charset import decode_body
+from app.scraper.extraction import ParsedPage, parse_article_page
+from app.scraper.extraction_cache import cached_extract
+from app.scraper.extractors import extractor
+from app.scraper.sessions import get_session
+from app.scraper.templates import apply_template
+from app.scraper.url_rules import SECTION_SLUGS_GENERIC
 
 logger = logging.getLogger("uvicorn")
 USER_AGENT = "NewsMonitor/1.0 (+https://example.local)"
@@ -53,10 +56,6 @@ CATEGORY_ALIASES = {
     "opinión": "Opinión",
 }
 
-SECTION_SLUGS_GENERIC = {
-    "", "home", "inicio", "ultimas-noticias", "últimas-noticias", "portada", "principal",
-    "buscar", "videos", "audio", "podcast", "programas"
-}
 
 
 def normalize_category(raw: str | None) -> str | None:
@@ -146,34 +145,18 @@ def infer_category_from_url(url: str) -> str | None:
     return normalize_category(cand)
 
 
-def extract_ld_json(soup: BeautifulSoup) -> list[dict]:
-    """Extrae items de LD+JSON del HTML."""
-    items = []
-    for script in soup.find_all("script", type=lambda t: t and "ld+json" in t):
-        try:
-            data = json.loads(script.string or "")
-            if isinstance(data, dict):
-                items.append(data)
-            elif isinstance(data, list):
-                items.extend([d for d in data if isinstance(d, dict)])
-        except Exception:
-            pass
-    return items
-
-
-def infer_category_from_meta(soup: BeautifulSoup) -> str | None:
+def infer_category_from_meta(page: ParsedPage) -> str | None:
     """Infiere categoría desde meta tags y LD+JSON."""
     # Meta tags
-    for meta in soup.find_all("meta"):
-        if meta.get("property") == "article:section" or meta.get("name") in ("section", "category"):
-            content = meta.get("content")
+    for prop, name, content in page.metas:
+        if prop == "article:section" or name in ("section", "category"):
             if content:
                 cat = normalize_category(content)
                 if cat:
                     return map_to_allowed_category(cat)
 
     # LD+JSON
-    for item in extract_ld_json(soup):
+    for item in page.ld_items:
         val = item.get("articleSection") or item.get("section")
         if isinstance(val, list) and val:
             cat = normalize_category(val[0])
@@ -185,9 +168,9 @@ def infer_category_from_meta(soup: BeautifulSoup) -> str | None:
                 return map_to_allowed_category(cat)
 
     # Keywords
-    keywords = soup.find("meta", attrs={"name": "keywords"})
-    if keywords and keywords.get("content"):
-        for token in re.split(r"[,;|/]+", keywords["content"]):
+    keywords = page.meta_name("keywords")
+    if keywords:
+        for token in re.split(r"[,;|/]+", keywords):
             cat = normalize_category(token)
             if cat in set(CATEGORY_ALIASES.values()):
                 return map_to_allowed_category(cat)
@@ -195,6 +178,47 @@ def infer_category_from_meta(soup: BeautifulSoup) -> str | None:
     return None
 
 
+@extractor("article")
+def extract_article(url: str, html: str) -> dict | None:
+    """Campos de un artículo ya descargado (se ejecuta en los procesos de extracción)."""
+    # Validar que es artículo: sondeo del <head> y el inicio del <body> antes
+    # del parseo completo; metadatos, LD+JSON y texto salen luego del mismo árbol
+    page = parse_article_page(html)
+    if page is None:
+        logger.warning(f"No parece artículo: {url}")
+        return None
+    meta = page.basic_meta()
+    meta["categoria"] = infer_category_from_meta(page)
+
+    categoria = meta.get("categoria") or infer_category_from_url(url)
+    categoria = normalize_category(categoria) if categoria else None
+    # Asegurar que la categoría final pertenezca a las permitidas
+    categoria = map_to_allowed_category(categoria)
+
+    # Plantilla del sitio (rpp.pe, latina.pe, ...) antes que trafilatura
+    plantilla = apply_template(url, page)
+    if plantilla:
+        meta.update(title=plantilla.title, date=plantilla.date or meta.get("date"),
+                    image=plantilla.image or meta.get("image"))
+        text = plantilla.body
+    else:
+        text = page.text()
+    if not text:
+        logger.warning(f"Sin contenido extraíble: {url}")
+        return None
+
+    titulo = meta.get("title") or page.title or url
+
+    logger.info(f"Extrayendo: {titulo[:50]}...")
+    return {
+        "titulo": titulo,
+        "contenido": text,
+        "fecha_publicacion": meta.get("date"),
+        "imagen_url": meta.get("image"),
+        "categoria": categoria,
+    }
+
+
 def scrape_article(url: str, html: str | None = None) -> dict | None:
     """
     Extrae información de un artículo.
@@ -204,113 +228,15 @@ def scrape_article(url: str, html: str | None = None) -> dict | None:
     """
     try:
         if html is None:
-            resp = requests.get(url, timeout=25, headers={"User-Agent": USER_AGENT})
+            resp = get_session().get(url, timeout=25, headers={"User-Agent": USER_AGENT})
             if not resp.ok:
                 logger.warning(f"Error {resp.status_code} en: {url}")
                 return None
-            html = resp.text
-
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # Extraer metadatos
-        meta = {}
-        og_type = soup.find("meta", property="og:type")
-        if og_type and og_type.get("content", "").lower() in ("article", "news", "newsarticle"):
-            meta["og_type"] = og_type.get("content")
-
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            meta["title"] = og_title["content"].strip()
-
-        og_img = soup.find("meta", property="og:image")
-        if og_img and og_img.get("content"):
-            meta["image"] = og_img["content"].strip()
-
-        pub = soup.find("meta", property="article:published_time") or soup.find("meta", attrs={"name": "pubdate"})
-        if pub and pub.get("content"):
-            meta["date"] = pub["content"].strip()
-
-        meta["categoria"] = infer_category_from_meta(soup)
-
-        # Validar que es artículo
-        ld_items = extract_ld_json(soup)
-        has_article_tag = soup.find("article") is not None
-        has_h1 = soup.find("h1") is not None
-        is_article = ("og_type" in meta or ld_items or (has_article_tag and has_h1))
-
-        if not is_article:
-            logger.warning(f"No parece artículo: {url}")
-            return None
-
-        categoria = meta.get("categoria") or infer_category_from_url(url)
-        categoria = normalize_category(categoria) if categoria else None
-        # Asegurar que la categoría final pertenezca a las permitidas
-        categoria = map_to_allowed_category(categoria)
-
-        # ===== INTENTO 1: JSON extraction =====
-        try:
-            data = trafilatura.extract(html, output="json", include_images=True)
-            
-            # Validación estricta: data debe ser string no vacío
-            if data and isinstance(data, str) and data.strip():
-                try:
-                    j = json.loads(data)
-                    titulo = j.get("title") or meta.get("title") or "Sin título"
-                    
-                    # Procesar imagen - puede ser string o lista
-                    imagen = j.get("image")
-                    if isinstance(imagen, list) and imagen:
-                        imagen = imagen[0]
-                    if not imagen and j.get("images"):
-                        images_list = j.get("images")
-                        if isinstance(images_list, list) and images_list:
-                            imagen = images_list[0]
-                    if not imagen:
-                        imagen = meta.get("image")
-                    if isinstance(imagen, list) and imagen:
-                        imagen = imagen[0]
-                    if isinstance(imagen, str):
-                        imagen = imagen.strip()
-                    
-                    logger.info(f"Extrayendo: {titulo[:50]}...")
-                    return {
-                        "titulo": titulo,
-                        "contenido": j.get("text"),
-                        "fecha_publicacion": j.get("date") or j.get("published") or meta.get("date"),
-                        "imagen_url": imagen,
-                        "categoria": categoria,
-                    }
-                except json.JSONDecodeError as e:
-                    logger.debug(f"JSON inválido, fallback a texto: {e}")
-            else:
-                logger.debug(f"trafilatura JSON vacío, fallback a texto")
-        except Exception as e:
-            logger.debug(f"Error en extracción JSON: {e}, fallback")
-
-        # ===== FALLBACK: Plain text extraction =====
-        text = trafilatura.extract(html)
-        if not text:
-            logger.warning(f"Sin contenido tras fallback: {url}")
-            return None
-
-        title_tag = soup.find("title")
-        titulo = meta.get("title") or (title_tag.get_text(strip=True) if title_tag else None) or url
-
-        # Procesar imagen de meta - puede ser string o lista
-        meta_image = meta.get("image")
-        if isinstance(meta_image, list) and meta_image:
-            meta_image = meta_image[0]
-        if isinstance(meta_image, str):
-            meta_image = meta_image.strip()
-
-        logger.info(f"Extrayendo: {titulo[:50]}...")
-        return {
-            "titulo": titulo,
-            "contenido": text,
-            "fecha_publicacion": meta.get("date"),
-            "imagen_url": meta_image,
-            "categoria": categoria,
-        }
+            html, _ = decode_body(url, resp.content, resp.headers.get("Content-Type"))
+
+        # Parseo y trafilatura en un proceso de extracción (solo vuelve el dict compacto);
+        # una visita repetida con el mismo HTML normalizado sale de la caché de extracción
+        return cached_extract(extract_article, url, html)
 
     except Exception as e:
         logger.error(f"Error extrayendo {url}: {e}")
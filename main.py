@@ -35,6 +35,10 @@ async def lifespan(app: FastAPI):
     # init_db() ya incluye create_default_user()
     init_db()
     check_database_status()  # Verificar estado de la DB
+
+    # Filtros de URLs ya guardadas por fuente (scraping incremental)
+    from app.scraper.seen import seen_urls
+    seen_urls.load()
     
     try:
         start_scheduler()
@@ -47,6 +51,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[ERROR] Error al detener scheduler: {e}")
 
+    # Procesos de extracción de artículos
+    from app.scraper.workers import extraction_pool
+    extraction_pool.shutdown()
+
 # --- FastAPI app ---
 app = FastAPI(
     title="NexNews Scraping System",
@@ -71,7 +79,7 @@ _ensure_dir(IMAGES_DIR)
 app.mount("/images", StaticFiles(directory=IMAGES_DIR), name="images")
 
 # --- Importar routers DESPUÉS de crear la app ---
-from app.routes import auth, news, web, categories, social_routes, payments, health, export, metrics, sources
+from app.routes import auth, news, web, categories, social_routes, payments, health, export, metrics, sources, scraping
 from app.database import get_db
 from sqlalchemy import desc
 
@@ -447,6 +455,7 @@ app.include_router(health.router, prefix="/api")
 app.include_router(news.router, prefix="/api")
 app.include_router(export.router, prefix="/api")
 app.include_router(metrics.router, prefix="/api")
+app.include_router(scraping.router, prefix="/api")
 app.include_router(social_routes.router)
 app.include_router(auth.router, prefix="/api/auth")
 
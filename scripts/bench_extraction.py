@@ -0,0 +1,258 @@
+# scripts/bench_extraction.py
+"""Benchmark de extracción de artículos (CPU por artículo).
+
+Compara la extracción anterior contra la de un solo parseo
+(app.scraper.extraction) en los dos caminos:
+
+  - scrape_article: antes dos árboles de BeautifulSoup, LD+JSON recorrido dos
+    veces y dos llamadas a trafilatura.extract,
+  - GenericScraper.parse_article: antes un árbol de BeautifulSoup para los
+    metadatos y otro de lxml dentro de trafilatura.
+
+Verifica además que ambas versiones devuelven lo mismo, y mide la plantilla
+de sitio (app.scraper.templates) contra trafilatura en las mismas notas
+servidas con el maquetado de rpp.pe, y el sondeo de parse_article_page
+contra el parseo completo en páginas de sección (que no son artículos).
+
+Uso:
+    python -m scripts.bench_extraction data/articulos/*.html
+    python -m scripts.bench_extraction --archive https://rpp.pe/politica/nota-123
+    python -m scripts.bench_extraction            # corpus sintético fijo de 20 artículos
+"""
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import trafilatura
+from bs4 import BeautifulSoup
+
+from app.scraper.extraction import parse_article_page, parse_page
+from app.scraper.extraction_cache import extraction_cache
+from app.scraper.generic import GenericScraper
+from app.scraper.templates import apply_template
+from app.scraper.workers import extraction_pool
+from app.services.scraper_service import (
+    CATEGORY_ALIASES, infer_category_from_url, map_to_allowed_category, normalize_category, scrape_article,
+)
+
+
+# --- extracción anterior (copia de referencia) ---
+def _ld_json(soup) -> list[dict]:
+    items = []
+    for script in soup.find_all("script", type=lambda t: t and "ld+json" in t):
+        try:
+            data = json.loads(script.string or "")
+            if isinstance(data, dict):
+                items.append(data)
+            elif isinstance(data, list):
+                items.extend([d for d in data if isinstance(d, dict)])
+        except Exception:
+            pass
+    return items
+
+
+def _categoria_meta(soup) -> str | None:
+    for meta in soup.find_all("meta"):
+        if meta.get("property") == "article:section" or meta.get("name") in ("section", "category"):
+            content = meta.get("content")
+            if content and normalize_category(content):
+                return map_to_allowed_category(normalize_category(content))
+    for item in _ld_json(soup):
+        val = item.get("articleSection") or item.get("section")
+        if isinstance(val, list) and val:
+            val = val[0]
+        if isinstance(val, str) and normalize_category(val):
+            return map_to_allowed_category(normalize_category(val))
+    keywords = soup.find("meta", attrs={"name": "keywords"})
+    if keywords and keywords.get("content"):
+        for token in re.split(r"[,;|/]+", keywords["content"]):
+            cat = normalize_category(token)
+            if cat in set(CATEGORY_ALIASES.values()):
+                return map_to_allowed_category(cat)
+    return None
+
+
+def _anterior(url: str, html: str) -> dict | None:
+    soup = BeautifulSoup(html, "html.parser")
+    meta = {}
+    og_type = soup.find("meta", property="og:type")
+    if og_type and og_type.get("content", "").lower() in ("article", "news", "newsarticle"):
+        meta["og_type"] = og_type.get("content")
+    og_title = soup.find("meta", property="og:title")
+    if og_title and og_title.get("content"):
+        meta["title"] = og_title["content"].strip()
+    og_img = soup.find("meta", property="og:image")
+    if og_img and og_img.get("content"):
+        meta["image"] = og_img["content"].strip()
+    pub = soup.find("meta", property="article:published_time") or soup.find("meta", attrs={"name": "pubdate"})
+    if pub and pub.get("content"):
+        meta["date"] = pub["content"].strip()
+    meta["categoria"] = _categoria_meta(soup)
+    ld_items = _ld_json(soup)
+    if not ("og_type" in meta or ld_items or (soup.find("article") is not None and soup.find("h1") is not None)):
+        return None
+    categoria = meta.get("categoria") or infer_category_from_url(url)
+    categoria = map_to_allowed_category(normalize_category(categoria) if categoria else None)
+    data = trafilatura.extract(html, output="json", include_images=True)
+    try:
+        json.loads(data or "")
+    except json.JSONDecodeError:
+        pass
+    text = trafilatura.extract(html)
+    if not text:
+        return None
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title")
+    titulo = meta.get("title") or (title_tag.get_text(strip=True) if title_tag else None) or url
+    return {"titulo": titulo, "contenido": text, "fecha_publicacion": meta.get("date"),
+            "imagen_url": meta.get("image"), "categoria": categoria}
+
+
+def _anterior_scraper(url: str, html: str) -> tuple | None:
+    soup = BeautifulSoup(html, "html.parser")
+
+    def meta(name: str):
+        og = soup.find("meta", property=f"og:{name}")
+        if og and og.get("content"):
+            return og["content"].strip()
+        nn = soup.find("meta", attrs={"name": name})
+        return nn["content"].strip() if nn and nn.get("content") else None
+
+    title = soup.title.string.strip() if soup.title and soup.title.string else None
+    title = meta("title") or title
+    dt = None
+    time_tag = soup.find("time")
+    if time_tag and time_tag.get("datetime"):
+        try:
+            dt = datetime.fromisoformat(time_tag["datetime"].replace("Z", "+00:00"))
+        except Exception:
+            dt = None
+    extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
+    if not extracted:
+        return None
+    return title or extracted.split("\n")[0][:180], extracted, dt, meta("image")
+
+
+_SCRAPER = GenericScraper("https://diario.pe/")
+
+
+def _scraper(url: str, html: str) -> tuple | None:
+    article = _SCRAPER.parse_article(url, html)
+    if article is None:
+        return None
+    return article.titulo, article.contenido, article.fecha_publicacion, article.imagen_url
+
+
+# --- corpus ---
+def _articulo_sintetico(i: int) -> str:
+    parrafos = "".join(
+        f"<p>Párrafo {j} de la nota {i}: el Congreso debatió hoy la propuesta presentada por el Ejecutivo, "
+        f"mientras los gremios regionales pidieron mayor participación en la mesa de diálogo.</p>"
+        for j in range(25)
+    )
+    enlaces = "".join(f'<li><a href="/politica/otra-nota-{k}">Otra nota {k}</a></li>' for k in range(60))
+    ld = json.dumps({"@context": "https://schema.org", "@type": "NewsArticle", "headline": f"Titular {i}",
+                     "datePublished": "2025-10-06T10:00:00-05:00", "articleSection": "Política"})
+    return (
+        f'<!doctype html><html lang="es"><head><meta charset="utf-8"><title>Titular {i} | Diario</title>'
+        f'<meta property="og:type" content="article"><meta property="og:title" content="Titular {i}">'
+        f'<meta property="og:image" content="https://diario.pe/img/{i}.jpg">'
+        f'<meta property="article:published_time" content="2025-10-06T10:00:00-05:00">'
+        f'<meta property="article:section" content="politica"><meta name="keywords" content="congreso, política">'
+        f'<script type="application/ld+json">{ld}</script><style>.nota {{ color: #222; }}</style></head>'
+        f'<body><header><nav><ul>{enlaces}</ul></nav></header><main><article class="nota"><h1>Titular {i}</h1>'
+        f'<time datetime="2025-10-06T15:00:00Z">6 de octubre</time>{parrafos}</article></main><aside><ul>{enlaces}</ul></aside><footer>Diario © 2025</footer></body></html>'
+    )
+
+
+def _seccion_sintetica(i: int) -> str:
+    notas = "".join(
+        f'<li class="nota"><a href="/politica/nota-{i}-{k}"><img src="/img/{k}.jpg" alt="">'
+        f'<h2>Titular de la nota {k}</h2><p>Resumen de la nota {k}: el Congreso debatió hoy la propuesta.</p></a></li>'
+        for k in range(800)
+    )
+    return (
+        f'<!doctype html><html lang="es"><head><meta charset="utf-8"><title>Política {i} | Diario</title>'
+        f'<meta property="og:type" content="website"></head><body><header><h1>Política</h1></header>'
+        f'<main><ul>{notas}</ul></main><footer>Diario © 2025</footer></body></html>'
+    )
+
+
+def _como_rpp(html: str) -> str:
+    return (html.replace("<h1>", '<h1 class="article__title">')
+                .replace('<article class="nota">', '<article class="nota"><div class="article__body">')
+                .replace("</article>", "</div></article>"))
+
+
+def _load_pages(args) -> list[tuple[str, str]]:
+    if args.archive:
+        from app.scraper.archive import html_archive
+        return [(url, html_archive.get_text(url)) for url in args.archive]
+    if args.files:
+        return [(str(p), Path(p).read_text(encoding="utf-8", errors="replace")) for p in args.files]
+    return [(f"https://diario.pe/politica/titular-{i}", _articulo_sintetico(i)) for i in range(20)]
+
+
+def _cpu(fn, pages, repeat: int) -> tuple[float, list]:
+    mejor, resultados = float("inf"), []
+    for _ in range(repeat):
+        start = time.process_time()
+        resultados = [fn(url, html) for url, html in pages]
+        mejor = min(mejor, time.process_time() - start)
+    return mejor * 1000 / len(pages), resultados
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="archivos HTML de artículos guardados")
+    parser.add_argument("--archive", nargs="+", metavar="URL", help="leer los artículos del archivo HTML")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    # CPU del propio proceso: la extracción se mide sin los procesos de extracción
+    # ni la caché de extracción (las repeticiones serían aciertos)
+    extraction_pool.workers = 0
+    extraction_cache.max_entries = 0
+
+    pages = [(url, html) for url, html in _load_pages(args) if html]
+    if not pages:
+        print("Sin páginas para medir.")
+        return 1
+    kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+    print(f"📄 {len(pages)} artículo(s), {kb:.0f} KB de media")
+
+    difieren = 0
+    for nombre, anterior, actual in (("scrape_article", _anterior, scrape_article),
+                                     ("parse_article", _anterior_scraper, _scraper)):
+        antes_ms, esperado = _cpu(anterior, pages, args.repeat)
+        ahora_ms, obtenido = _cpu(actual, pages, args.repeat)
+        distintos = [url for (url, _), a, b in zip(pages, esperado, obtenido) if a != b]
+        difieren += len(distintos)
+        print(f"   {nombre:<15} antes {antes_ms:7.1f} ms  ahora {ahora_ms:7.1f} ms CPU/artículo"
+              f"  x{antes_ms / ahora_ms:4.1f} (-{100 * (1 - ahora_ms / antes_ms):.0f}%)"
+              f"  {'✅ mismos resultados' if not distintos else f'❌ {len(distintos)} difieren'}")
+        for url in distintos:
+            print(f"      ❌ {url}")
+
+    if not (args.files or args.archive):
+        rpp = [(url.replace("diario.pe", "rpp.pe"), _como_rpp(html)) for url, html in pages]
+        plantilla_ms, aciertos = _cpu(lambda url, html: apply_template(url, parse_page(html)), rpp, args.repeat)
+        trafilatura_ms, _ = _cpu(lambda url, html: parse_page(html).text(), rpp, args.repeat)
+        print(f"   {'plantilla rpp':<15} trafilatura {trafilatura_ms:7.1f} ms  plantilla {plantilla_ms:7.1f} ms CPU/artículo"
+              f"  x{trafilatura_ms / plantilla_ms:4.1f}  ({sum(a is not None for a in aciertos)}/{len(rpp)} aciertos)")
+
+        secciones = [(f"https://diario.pe/politica/{i}", _seccion_sintetica(i)) for i in range(10)]
+        kb = sum(len(html) for _, html in secciones) / len(secciones) / 1024
+        completo_ms, _ = _cpu(lambda url, html: parse_page(html), secciones, args.repeat)
+        sondeo_ms, paginas = _cpu(lambda url, html: parse_article_page(html), secciones, args.repeat)
+        print(f"   {'sección ' + f'{kb:.0f} KB':<15} parseo {completo_ms:7.1f} ms  sondeo    {sondeo_ms:7.1f} ms CPU/página"
+              f"  x{completo_ms / sondeo_ms:4.1f}  ({sum(p is None for p in paginas)}/{len(secciones)} descartadas)")
+    return 0 if not difieren else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# scripts/bench_link_extractor.py
+"""Benchmark de extracción de enlaces en páginas de listado.
+
+Compara la implementación anterior (árbol completo de BeautifulSoup con
+html.parser) contra los extractores de app.scraper.links disponibles.
+
+Uso:
+    python -m scripts.bench_link_extractor data/listados/*.html
+    python -m scripts.bench_link_extractor --archive https://rpp.pe/ https://latina.pe/
+    python -m scripts.bench_link_extractor            # página sintética de ~500 KB
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.scraper.links import EXTRACTORS
+
+
+def _baseline(html: str) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    return [a["href"] for a in soup.find_all("a", href=True)]
+
+
+def _synthetic_page(target_kb: int = 500) -> str:
+    bloque = (
+        '<div class="story-item"><h2 class="news-title"><a href="/noticias/peru/nota-{i}-titulo-largo">'
+        'Titular de la nota {i}</a></h2><p>Resumen de la noticia {i} con algo de texto de relleno.</p>'
+        '<img src="/img/{i}.jpg" alt=""><span class="meta">Hace {i} minutos</span></div>\n'
+    )
+    partes, size, i = [], 0, 0
+    while size < target_kb * 1024:
+        parte = bloque.format(i=i)
+        partes.append(parte)
+        size += len(parte)
+        i += 1
+    return "<html><head><title>Portada</title></head><body>" + "".join(partes) + "</body></html>"
+
+
+def _load_pages(args) -> list[tuple[str, str]]:
+    if args.archive:
+        from app.scraper.archive import html_archive
+        return [(url, html_archive.get_text(url)) for url in args.archive]
+    if args.files:
+        return [(str(p), Path(p).read_text(encoding="utf-8", errors="replace")) for p in args.files]
+    return [("sintética", _synthetic_page())]
+
+
+def _time(fn, html: str, repeat: int) -> tuple[float, list[str]]:
+    tiempos = []
+    result: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(html)
+        tiempos.append(time.perf_counter() - start)
+    return statistics.median(tiempos) * 1000, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="archivos HTML de listados guardados")
+    parser.add_argument("--archive", nargs="+", metavar="URL", help="leer los listados del archivo HTML")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for nombre, html in _load_pages(args):
+        print(f"\n📄 {nombre} ({len(html) / 1024:.0f} KB)")
+        base_ms, esperado = _time(_baseline, html, args.repeat)
+        print(f"   {'actual (bs4 completo)':<24} {base_ms:8.1f} ms  {len(esperado):5d} enlaces")
+        for key, cls in EXTRACTORS.items():
+            ms, hrefs = _time(cls().hrefs, html, args.repeat)
+            iguales = hrefs == esperado
+            ok &= iguales
+            print(f"   {key:<24} {ms:8.1f} ms  {len(hrefs):5d} enlaces  x{base_ms / ms:5.1f}"
+                  f"  {'✅' if iguales else '❌ difiere'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Script para unificar noticias duplicadas por URL canónica.
+
+Antes de la canonicalización, la misma noticia podía guardarse varias veces
+(con y sin www, con barra final, con utm_*/fbclid o #fragmento). Este script
+agrupa las filas de `noticias` por `canonical_url(url)` y en cada grupo:
+
+  - conserva la fila más antigua (su id no cambia) y le asigna la URL canónica,
+  - completa sus campos vacíos y toma título/contenido de la copia actualizada más recientemente,
+  - mueve el historial de cambios (`cambios_noticia`) de las copias a la fila conservada,
+  - elimina las copias.
+
+Uso:
+  python -m scripts.merge_duplicate_urls [--dry-run] [--yes]
+"""
+from __future__ import annotations
+import argparse
+from collections import defaultdict
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models import CambioNoticia, Noticia
+from app.scraper.canonical import canonical_url
+
+CAMPOS_COMPLETABLES = ["fecha_publicacion", "imagen_path", "categoria"]
+
+
+def _grupos(session) -> dict[str, list[int]]:
+    grupos: dict[str, list[tuple[int, str]]] = defaultdict(list)
+    for noticia_id, url in session.query(Noticia.id, Noticia.url).yield_per(5000):
+        grupos[canonical_url(url)].append((noticia_id, url))
+    # solo grupos con copias o cuya única URL no es la canónica
+    return {
+        canon: sorted(i for i, _ in filas)
+        for canon, filas in grupos.items()
+        if len(filas) > 1 or filas[0][1] != canon
+    }
+
+
+def _unificar(session, canon: str, ids: list[int]) -> int:
+    filas = session.query(Noticia).filter(Noticia.id.in_(ids)).order_by(Noticia.id).all()
+    conservada, copias = filas[0], filas[1:]
+
+    mas_reciente = max(filas, key=lambda n: n.updated_at or n.created_at or datetime.min)
+    if mas_reciente is not conservada:
+        conservada.titulo = mas_reciente.titulo
+        conservada.contenido = mas_reciente.contenido
+    for campo in CAMPOS_COMPLETABLES:
+        if getattr(conservada, campo) is None:
+            valor = next((getattr(c, campo) for c in copias if getattr(c, campo) is not None), None)
+            setattr(conservada, campo, valor)
+    conservada.updated_at = mas_reciente.updated_at or conservada.updated_at
+
+    if copias:
+        copia_ids = [c.id for c in copias]
+        session.query(CambioNoticia).filter(CambioNoticia.noticia_id.in_(copia_ids)) \
+            .update({CambioNoticia.noticia_id: conservada.id}, synchronize_session=False)
+        for copia in copias:
+            session.delete(copia)
+        # borrar antes de renombrar: la URL canónica puede ser la de una copia (índice único)
+        session.flush()
+    conservada.url = canon
+    return len(copias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unificar noticias duplicadas por URL canónica")
+    parser.add_argument("--dry-run", action="store_true", help="Solo mostrar el resumen, sin modificar nada")
+    parser.add_argument("--yes", action="store_true", help="No pedir confirmación")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        grupos = _grupos(session)
+        duplicadas = sum(len(ids) - 1 for ids in grupos.values())
+        renombrar = sum(1 for ids in grupos.values() if len(ids) == 1)
+        print(f"Grupos a procesar: {len(grupos)} ({duplicadas} copias a eliminar, {renombrar} URLs a normalizar)")
+        for canon, ids in list(grupos.items())[:20]:
+            if len(ids) > 1:
+                print(f"  - {canon}: ids {ids}")
+
+        if not grupos or args.dry_run:
+            print("Nada que hacer." if not grupos else "Modo --dry-run: no se modificó nada.")
+            return
+
+        if not args.yes:
+            confirm = input(f"\nConfirmas unificar {len(grupos)} grupo(s)? (s/N): ")
+            if confirm.strip().lower() != 's':
+                print("Operación cancelada.")
+                return
+
+        eliminadas = 0
+        for n, (canon, ids) in enumerate(grupos.items(), 1):
+            eliminadas += _unificar(session, canon, ids)
+            if n % 500 == 0:
+                session.commit()
+        session.commit()
+        print(f"✅ {len(grupos)} grupo(s) unificados, {eliminadas} noticia(s) duplicada(s) eliminada(s).")
+    except Exception as e:
+        session.rollback()
+        print(f"[❌ ERROR] No se pudieron unificar las noticias: {e}")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,789 @@
+import io
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urljoin, urlparse
+
+import pytest
+import requests
+
+from app.scraper import base, breaker, http_cache
+from app.scraper.base import NOT_MODIFIED, BaseScraper
+from app.scraper.canonical import canonical_article_url, canonical_url
+from app.scraper.charset import decode_body
+from app.scraper.concurrency import HostConcurrencyController
+from app.scraper import frontier as frontier_mod
+from app.scraper import extraction
+from app.scraper.extraction import parse_article_page, parse_page
+from app.scraper.extraction_cache import ExtractionCache, normalized_html_hash
+from app.scraper import extractors, registry
+from app.scraper.feeds import parse_feed
+from app.scraper.fingerprint import listing_fingerprint
+from app.scraper.link_yield import LinkYields, path_pattern
+from app.scraper.links import EXTRACTORS, SoupLinkExtractor
+from app.scraper.ratelimit import HostRateLimiter, TokenBucket
+from app.scraper.retry_queue import RetryQueue
+from app.scraper.seen import BloomFilter
+from app.scraper.singleflight import SingleFlight
+from app.scraper import templates
+from app.scraper.workers import ExtractionPool
+from app.scraper import url_rules
+from app.scraper.rpp import extract_rpp_fields
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+
+def test_rate_limiter_is_per_host():
+    limiter = HostRateLimiter(default_interval=0.2, default_burst=1)
+    start = time.monotonic()
+    limiter.acquire("https://a.example/1")
+    limiter.acquire("https://b.example/1")
+    assert time.monotonic() - start < 0.1
+    limiter.configure("b.example", interval=0)
+    assert limiter.acquire("https://b.example/2") == 0
+
+
+def test_decode_body_prefers_header_then_meta_then_host_cache():
+    latin = "<html><head><meta http-equiv='Content-Type' content='text/html; charset=iso-8859-1'>ñandú".encode("latin-1")
+    text, enc = decode_body("https://diario.example/a", latin, "text/html")
+    assert enc == "cp1252" and text.endswith("ñandú")
+
+    text, enc = decode_body("https://diario.example/b", "ñandú".encode("latin-1"), "text/html")
+    assert enc == "cp1252" and text == "ñandú"
+
+    text, enc = decode_body("https://otro.example/c", "ñandú".encode("utf-8"), "text/html; charset=UTF-8")
+    assert enc == "utf-8" and text == "ñandú"
+
+
+def test_decode_body_honours_utf8_and_utf16_boms_before_the_header():
+    import codecs
+    html = "<html><meta charset='iso-8859-1'>ñandú"
+    for bom, codec in ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16-le"),
+                       (codecs.BOM_UTF16_BE, "utf-16-be")):
+        body = bom + html.encode(codec)
+        text, enc = decode_body("https://bom.example/a", body, "text/html; charset=iso-8859-1")
+        assert text == html
+        # the returned encoding decodes the stored body (BOM included) the same way
+        assert body.decode(enc) == html
+
+
+def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    monkeypatch.setattr(breaker.CircuitBreakers, "_load", lambda self, host: breaker._HostState(self.window))
+    monkeypatch.setattr(breaker.CircuitBreakers, "_save", lambda self, host, st: None)
+    cb = breaker.CircuitBreakers()
+    cb.failure_threshold, cb.open_seconds = 3, 0.05
+    url = "https://caido.example/nota"
+    for _ in range(3):
+        assert cb.allow(url)
+        cb.record_failure(url, "HTTP 503")
+    assert cb.is_open(url) and not cb.allow(url)
+
+    time.sleep(0.06)
+    assert cb.allow(url)  # single half-open trial
+    assert not cb.allow(url)
+    cb.record_success(url)
+    assert cb.status(url)["state"] == breaker.CLOSED
+
+
+
+def test_half_open_trial_ending_without_an_answer_does_not_block_the_host(monkeypatch):
+    from app.scraper.base import BaseScraper
+    monkeypatch.setattr(breaker.CircuitBreakers, "_load", lambda self, host: breaker._HostState(self.window))
+    monkeypatch.setattr(breaker.CircuitBreakers, "_save", lambda self, host, st: None)
+    cb = breaker.CircuitBreakers()
+    cb.failure_threshold, cb.open_seconds = 1, 0
+    monkeypatch.setattr("app.scraper.base.circuit_breakers", cb)
+    url = "https://caido.example/nota"
+    cb.record_failure(url, "HTTP 503")
+
+    class Redirecting:
+        def get(self, *args, **kwargs):
+            raise requests.TooManyRedirects("Exceeded 30 redirects.")
+
+    scraper = BaseScraper(session=Redirecting())
+    for _ in range(2):  # the first trial ends without an answer; the next one is still let through
+        with pytest.raises(requests.TooManyRedirects):
+            scraper._fetch(url, conditional=False)
+    assert cb.status(url)["state"] == breaker.HALF_OPEN
+
+
+def test_adaptive_concurrency_grows_and_backs_off():
+    ctl = HostConcurrencyController(initial=2, maximum=6, adaptive=True)
+    url = "https://cdn.example/nota"
+    for _ in range(100):
+        ctl.record(url, 0.05)
+    assert ctl.snapshot()[0]["limit"] == 6
+
+    ctl.record_overload("cdn.example", retry_after=0.2)
+    state = ctl.snapshot()[0]
+    assert state["limit"] == 3 and state["blocked_for_s"] > 0
+    start = time.monotonic()
+    with ctl.slot(url):
+        assert time.monotonic() - start >= 0.15
+
+
+def test_single_flight_shares_one_call():
+    group = SingleFlight("test")
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "html"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(group.do("k", work))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["html"] * 5 and len(calls) == 1
+    assert group.in_flight() == 0
+
+
+def test_retry_queue_backs_off_then_dead_letters(monkeypatch):
+    class Listado:
+        listado_url = "https://diario.example/"
+
+        def process_urls(self, urls):
+            return []
+
+    dead = []
+    monkeypatch.setattr(RetryQueue, "_dead_letter", lambda self, url, attempts, error, listado: dead.append(url))
+    queue = RetryQueue()
+    queue.max_retries, queue.base_delay = 2, 0.01
+    url = "https://diario.example/nota"
+
+    resp = requests.Response()
+    resp.status_code, resp.headers["Retry-After"] = 503, "0"
+    assert queue.schedule(url, requests.HTTPError(response=resp), scraper=Listado())
+    assert queue.attempts(url) == 1 and [i.url for i in queue.pop_due()] == [url]
+
+    assert queue.schedule(url, requests.Timeout(), scraper=Listado())
+    time.sleep(0.05)
+    assert queue.pop_due()[0].attempts == 2
+    assert not queue.schedule(url, requests.Timeout(), scraper=Listado())
+    assert dead == [url] and queue.attempts(url) == 0
+
+    resp.status_code = 404
+    assert not queue.schedule(url, requests.HTTPError(response=resp), scraper=Listado())
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://diario.example/noticia/{i}" for i in range(1000)]
+    for url in urls:
+        bloom.add(url)
+    assert all(url in bloom for url in urls)
+    false_positives = sum(f"https://diario.example/otra/{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_parse_feed_reads_rss_and_news_sitemaps():
+    rss = """<?xml version="1.0" encoding="UTF-8"?>
+    <rss xmlns:media="http://search.yahoo.com/mrss/"><channel><item>
+      <title>Titular</title><link>https://diario.example/noticia/1</link>
+      <pubDate>Mon, 06 Oct 2025 10:00:00 GMT</pubDate>
+      <media:content url="https://diario.example/1.jpg" medium="image"/>
+    </item></channel></rss>"""
+    kind, entries, _ = parse_feed(rss)
+    assert kind == "rss" and entries[0].titulo == "Titular"
+    assert entries[0].imagen_url == "https://diario.example/1.jpg" and entries[0].fecha.year == 2025
+
+    sitemap = """<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+      xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+      <url><loc>https://diario.example/a</loc><news:news><news:title>A</news:title>
+        <news:publication_date>2025-10-05T08:00:00Z</news:publication_date></news:news></url>
+      <url><loc>https://diario.example/b</loc><news:news><news:title>B</news:title>
+        <news:publication_date>2025-10-06T08:00:00Z</news:publication_date></news:news></url>
+    </urlset>"""
+    kind, entries, _ = parse_feed(sitemap)
+    assert kind == "sitemap" and [e.titulo for e in entries] == ["B", "A"]
+
+
+def test_section_listing_keeps_only_its_entries_of_a_site_wide_feed():
+    from app.scraper.feeds import discover
+
+    def rss(*paths):
+        items = "".join(f"<item><title>{p}</title><link>https://diario.example{p}</link></item>" for p in paths)
+        return f"<rss><channel>{items}</channel></rss>"
+
+    class Site:
+        pages = {
+            "https://diario.example/deportes": '<link rel="alternate" type="application/rss+xml" href="/feed">',
+            "https://diario.example/feed": rss("/deportes/gol-1", "/politica/ley-2", "/deportes/gol-3"),
+            "https://diario.example/cultura": '<link rel="alternate" type="application/rss+xml" href="/feed">',
+        }
+
+        def fetch(self, url, conditional=True, content_types=None):
+            if url not in self.pages:
+                raise requests.HTTPError(f"404 {url}")
+            return self.pages[url]
+
+    feed_url, kind, entries = discover(Site(), "https://diario.example/deportes")
+    assert (feed_url, kind) == ("https://diario.example/feed", "rss")
+    assert [e.url for e in entries] == ["https://diario.example/deportes/gol-1", "https://diario.example/deportes/gol-3"]
+    # nothing of the section in the site-wide feed: back to the HTML listing
+    assert discover(Site(), "https://diario.example/cultura") is None
+
+
+def test_link_extractors_match_beautifulsoup():
+    html = """<html><body>
+      <div class="story-item"><a href="/otra/noticia_1">1</a></div>
+      <a href="/noticias/noticia_2">2</a><a name="sin-href">x</a>
+      <h2 class="news-title destacada"><a href="/x/noticia_3?utm=1">3</a></h2>
+    </body></html>"""
+    selectors = ["a[href*='/noticias/']", ".news-title a", ".story-item a"]
+    expected = SoupLinkExtractor()
+    for cls in EXTRACTORS.values():
+        extractor = cls()
+        assert extractor.hrefs(html) == expected.hrefs(html)
+        assert extractor.select_hrefs(html, selectors) == expected.select_hrefs(html, selectors)
+
+
+# reference copies of the pre-compilation heuristics (routes/web.py, scraper/generic.py)
+def _old_is_probable_article(href):
+    if not href:
+        return False
+    href = href.lower()
+    bad = ["#", "mailto:", "javascript:", "/tag/", "/etiqueta/", "/categoria/",
+           "/category/", "/search", "/autor/", "/author/", "/seccion/", "/opinion/"]
+    if any(x in href for x in bad):
+        return False
+    return bool(re.search(r"/20\d{2}/|/noticia|/news|/articulo|/nota|/politica|/deportes|/economia", href))
+
+
+def _old_looks_like_article_url(u):
+    path = urlparse(u).path.strip("/")
+    if not path:
+        return False
+    last_part = path.split("/")[-1]
+    if "." in last_part or last_part in url_rules.NON_ARTICLE_SLUGS:
+        return False
+    return last_part.count("-") >= 2 or len(last_part) >= 15 or path.count("/") >= 2
+
+
+def _old_extract_links(list_url, hrefs, same_domain_only=True):
+    links, base_host = [], urlparse(list_url).netloc
+    for href in hrefs:
+        if not href:
+            continue
+        full_url = urljoin(list_url, href)
+        parsed = urlparse(full_url)
+        if parsed.scheme not in ("http", "https"):
+            continue
+        if same_domain_only and parsed.netloc and base_host and parsed.netloc != base_host:
+            continue
+        path = parsed.path.strip("/").lower()
+        if any(x in path for x in url_rules.LISTING_EXCLUDES):
+            continue
+        if any(x in full_url.lower() for x in url_rules.DOCUMENT_EXCLUDES):
+            continue
+        site_key = parsed.netloc.replace("www.", "")
+        if site_key in url_rules.SITE_PATTERNS and any(p in path for p in url_rules.SITE_PATTERNS[site_key]):
+            links.append(full_url)
+            continue
+        if any(k in path for k in url_rules.ARTICLE_KEYWORDS):
+            links.append(full_url)
+            continue
+        last_part = path.split("/")[-1] if "/" in path else path
+        if last_part.count("-") >= 2 and len(last_part) >= 15:
+            links.append(full_url)
+            continue
+        if path.count("/") >= 2 and len(last_part) >= 10:
+            links.append(full_url)
+    return list(dict.fromkeys(canonical_url(u) for u in links))
+
+
+def test_url_rules_match_previous_heuristics():
+    paths = [
+        "", "/", "#top", "mailto:a@b.pe", "javascript:void(0)", "/home", "/videos/", "/ultimas-noticias",
+        "/noticias/peru/nota-sobre-algo", "/politica/congreso-aprueba-ley-123", "/tag/congreso",
+        "/2025/10/06/un-titulo-largo", "/archivo/2024/", "/Deportes/Futbol/Resultado-Del-Partido",
+        "/peru/lima-hoy", "/mundo", "/static/app.js", "/docs/informe.PDF", "/a/b/abcdefghij",
+        "/a/b/abc", "/ultimo-minuto-de-hoy", "/seccion/opinion/columna-semanal", "/autor/juan",
+        "/noticia;amp", "/nota/123?ref=home", "/tendencias/viral-del-dia", "/user/perfil",
+        "//otro.example/noticias/x-y-z", "https://www.rpp.pe/peru/actualidad-hoy",
+        "http://latina.pe/series/al-fondo-hay-sitio", "ftp://rpp.pe/noticias/a-b-c",
+        "/virales/video-del-perro-que-baila", "/lima/obras.html", "/economia/dolar-hoy?x=/pdf/",
+    ]
+    for base in ("https://rpp.pe/", "https://www.rpp.pe/", "https://latina.pe/noticias",
+                 "https://trome.pe/", "https://peru21.pe/", "https://diario.example/seccion/"):
+        for same_domain_only in (True, False):
+            assert url_rules.listing_article_links(base, paths, same_domain_only) == \
+                _old_extract_links(base, paths, same_domain_only)
+        for path in paths:
+            url = urljoin(base, path)
+            assert url_rules.is_probable_article(url) == _old_is_probable_article(url), url
+            assert url_rules.looks_like_article_url(url) == _old_looks_like_article_url(url), url
+
+
+def test_link_yields_skip_low_yield_patterns(monkeypatch):
+    assert path_pattern("https://rpp.pe/politica/congreso/ley-de-presupuesto-2025-noticia-1234567") == \
+        "/politica/congreso/{slug}"
+    assert path_pattern("https://diario.example/2025/10/06/nota.html") == "/{n}/{n}/{n}/nota.html"
+    yields = LinkYields()
+    monkeypatch.setattr(yields, "_load", lambda: setattr(yields, "_loaded", True))
+    yields.min_samples, yields.skip_below, yields.explore_every = 5, 0.2, 3
+    for i in range(6):
+        yields.record(f"https://diario.example/galeria/fotos-del-dia-{i}", False)
+        yields.record(f"https://diario.example/noticias/titulo-de-nota-{i}", True)
+    urls = [f"https://diario.example/galeria/fotos-de-hoy-{i}" for i in range(6)] + \
+        ["https://diario.example/noticias/otra-nota-nueva"]
+    selected = yields.select(urls)
+    assert selected[-1] == "https://diario.example/noticias/otra-nota-nueva"
+    assert len(selected) == 3  # 1 in 3 low-yield links is still explored
+    assert yields.score(urls[-1]) > yields.score(urls[0])
+
+
+def test_canonical_url_merges_variants():
+    variants = [
+        "https://www.Diario.example/noticias/nota-1/",
+        "https://diario.example/noticias/nota-1?utm_source=fb&utm_medium=social#comentarios",
+        "https://diario.example:443/noticias//nota-1?fbclid=abc",
+    ]
+    assert {canonical_url(u) for u in variants} == {"https://diario.example/noticias/nota-1"}
+    assert canonical_url("https://diario.example/buscar?q=a&utm_campaign=x&page=2") == \
+        "https://diario.example/buscar?q=a&page=2"
+    assert canonical_url("https://diario.example/") == "https://diario.example/"
+    html = '<html><head><link href="/noticias/nota-1" rel="canonical"></head><body></body></html>'
+    assert canonical_article_url("https://diario.example/amp/noticias/nota-1", html) == \
+        "https://diario.example/noticias/nota-1"
+    otro = '<head><link rel="canonical" href="https://otro.example/nota-1"></head>'
+    assert canonical_article_url("https://diario.example/nota-1", otro) == "https://diario.example/nota-1"
+
+
+def test_frontier_ranks_fresh_links_and_follows_pagination(monkeypatch):
+    from datetime import datetime
+    monkeypatch.setattr(frontier_mod.seen_urls, "select", lambda urls, record_stats=True: urls)
+    monkeypatch.setattr(frontier_mod.link_yields, "score", lambda url: 0.5)
+    frontier = frontier_mod.Frontier("https://diario.example/noticias", max_depth=1, max_pages=3,
+                                     now=datetime(2025, 10, 6))
+    html = '<link rel="next" href="/noticias?page=2">'
+    hrefs = ["/noticias/2024/01/02/nota-vieja", "/otra/cosa", "/noticias/2025/10/05/nota-de-ayer",
+             "/noticias/page/3", "/noticias/peru"]
+    found = frontier.add_links("https://diario.example/noticias", html, hrefs, 0,
+                               lambda url: "/20" in url)
+    assert len(found) == 2
+    assert frontier.ranked()[0] == "https://diario.example/noticias/2025/10/05/nota-de-ayer"
+    pages = [frontier.next_page(), frontier.next_page(), frontier.next_page()]
+    assert pages[0] == ("https://diario.example/noticias?page=2", 1)
+    assert pages[1] == ("https://diario.example/noticias/page/3", 1)
+    assert pages[2] is None  # FRONTIER_MAX_PAGES reached (the listing counts)
+
+
+def test_budget_leftovers_of_a_feed_source_come_back_next_wave(monkeypatch):
+    from app.scraper import generic
+    from app.scraper.feeds import FeedEntry
+    invalidated = []
+    monkeypatch.setattr(frontier_mod.http_cache, "invalidate", invalidated.append)
+    monkeypatch.setattr(frontier_mod, "invalidate_feed", lambda listado: invalidated.append(f"feed:{listado}"))
+    monkeypatch.setattr(frontier_mod.fingerprint, "forget", lambda listado: None)
+    monkeypatch.setattr(frontier_mod, "wave_budget", lambda: 2)
+    listado = "https://diario.example/noticias"
+    urls = [f"https://diario.example/noticias/nota-{i}" for i in range(4)]
+
+    assert frontier_mod.take_budget(listado, urls) == (urls[:2], 2)
+    # the feed must be downloaded again, not answered with a 304
+    assert invalidated == [listado, f"feed:{listado}"]
+    entries = [FeedEntry(urls[3]), FeedEntry("https://diario.example/noticias/nota-nueva")]
+    monkeypatch.setattr(base, "feed_listing", lambda scraper, url: ("rss", entries))
+    assert generic.GenericScraper(listado).parse_listing() == [urls[3], entries[1].url, urls[2]]
+    assert frontier_mod.take_deferred(listado) == []
+
+
+def test_failed_articles_of_a_feed_source_invalidate_the_feed(monkeypatch):
+    from app.scraper.generic import GenericScraper
+    from app.scraper.rpp import RPPScraper
+    invalidated = []
+    monkeypatch.setattr(base.http_cache, "invalidate", invalidated.append)
+    monkeypatch.setattr(base, "invalidate_feed", lambda listado: invalidated.append(f"feed:{listado}"))
+    monkeypatch.setattr(base.fingerprint, "forget", lambda listado: None)
+    monkeypatch.setattr(base.link_yields, "flush", lambda: None)
+    monkeypatch.setattr(base, "get_db", lambda: iter([type("Db", (), {"close": lambda self: None})()]))
+
+    # one pipeline for every scraper (BaseScraper.process_urls)
+    for scraper_cls, listado in ((GenericScraper, "https://diario.example/noticias"),
+                                 (RPPScraper, "https://rpp.pe/politica")):
+        invalidated.clear()
+        scraper = scraper_cls(listado)
+        monkeypatch.setattr(scraper, "fetch_many", lambda urls: {url: None for url in urls})
+        assert scraper.process_urls([f"{listado}/nota-1"]) == []
+        assert invalidated == [f"{listado}/nota-1", listado, f"feed:{listado}"]
+
+
+def test_listing_fingerprint_ignores_order_and_duplicates():
+    a = ["https://diario.example/n/1", "https://diario.example/n/2"]
+    assert listing_fingerprint(a) == listing_fingerprint(list(reversed(a)) + a[:1])
+    assert listing_fingerprint(a) != listing_fingerprint(a + ["https://diario.example/n/3"])
+
+
+def test_parse_page_reads_metadata_before_extracting_text():
+    body = "<p>" + "Texto de la nota con contenido suficiente para extraer. " * 20 + "</p>"
+    page = parse_page(
+        '<html><head><title> Nota | Diario </title><meta property="og:type" content="article">'
+        '<meta property="article:published_time"><meta name="pubdate" content="2025-01-01">'
+        '<meta property="og:title" content=" Nota ">'
+        '<script type="application/ld+json">[{"@type": "NewsArticle"}, 3]</script></head>'
+        f'<body><article><h1>Nota</h1>{body}</article></body></html>'
+    )
+    # like soup.find(): the first published_time tag wins even without content
+    assert page.basic_meta() == {"og_type": "article", "title": "Nota"}
+    assert page.ld_items == [{"@type": "NewsArticle"}] and page.title == "Nota | Diario"
+    assert page.has_article and page.has_h1
+    assert "Texto de la nota" in page.text() and page.tree is None
+
+
+def test_extraction_pool_returns_the_same_fields_as_inline():
+    body = "<p>" + "Texto de la nota con contenido suficiente para extraer. " * 20 + "</p>"
+    html = (f'<html><head><meta property="og:image" content="https://rpp.pe/i.jpg"></head><body><article>'
+            f'<h1> Título ñandú </h1><time datetime="2025-10-06T10:00:00Z"></time>{body}</article></body></html>')
+    pool = ExtractionPool(workers=1, timeout=60)
+    try:
+        fields = pool.run(extract_rpp_fields, "https://rpp.pe/nota", html)
+        assert pool.workers == 1  # ran in the worker, no fallback to the calling thread
+    finally:
+        pool.shutdown()
+    assert fields == ExtractionPool(workers=0).run(extract_rpp_fields, "https://rpp.pe/nota", html)
+    assert fields["titulo"] == "Título ñandú" and fields["fecha_publicacion"].year == 2025
+
+
+def _sleeping_extractor(url: str, html: str) -> dict:
+    time.sleep(float(html))
+    return {"titulo": url}
+
+
+def test_extraction_pool_restarts_after_a_timeout():
+    pool = ExtractionPool(workers=1, timeout=60)
+    try:
+        assert pool.run(_sleeping_extractor, "calentar", "0") == {"titulo": "calentar"}
+        pool.timeout = 0.5
+        start = time.monotonic()
+        assert pool.run(_sleeping_extractor, "colgada", "60") is None
+        assert time.monotonic() - start < 5
+        # the hung worker was killed: the next page does not wait behind it
+        pool.timeout = 60
+        assert pool.run(_sleeping_extractor, "siguiente", "0") == {"titulo": "siguiente"}
+        assert time.monotonic() - start < 30
+    finally:
+        pool.shutdown()
+
+
+def test_extraction_pool_retries_a_page_of_a_killed_pool_only_once():
+    from concurrent.futures import CancelledError, Future
+    from app.scraper.workers import _worker_processes
+
+    class KilledPool:  # every page is dropped because another page timed out
+        submitted = 0
+
+        def submit(self, *args):
+            KilledPool.submitted += 1
+            future = Future()
+            future.set_exception(CancelledError())
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    pool = ExtractionPool(workers=1, timeout=1)
+    killed = KilledPool()
+    pool._get_executor = lambda: killed
+    pool._discard(killed, terminate=True)  # no `_processes`: nothing to kill, no error
+    assert _worker_processes(killed) == []
+    assert pool.run(_sleeping_extractor, "nota", "0") is None
+    assert KilledPool.submitted == 2
+
+
+def test_extraction_cache_ignores_ad_markup_and_evicts_lru():
+    page = ('<html><head><script nonce="{n}">ads({n})</script><!-- {n} -->'
+            '<script type="application/ld+json">{{"headline": "{t}"}}</script></head>'
+            '<body><div data-slot="{n}"><iframe src="/ad?{n}"></iframe></div><p>{t}</p></body></html>')
+    assert normalized_html_hash(page.format(n=1, t="Nota")) == normalized_html_hash(page.format(n=2, t="Nota"))
+    assert normalized_html_hash(page.format(n=1, t="Nota")) != normalized_html_hash(page.format(n=1, t="Otra"))
+
+    cache, calls = ExtractionCache(max_entries=2), []
+    extract = lambda: calls.append(1) or {"titulo": "Nota"}
+    for n, url in ((1, "a"), (2, "a"), (1, "b"), (1, "c"), (3, "a")):
+        assert cache.get_or_extract("x", url, page.format(n=n, t="Nota"), extract) == {"titulo": "Nota"}
+    # "a" was evicted by "b" and "c"; its second visit was a hit
+    assert len(calls) == 4
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "misses": 4, "hit_rate": 0.2}
+
+
+def _title_extractor(url: str, html: str) -> dict:
+    return {"titulo": re.search(r"<p>(.*?)</p>", html).group(1)}
+
+
+def test_cached_extract_hashes_pages_on_the_workers(monkeypatch):
+    from app.scraper import extraction_cache as cache_mod
+
+    def not_here(html):
+        raise AssertionError("page normalised in the calling thread")
+
+    pool, cache = ExtractionPool(workers=1, timeout=60), ExtractionCache(max_entries=10)
+    monkeypatch.setattr(cache_mod, "extraction_pool", pool)
+    monkeypatch.setattr(cache_mod, "extraction_cache", cache)
+    monkeypatch.setattr(cache_mod, "normalized_html_hash", not_here)
+    page = '<html><body><div data-slot="{n}"></div><p>{t}</p></body></html>'
+    try:
+        assert cache_mod.cached_extract(_title_extractor, "a", page.format(n=1, t="Nota")) == {"titulo": "Nota"}
+        assert cache_mod.cached_extract(_title_extractor, "a", page.format(n=2, t="Nota")) == {"titulo": "Nota"}
+        assert cache_mod.cached_extract(_title_extractor, "a", page.format(n=1, t="Otra")) == {"titulo": "Otra"}
+    finally:
+        pool.shutdown()
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_site_template_extracts_known_layout_and_counts_misses():
+    templates.template_stats.reset()
+    parrafo = "<p>El Congreso debatió hoy la propuesta del Ejecutivo y los gremios pidieron participar.</p>"
+    html = ('<html><head><meta property="og:image" content="https://rpp.pe/i.jpg"></head><body>'
+            '<h1 class="article__title"> Titular </h1><time datetime="2025-10-06T10:00:00Z"></time>'
+            '<div class="article__body">{}</div><aside><p>Relacionadas</p></aside></body></html>')
+    hit = templates.apply_template("https://www.rpp.pe/politica/nota", parse_page(html.format(parrafo * 6)))
+    assert hit is not None and hit.template == "rpp.pe" and hit.title == "Titular"
+    assert hit.body.count("\n") == 5 and "Relacionadas" not in hit.body
+    assert hit.date == "2025-10-06T10:00:00Z" and hit.image == "https://rpp.pe/i.jpg"
+
+    assert templates.apply_template("https://rpp.pe/politica/nota", parse_page(html.format(parrafo))) is None
+    assert templates.apply_template("https://diario.pe/nota", parse_page(html.format(parrafo * 6))) is None
+    rpp = next(row for row in templates.snapshot() if row["template"] == "rpp.pe")
+    assert (rpp["hits"], rpp["misses"], rpp["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_article_probe_rejects_listings_without_parsing_the_whole_page(monkeypatch):
+    items = "".join(f'<li><a href="/politica/nota-{k}"><h2>Nota {k}</h2></a></li>' for k in range(200))
+    listing = ('<html><head><meta property="og:type" content="website"></head><body><h1>Política</h1>'
+               f'<ul>{items}</ul>{{tail}}</body></html>')
+    parsed, load_html = [], extraction.load_html
+    monkeypatch.setattr(extraction, "load_html", lambda html: parsed.append(len(html)) or load_html(html))
+
+    assert parse_article_page(listing.format(tail=""), body_chars=1024) is None
+    assert parsed == [1024 + listing.index("<body")]  # only the probe was parsed
+    # markers past the probe still lead to the full parse, as without the probe
+    for tail in ("<article><p>Nota</p></article>", '<script type="application/ld+json">{}</script>'):
+        page = parse_article_page(listing.format(tail=tail), body_chars=1024)
+        assert page is not None and page.looks_like_article(page.basic_meta())
+    assert parse_article_page(listing.format(tail=""), body_chars=0) is None
+    # an LD+JSON block or og:type tag cut in two by the probe, upper-case tags past it
+    ld = '{"@type": "NewsArticle", "headline": "Nota", "articleBody": "%s"}' % ("texto " * 500)
+    without_og = listing.replace('<meta property="og:type" content="website">', "")
+    for base, tag in ((listing, f'<script type="application/ld+json">{ld}</script>'),
+                      (without_og, '<meta property="og:type" content="article">')):
+        page = base.format(tail="")
+        at = page.rindex("<li>", 0, page.index("<body") + 1024)  # a tag boundary just before the cut
+        straddling = page[:at] + tag + page[at:]
+        assert parse_page(straddling).looks_like_article(parse_page(straddling).basic_meta())
+        assert parse_article_page(straddling, body_chars=1024) is not None
+    assert parse_article_page(listing.format(tail="<ARTICLE><p>Nota</p></ARTICLE>"), body_chars=1024) is not None
+
+
+def test_registry_selects_scraper_by_host_and_extractors_are_counted():
+    assert type(registry.scraper_for("https://www.rpp.pe/politica")).__name__ == "RPPScraper"
+    assert type(registry.scraper_for("https://diario.pe/")).__name__ == "GenericScraper"
+
+    extractors.extractor_stats.reset()
+    body = "<p>" + "Texto de la nota con contenido suficiente para extraer. " * 20 + "</p>"
+    extract_rpp_fields("https://rpp.pe/nota", f"<html><body><article><h1>Nota</h1>{body}</article></body></html>")
+    extract_rpp_fields("https://rpp.pe/vacia", "<html><body></body></html>")
+    rpp = next(row for row in extractors.snapshot() if row["extractor"] == "rpp")
+    assert (rpp["calls"], rpp["ok"], rpp["empty"], rpp["errors"], rpp["success_rate"]) == (2, 1, 1, 0, 0.5)
+    assert sum(rpp["latency_ms"].values()) == 2
+
+
+def test_rpp_scraper_reads_the_source_feed(monkeypatch):
+    from app.scraper import rpp
+    from app.scraper.feeds import FeedEntry
+    nota = "https://rpp.pe/politica/congreso/el-congreso-aprobo-la-ley-noticia-1601234"
+    entries = [FeedEntry(nota, titulo="Del feed"), FeedEntry("https://rpp.pe/politica"),
+               FeedEntry("https://otro.pe/nota-noticia-1")]
+    monkeypatch.setattr(base, "feed_listing", lambda scraper, url: ("rss", entries))
+    scraper = rpp.RPPScraper("https://rpp.pe/politica")
+    assert scraper.parse_listing() == [nota]
+    assert scraper.feed_entries[nota].titulo == "Del feed"
+
+
+class _Body(io.BytesIO):
+    def close(self):
+        self.bytes_read = self.tell()  # how far the body was streamed before the response was closed
+        super().close()
+
+
+class _StubSession:
+    """Stands in for the shared requests.Session, answering from {url: (status, headers, body)}."""
+
+    def __init__(self, pages, delay=0.0):
+        self.pages, self.delay = pages, delay
+        self.sent = []  # (url, headers) of every request
+        self.in_flight, self.peak = Counter(), Counter()  # per host, "*" for all hosts
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, **kwargs):
+        host = urlparse(url).netloc
+        with self._lock:
+            self.sent.append((url, dict(headers or {})))
+            for key in (host, "*"):
+                self.in_flight[key] += 1
+                self.peak[key] = max(self.peak[key], self.in_flight[key])
+        time.sleep(self.delay)
+        with self._lock:
+            for key in (host, "*"):
+                self.in_flight[key] -= 1
+        status, resp_headers, body = self.pages[url]
+        resp = requests.Response()
+        resp.status_code, resp.url, resp.raw = status, url, _Body(body)
+        resp.headers.update(resp_headers)
+        self.last_response = resp
+        return resp
+
+
+class _NoRateLimit:
+    def acquire(self, url):
+        pass
+
+    async def acquire_async(self, url):
+        pass
+
+
+def _offline_scraper(monkeypatch, session) -> BaseScraper:
+    """BaseScraper on `session`: no rate limit, fixed per-host slots, HTTP cache in memory, no archive."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.database import Base
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(http_cache, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(breaker.CircuitBreakers, "_load", lambda self, host: breaker._HostState(self.window))
+    monkeypatch.setattr(breaker.CircuitBreakers, "_save", lambda self, host, st: None)
+    monkeypatch.setattr(base, "circuit_breakers", breaker.CircuitBreakers())
+    monkeypatch.setattr(base, "rate_limiter", _NoRateLimit())
+    monkeypatch.setattr(base, "host_limits", HostConcurrencyController(initial=8, maximum=8, adaptive=False))
+    scraper = BaseScraper(session=session, replay=False)
+    scraper.archive = None
+    return scraper
+
+
+def test_fetch_many_bounds_concurrency_globally_and_per_host(monkeypatch):
+    hosts = ("a.example", "b.example", "c.example")
+    urls = [f"https://{host}/nota-{i}" for host in hosts for i in range(4)]
+    session = _StubSession({url: (200, {"Content-Type": "text/html"}, f"<p>{url}</p>".encode()) for url in urls},
+                           delay=0.05)
+    scraper = _offline_scraper(monkeypatch, session)
+
+    assert scraper.fetch_many(urls, concurrency=4, per_host=2) == {url: f"<p>{url}</p>" for url in urls}
+    assert len(session.sent) == len(urls)
+    assert 2 <= session.peak["*"] <= 4  # downloads overlapped, within the global bound
+    assert max(session.peak[host] for host in hosts) <= 2
+
+
+def test_conditional_get_sends_validators_and_reports_not_modified(monkeypatch):
+    url = "https://diario.example/nota"
+    validators = {"ETag": '"v1"', "Last-Modified": "Mon, 06 Oct 2025 10:00:00 GMT"}
+    page = (200, {"Content-Type": "text/html", **validators}, b"<p>Nota</p>")
+    session = _StubSession({url: page})
+    scraper = _offline_scraper(monkeypatch, session)
+
+    assert scraper.fetch_many([url]) == {url: "<p>Nota</p>"}
+    assert "If-None-Match" not in session.sent[-1][1]
+    # validators sent back; a 200 with the same body counts as not modified
+    assert scraper.fetch_many([url]) == {url: NOT_MODIFIED}
+    assert session.sent[-1][1]["If-None-Match"] == '"v1"'
+    assert session.sent[-1][1]["If-Modified-Since"] == validators["Last-Modified"]
+    session.pages[url] = (304, {}, b"")
+    assert scraper.fetch_many([url]) == {url: NOT_MODIFIED}
+    # after invalidate the page is downloaded in full again
+    http_cache.invalidate(url)
+    session.pages[url] = page
+    assert scraper.fetch_many([url]) == {url: "<p>Nota</p>"}
+    assert "If-None-Match" not in session.sent[-1][1]
+
+
+def test_html_archive_stores_prunes_and_replays(monkeypatch, tmp_path):
+    import os
+    from app.scraper.archive import ArchiveMiss, HtmlArchive
+    archive = HtmlArchive(root=str(tmp_path), max_mb=25 / 1024, ttl_hours=1)  # room for two 10 KB pages
+    bodies = {f"https://diario.example/nota-{i}": os.urandom(10 * 1024) for i in range(3)}
+    urls = list(bodies)
+
+    digest = archive.put(urls[0], bodies[urls[0]], "utf-8")
+    assert archive.put("https://diario.example/copia", bodies[urls[0]]) == digest  # same content, one object
+    assert archive.get(urls[0]) == (bodies[urls[0]], "utf-8")
+    archive.put(urls[1], bodies[urls[1]])
+    time.sleep(0.01)
+    archive.get(urls[0])  # reading refreshes it: nota-1 is now the least recently used
+    time.sleep(0.01)
+    archive.put(urls[2], bodies[urls[2]])  # over the cap: the LRU object is evicted
+    assert archive.get(urls[1]) is None
+    assert archive.get(urls[0]) is not None and archive.get(urls[2]) is not None
+    with pytest.raises(ArchiveMiss):
+        archive.get_text("https://diario.example/nunca")
+
+    # replay: pages come from the archive, never from the network
+    archive.put("https://diario.example/html", "<p>Ñandú</p>".encode("utf-8"), "utf-8")
+    monkeypatch.setattr(base, "html_archive", archive)
+    scraper = BaseScraper(session=_StubSession({}), replay=True)
+    assert scraper.fetch("https://diario.example/html") == "<p>Ñandú</p>"
+    assert scraper.fetch_many(["https://diario.example/html", "https://diario.example/nunca"]) == {
+        "https://diario.example/html": "<p>Ñandú</p>", "https://diario.example/nunca": None}
+    assert scraper.session.sent == []
+
+    # entries older than the TTL are pruned
+    archive.ttl_seconds = 0
+    time.sleep(0.01)
+    assert archive.prune()["urls"] == 5
+    assert archive.get(urls[0]) is None
+
+
+def test_fetch_aborts_oversized_bodies_and_non_html_content(monkeypatch):
+    from app.scraper.base import SkippedContent
+    from app.scraper.stats import fetch_stats
+    pages = {
+        "https://diario.example/grande": (200, {"Content-Type": "text/html"}, b"x" * 200_000),
+        "https://diario.example/anunciada": (200, {"Content-Type": "text/html", "Content-Length": "200000"}, b"x"),
+        "https://diario.example/nota.pdf": (200, {"Content-Type": "application/pdf", "Content-Length": "900"}, b"%PDF"),
+        "https://diario.example/nota": (200, {"Content-Type": "text/html; charset=utf-8"}, b"<p>Nota</p>"),
+    }
+    session = _StubSession(pages)
+    scraper = _offline_scraper(monkeypatch, session)
+    scraper.max_bytes = 100_000
+    before = fetch_stats.snapshot()
+
+    for url, reason in (("https://diario.example/grande", "larger than 100000 bytes"),
+                        ("https://diario.example/anunciada", "content-length 200000"),
+                        ("https://diario.example/nota.pdf", "content-type application/pdf")):
+        with pytest.raises(SkippedContent, match=reason):
+            scraper.fetch(url, conditional=False)
+        if url.endswith("grande"):
+            # streaming stopped at the first 64 KB chunk past the cap
+            assert session.last_response.raw.bytes_read == 2 * 64 * 1024
+    assert scraper.fetch("https://diario.example/nota", conditional=False) == "<p>Nota</p>"
+    delta = {k: v - before.get(k, 0) for k, v in fetch_stats.snapshot().items()}
+    assert delta["aborted_too_large"] == 2 and delta["aborted_content_type"] == 1
+    assert delta["bytes_avoided"] == 200_000 + 900
+    # aborted bodies are not counted as downloaded
+    assert delta["bytes_downloaded"] == len(b"<p>Nota</p>")
+
+
+def test_fetch_paths_share_one_configured_session():
+    from app.config import settings
+    from app.scraper.sessions import SessionRegistry, get_session
+    session = get_session()
+    assert get_session() is session
+    assert BaseScraper(replay=False).session is session
+    assert "gzip" in session.headers["Accept-Encoding"]
+    adapter = session.get_adapter("https://diario.example/nota")
+    assert adapter._pool_maxsize >= getattr(settings, "FETCH_CONCURRENCY", 8)
+
+    reg = SessionRegistry()
+    own = reg.get()
+    reg.configure_host("diario.example", 3)
+    assert own.get_adapter("https://diario.example/nota")._pool_maxsize == 3
+    assert own.get_adapter("https://otro.example/nota") is not own.get_adapter("https://diario.example/nota")
+    reg.close_all()